@@ -1,10 +1,99 @@
-from sqlalchemy import create_engine
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-DATABASE_URL = "sqlite:///./mvp.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mvp.db")
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    # None leaves SQLite's own default in place.
+    journal_mode: str | None = "wal"
+    synchronous: str | None = "normal"
+    mmap_size: int | None = 256 * 1024 * 1024
+    # Negative values are KiB, as in PRAGMA cache_size.
+    cache_size: int | None = -64 * 1024
+    temp_store: str | None = "memory"
+    # Only takes effect on a new database file; RetentionService converts existing ones.
+    auto_vacuum: str | None = "incremental"
+    busy_timeout_ms: int = 5000
+
+    @classmethod
+    def from_env(cls) -> SQLiteProfile:
+        profile = SQLITE_PROFILES[os.getenv("SQLITE_PROFILE") or "wal"]
+        overrides = {
+            field: int(value)
+            for field, variable in (
+                ("mmap_size", "SQLITE_MMAP_SIZE"),
+                ("cache_size", "SQLITE_CACHE_SIZE"),
+                ("busy_timeout_ms", "SQLITE_BUSY_TIMEOUT_MS"),
+            )
+            if (value := os.getenv(variable))
+        }
+        return replace(profile, **overrides)
+
+    def pragmas(self, read_only: bool = False) -> list[str]:
+        statements = [f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}"]
+        if self.auto_vacuum is not None and not read_only:
+            statements.append(f"PRAGMA auto_vacuum = {self.auto_vacuum}")
+        if self.journal_mode is not None and not read_only:
+            statements.append(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous is not None:
+            statements.append(f"PRAGMA synchronous = {self.synchronous}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.cache_size is not None:
+            statements.append(f"PRAGMA cache_size = {int(self.cache_size)}")
+        if self.temp_store is not None:
+            statements.append(f"PRAGMA temp_store = {self.temp_store}")
+        if read_only:
+            statements.append("PRAGMA query_only = ON")
+        return statements
+
+
+SQLITE_PROFILES = {
+    # SQLite defaults: rollback journal with a full fsync on every commit.
+    "legacy": SQLiteProfile(
+        journal_mode=None, synchronous=None, mmap_size=None, cache_size=None, temp_store=None, auto_vacuum=None
+    ),
+    "wal": SQLiteProfile(),
+}
+
+
+def create_db_engine(url: str = DATABASE_URL, profile: SQLiteProfile | None = None, read_only: bool = False) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True)
+
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    statements = (profile or SQLiteProfile.from_env()).pragmas(read_only=read_only)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def _is_in_memory(url: str) -> bool:
+    return url in {"sqlite://", "sqlite:///:memory:"} or "mode=memory" in url
+
+
+engine = create_db_engine(DATABASE_URL)
+# GET endpoints read through their own query_only pool. Under WAL they never wait on the writer.
+# An in-memory database only exists on its own connection, so it shares the write engine.
+read_engine = engine if _is_in_memory(DATABASE_URL) else create_db_engine(DATABASE_URL, read_only=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
@@ -14,3 +103,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,51 @@
+"""Run a one-off ingestion backfill outside the API process.
+
+Usage (from backend/):
+    python -m app.ingestion.backfill --sources github_trending_stars google_news_api --limit 3000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+
+from app.db import SessionLocal, engine
+from app.ingestion.service import IngestionRunner
+from app.migrations import run_migrations
+from app.schemas import BACKFILL_LIMIT_PER_SOURCE
+from app.services.article_service import ArticleService
+from app.services.content_cleaner import ContentCleaner
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", nargs="*", default=None, help="source keys (default: all)")
+    parser.add_argument("--limit", type=int, default=1000, help=f"items per source (max {BACKFILL_LIMIT_PER_SOURCE})")
+    parser.add_argument("--workers", type=int, default=None, help="cleaning processes (default: CPU count)")
+    parser.add_argument("--enrich", action="store_true", help="download article bodies before cleaning")
+    args = parser.parse_args()
+    if not 1 <= args.limit <= BACKFILL_LIMIT_PER_SOURCE:
+        parser.error(f"--limit must be between 1 and {BACKFILL_LIMIT_PER_SOURCE}")
+
+    logging.basicConfig(level=logging.INFO)
+    run_migrations(engine)
+    article_service = ArticleService(ContentCleaner(max_workers=args.workers))
+    runner = IngestionRunner(article_service=article_service)
+    db = SessionLocal()
+    try:
+        article_service.warm_source_cache(db)
+        result = runner.run(
+            db,
+            source_keys=args.sources,
+            limit_per_source=args.limit,
+            incremental=False,
+            enrich=args.enrich,
+        )
+    finally:
+        db.close()
+        runner.close()
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# Request extension adapters set to tune caching for a single request:
+#   "immutable" - serve any stored copy without contacting the upstream at all
+#   "bypass"    - neither read nor write the cache (e.g. streamed downloads)
+CACHE_EXTENSION = "ingest_cache"
+
+# Transport-level framing headers that stop being true once a body is stored decoded.
+DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+    @property
+    def etag(self) -> str | None:
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self._header("last-modified")
+
+    def _header(self, name: str) -> str | None:
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+
+class DiskResponseCache:
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        # Only the digest is persisted, so credentials carried in query strings
+        # (the GNews token) never reach the disk.
+        return hashlib.sha256(f"{request.method} {request.url}".encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> CachedResponse | None:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(
+            status_code=meta["status_code"],
+            headers=[(name, value) for name, value in meta["headers"]],
+            body=body,
+        )
+
+    def store(self, key: str, cached: CachedResponse) -> None:
+        meta_path, body_path = self._paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        # Body first, metadata last: a reader only trusts an entry once its metadata exists.
+        self._atomic_write(body_path, cached.body)
+        meta = {"status_code": cached.status_code, "headers": cached.headers}
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        shard = self.directory / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.body"
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+class ConditionalCacheTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, cache: DiskResponseCache, stats: dict[str, int]) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        mode = request.extensions.get(CACHE_EXTENSION)
+        if request.method != "GET" or mode == "bypass":
+            return await self._inner.handle_async_request(request)
+
+        key = self._cache.key_for(request)
+        cached = self._cache.load(key)
+        if cached is not None and mode == "immutable":
+            self._stats["immutable_hits"] += 1
+            return self._from_cache(request, cached)
+
+        if cached is not None:
+            if cached.etag and "if-none-match" not in request.headers:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified and "if-modified-since" not in request.headers:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self._inner.handle_async_request(request)
+
+        if response.status_code == 304 and cached is not None:
+            await response.aclose()
+            self._stats["revalidated"] += 1
+            return self._from_cache(request, cached)
+
+        self._stats["misses"] += 1
+        if not self._is_storable(response, mode):
+            return response
+
+        body = await response.aread()
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in DROPPED_RESPONSE_HEADERS
+        ]
+        self._cache.store(key, CachedResponse(status_code=response.status_code, headers=headers, body=body))
+        self._stats["stored"] += 1
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    @staticmethod
+    def _is_storable(response: httpx.Response, mode: Any) -> bool:
+        if response.status_code != 200:
+            return False
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return False
+        return mode == "immutable" or "etag" in response.headers or "last-modified" in response.headers
+
+    @staticmethod
+    def _from_cache(request: httpx.Request, cached: CachedResponse) -> httpx.Response:
+        return httpx.Response(cached.status_code, headers=cached.headers, content=cached.body, request=request)
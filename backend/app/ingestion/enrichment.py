@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import os
+import re
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.ingestion.cache import CACHE_EXTENSION
+from app.ingestion.http import PooledHttpClient
+
+if TYPE_CHECKING:
+    from app.ingestion.service import NormalizedArticle
+
+logger = logging.getLogger(__name__)
+
+_TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_NON_CONTENT_BLOCKS = re.compile(r"<(script|style|noscript|svg|template)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_MAX_REDIRECTS = 5
+
+
+@dataclass(frozen=True)
+class EnrichmentConfig:
+    max_bytes: int = 256 * 1024
+    max_concurrency: int = 16
+    max_per_host: int = 4
+    # Story URLs come from third parties, so loopback/private targets are refused by default.
+    allow_private_hosts: bool = False
+
+    @classmethod
+    def from_env(cls) -> EnrichmentConfig:
+        return cls(
+            max_bytes=int(os.getenv("INGEST_ENRICH_MAX_BYTES") or cls.max_bytes),
+            max_concurrency=int(os.getenv("INGEST_ENRICH_CONCURRENCY") or cls.max_concurrency),
+            max_per_host=int(os.getenv("INGEST_ENRICH_PER_HOST") or cls.max_per_host),
+        )
+
+
+@dataclass
+class _BodyResult:
+    text: str | None = None
+    bytes_read: int = 0
+    bytes_saved: int = 0
+    truncated: bool = False
+    failed: bool = False
+
+
+@dataclass(frozen=True)
+class _PinnedTarget:
+    url: httpx.URL
+    headers: dict[str, str]
+    extensions: dict[str, Any]
+
+
+async def _resolve_host(host: str, port: int) -> list[str]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+class ArticleBodyFetcher:
+    def __init__(
+        self,
+        http: PooledHttpClient,
+        config: EnrichmentConfig | None = None,
+        resolver: Callable[[str, int], Awaitable[list[str]]] = _resolve_host,
+    ) -> None:
+        self.http = http
+        self.config = config or EnrichmentConfig.from_env()
+        self.resolver = resolver
+
+    async def enrich(self, items: list[NormalizedArticle]) -> dict[str, Any]:
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+        async def enrich_one(item: NormalizedArticle) -> _BodyResult | None:
+            try:
+                url = httpx.URL(item.url)
+            except httpx.InvalidURL:
+                return None
+            if not self._is_allowed(url):
+                return None
+            host_semaphore = host_semaphores.setdefault(url.host, asyncio.Semaphore(self.config.max_per_host))
+            async with semaphore, host_semaphore:
+                try:
+                    result = await self._fetch_body(url)
+                except httpx.HTTPError as exc:
+                    logger.info("Body fetch failed for host=%s: %s", url.host, type(exc).__name__)
+                    return _BodyResult(failed=True)
+            if result is None:
+                return None
+            if result.text:
+                # The upstream snippet stays in front of the page body so short items keep their summary.
+                item.raw_text = f"{item.raw_text}\n{result.text}" if item.raw_text else result.text
+            return result
+
+        outcomes = await asyncio.gather(*(enrich_one(item) for item in items))
+        elapsed = time.perf_counter() - started
+        fetched = [outcome for outcome in outcomes if outcome is not None and not outcome.failed]
+        bytes_downloaded = sum(outcome.bytes_read for outcome in fetched)
+        return {
+            "requested": len(items),
+            "enriched": sum(1 for outcome in fetched if outcome.text),
+            "skipped": sum(1 for outcome in outcomes if outcome is None),
+            "failed": sum(1 for outcome in outcomes if outcome is not None and outcome.failed),
+            "truncated": sum(1 for outcome in fetched if outcome.truncated),
+            "bytes_downloaded": bytes_downloaded,
+            "bytes_saved": sum(outcome.bytes_saved for outcome in fetched),
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_second": round(len(fetched) / elapsed, 1) if elapsed > 0 else 0.0,
+            "megabytes_per_second": round(bytes_downloaded / elapsed / 1_000_000, 2) if elapsed > 0 else 0.0,
+        }
+
+    async def _fetch_body(self, url: httpx.URL) -> _BodyResult | None:
+        for hop in range(_MAX_REDIRECTS + 1):
+            target = await self._pin(url)
+            if target is None:
+                # A refused first hop counts as skipped; a refused redirect ends the fetch empty.
+                return None if hop == 0 else _BodyResult()
+            request = self.http.client.build_request(
+                "GET",
+                target.url,
+                headers={"Accept": "text/html,application/xhtml+xml,text/plain;q=0.8", **target.headers},
+                # Bodies are read partially and never reused, so keep them out of the response cache.
+                extensions={CACHE_EXTENSION: "bypass", **target.extensions},
+            )
+            response = await self.http.client.send(request, stream=True)
+            try:
+                if response.is_redirect:
+                    # Redirects are followed by hand so every hop is resolved and checked again.
+                    # Relative locations are joined to the logical URL, not the pinned address.
+                    location = response.headers.get("location")
+                    if not location:
+                        return _BodyResult()
+                    url = url.join(location)
+                    continue
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type not in _TEXT_CONTENT_TYPES:
+                    return _BodyResult()
+                return await self._read_capped(response)
+            finally:
+                await response.aclose()
+        return _BodyResult()
+
+    async def _pin(self, url: httpx.URL) -> _PinnedTarget | None:
+        if not self._is_allowed(url):
+            return None
+        if self.config.allow_private_hosts or _ip_literal(url.host) is not None:
+            return _PinnedTarget(url, {}, {})
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            addresses = [ipaddress.ip_address(address) for address in await self.resolver(url.host, port)]
+        except (OSError, ValueError):
+            return None
+        # Every answer has to be public, and the connection goes to the address that was
+        # checked, so a second lookup (DNS rebinding) cannot swap in an internal one.
+        if not addresses or not all(_is_public(address) for address in addresses):
+            return None
+        extensions = {"sni_hostname": url.host} if url.scheme == "https" else {}
+        return _PinnedTarget(url.copy_with(host=str(addresses[0])), {"Host": url.netloc.decode("ascii")}, extensions)
+
+    async def _read_capped(self, response: httpx.Response) -> _BodyResult:
+        cap = self.config.max_bytes
+        chunks: list[bytes] = []
+        bytes_read = 0
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            remaining = cap - bytes_read
+            if len(chunk) > remaining:
+                # Stop reading here; closing the response drops the rest of the body unread.
+                chunks.append(chunk[:remaining])
+                bytes_read = cap
+                truncated = True
+                break
+            chunks.append(chunk)
+            bytes_read += len(chunk)
+
+        bytes_saved = 0
+        declared = response.headers.get("content-length")
+        if truncated and declared and declared.isdigit() and "content-encoding" not in response.headers:
+            bytes_saved = max(int(declared) - bytes_read, 0)
+
+        body = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+        return _BodyResult(
+            text=_NON_CONTENT_BLOCKS.sub(" ", body),
+            bytes_read=bytes_read,
+            bytes_saved=bytes_saved,
+            truncated=truncated,
+        )
+
+    def _is_allowed(self, url: httpx.URL) -> bool:
+        if url.scheme not in {"http", "https"} or not url.host:
+            return False
+        if self.config.allow_private_hosts:
+            return True
+        if url.host == "localhost" or url.host.endswith(".localhost"):
+            return False
+        address = _ip_literal(url.host)
+        return address is None or _is_public(address)
+
+
+def _ip_literal(host: str) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    try:
+        return ipaddress.ip_address(host)
+    except ValueError:
+        return None
+
+
+def _is_public(address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    # is_global already excludes private, loopback, link-local (169.254.169.254) and reserved ranges.
+    return address.is_global and not address.is_multicast
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import os
+import threading
+import urllib.request
+from collections.abc import AsyncIterator, Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import httpx
+
+from app.ingestion.cache import ConditionalCacheTransport, DiskResponseCache
+from app.ingestion.replay import RecordingTransport, ReplayTransport
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 90.0
+    max_connections_per_host: int = 16
+    http2: bool = False
+    cache_dir: str | None = None
+    record_dir: str | None = None
+    replay_dir: str | None = None
+    replay_latency_ms: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> HttpClientConfig:
+        return cls(
+            connect_timeout=_env_float("INGEST_HTTP_CONNECT_TIMEOUT", cls.connect_timeout),
+            read_timeout=_env_float("INGEST_HTTP_READ_TIMEOUT", cls.read_timeout),
+            max_connections=_env_int("INGEST_HTTP_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=_env_int("INGEST_HTTP_MAX_KEEPALIVE", cls.max_keepalive_connections),
+            keepalive_expiry=_env_float("INGEST_HTTP_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            max_connections_per_host=_env_int("INGEST_HTTP_MAX_PER_HOST", cls.max_connections_per_host),
+            http2=_env_bool("INGEST_HTTP2", cls.http2),
+            cache_dir=os.getenv("INGEST_HTTP_CACHE_DIR") or cls.cache_dir,
+            record_dir=os.getenv("INGEST_HTTP_RECORD_DIR") or cls.record_dir,
+            replay_dir=os.getenv("INGEST_HTTP_REPLAY_DIR") or cls.replay_dir,
+            replay_latency_ms=_env_float("INGEST_HTTP_REPLAY_LATENCY_MS", cls.replay_latency_ms),
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class _HostStats:
+    __slots__ = ("requests", "connections_opened", "connections_reused", "in_flight", "peak_in_flight")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._inner = inner
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._inner:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            self._release()
+
+
+class _PoolTracker:
+    def __init__(self, max_per_host: int) -> None:
+        self.max_per_host = max_per_host
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.hosts: dict[str, _HostStats] = {}
+
+    def stats(self) -> dict[str, Any]:
+        by_host = {host: stats.as_dict() for host, stats in self.hosts.items()}
+        return {
+            "requests": sum(item["requests"] for item in by_host.values()),
+            "connections_opened": sum(item["connections_opened"] for item in by_host.values()),
+            "connections_reused": sum(item["connections_reused"] for item in by_host.values()),
+            "by_host": by_host,
+        }
+
+
+class PoolTrackingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, tracker: _PoolTracker) -> None:
+        self._inner = inner
+        self._tracker = tracker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        stats = self._tracker.hosts.setdefault(host, _HostStats())
+        semaphore = self._tracker.semaphores.setdefault(host, asyncio.Semaphore(self._tracker.max_per_host))
+        opened = False
+        used_connection = False
+        upstream_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal opened, used_connection
+            if event_name == "connection.connect_tcp.complete":
+                opened = True
+            elif event_name.startswith(("http11.send_request_headers", "http2.send_request_headers")):
+                used_connection = True
+            if upstream_trace is not None:
+                await upstream_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+
+        await semaphore.acquire()
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                stats.in_flight -= 1
+                semaphore.release()
+
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        stats.requests += 1
+        if opened:
+            stats.connections_opened += 1
+        elif used_connection:
+            stats.connections_reused += 1
+
+        # In-memory bodies (mock, cache and replay transports) hold nothing on the
+        # wire and httpx never iterates or closes them once loaded, so free the slot now.
+        if isinstance(response.stream, httpx.ByteStream):
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _environment_proxy_mounts() -> dict[str, str | None]:
+    # Mirrors httpx's trust_env handling, which is switched off as soon as a
+    # client is built with an explicit transport.
+    proxies = urllib.request.getproxies()
+    mounts: dict[str, str | None] = {}
+    for scheme in ("http", "https", "all"):
+        url = proxies.get(scheme)
+        if url:
+            mounts[f"{scheme}://"] = url if "://" in url else f"http://{url}"
+
+    for hostname in filter(None, (part.strip() for part in proxies.get("no", "").split(","))):
+        if hostname == "*":
+            return {}
+        if "://" in hostname:
+            mounts[hostname] = None
+        elif hostname == "localhost" or _is_ip_address(hostname):
+            mounts[f"all://{hostname}"] = None
+        else:
+            mounts[f"all://*{hostname}"] = None
+    return mounts
+
+
+def _is_ip_address(hostname: str) -> bool:
+    try:
+        ipaddress.ip_address(hostname.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+# The client lives on its own event-loop thread: pooled keep-alive and HTTP/2
+# connections are bound to the loop that opened them, so an asyncio.run() per
+# ingestion run would throw them away.
+class PooledHttpClient:
+    def __init__(
+        self,
+        config: HttpClientConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.config = config or HttpClientConfig.from_env()
+        self.http2 = self.config.http2 and importlib.util.find_spec("h2") is not None
+        if self.config.http2 and not self.http2:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1")
+
+        self._tracker = _PoolTracker(max_per_host=self.config.max_connections_per_host)
+        self._cache = DiskResponseCache(self.config.cache_dir) if self.config.cache_dir else None
+        self._cache_stats = {"immutable_hits": 0, "revalidated": 0, "misses": 0, "stored": 0}
+        mounts: dict[str, httpx.AsyncBaseTransport | None] = {}
+        if transport is None and self.config.replay_dir:
+            transport = ReplayTransport(self.config.replay_dir, latency=self.config.replay_latency_ms / 1000)
+        if transport is None:
+            transport = self._network_transport()
+            for pattern, proxy in _environment_proxy_mounts().items():
+                mounts[pattern] = self._wrap(self._network_transport(proxy))
+        self.client = httpx.AsyncClient(
+            transport=self._wrap(transport),
+            mounts=mounts,
+            timeout=self.config.timeout(),
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("PooledHttpClient.run() cannot be called from its own event loop")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def stats(self) -> dict[str, Any]:
+        stats = {"http2": self.http2, **self._tracker.stats()}
+        if self._cache is not None:
+            stats["cache"] = dict(self._cache_stats)
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def _wrap(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        # Cache sits outside the pool tracker so cache hits never occupy a per-host slot.
+        tracked = PoolTrackingTransport(transport, self._tracker)
+        if self._cache is None:
+            return tracked
+        return ConditionalCacheTransport(tracked, self._cache, self._cache_stats)
+
+    def _network_transport(self, proxy: str | None = None) -> httpx.AsyncBaseTransport:
+        transport = httpx.AsyncHTTPTransport(limits=self.config.limits(), http2=self.http2, proxy=proxy)
+        if self.config.record_dir:
+            return RecordingTransport(transport, self.config.record_dir)
+        return transport
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                if self.client.is_closed:
+                    raise RuntimeError("PooledHttpClient is closed")
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="ingest-http", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
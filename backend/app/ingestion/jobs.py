@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.ingestion.service import IngestionRunner
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class IngestionJob:
+    id: str
+    source_keys: list[str]
+    limit_per_source: int
+    backfill: bool
+    enrich: bool = False
+    status: str = JOB_QUEUED
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    sources_done: int = 0
+    source_results: dict[str, Any] = field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_record(cls, record: models.IngestionJobRecord) -> IngestionJob:
+        return cls(
+            id=record.id,
+            source_keys=json.loads(record.source_keys_json),
+            limit_per_source=record.limit_per_source,
+            backfill=record.backfill,
+            enrich=record.enrich,
+            status=record.status,
+            created_at=record.created_at,
+            started_at=record.started_at,
+            finished_at=record.finished_at,
+            sources_done=record.sources_done,
+            source_results=json.loads(record.source_results_json),
+            result=json.loads(record.result_json) if record.result_json else None,
+            error=record.error,
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "source_keys": list(self.source_keys),
+            "limit_per_source": self.limit_per_source,
+            "backfill": self.backfill,
+            "enrich": self.enrich,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": {
+                "sources_total": len(self.source_keys),
+                "sources_done": self.sources_done,
+                "sources": dict(self.source_results),
+            },
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class IngestionJobManager:
+    # Job state lives in the ingestion_jobs table rather than in this process, so any uvicorn
+    # worker can report a job and identical requests coalesce across workers. Only the
+    # executor that runs a job is local.
+    def __init__(
+        self,
+        runner: IngestionRunner,
+        session_factory: Callable[[], Session],
+        max_workers: int | None = None,
+        max_finished_jobs: int = 200,
+        stale_after_seconds: float | None = None,
+    ) -> None:
+        self.runner = runner
+        self.session_factory = session_factory
+        self.max_finished_jobs = max_finished_jobs
+        self.stale_after = timedelta(
+            seconds=stale_after_seconds or float(os.getenv("INGEST_JOB_STALE_SECONDS", "1800"))
+        )
+        workers = max_workers or int(os.getenv("INGEST_JOB_WORKERS", "2"))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-job")
+        self._lock = threading.Lock()
+        self._queued: set[str] = set()
+
+    def submit(
+        self,
+        source_keys: list[str] | None,
+        limit_per_source: int,
+        backfill: bool = False,
+        enrich: bool = False,
+    ) -> tuple[IngestionJob, bool]:
+        selected = sorted(set(source_keys or self.runner.available_sources()))
+        key = json.dumps([selected, limit_per_source, backfill, enrich])
+        with self.session_factory() as db:
+            self._expire_abandoned(db)
+            while True:
+                job_id = str(uuid.uuid4())
+                # An identical request already queued or running, in any worker, is joined
+                # rather than repeated: the insert only wins if no active row holds the key.
+                inserted = db.execute(
+                    sqlite_insert(models.IngestionJobRecord)
+                    .values(
+                        id=job_id,
+                        active_key=key,
+                        status=JOB_QUEUED,
+                        source_keys_json=json.dumps(selected),
+                        limit_per_source=limit_per_source,
+                        backfill=backfill,
+                        enrich=enrich,
+                    )
+                    .on_conflict_do_nothing(index_elements=["active_key"])
+                    .returning(models.IngestionJobRecord.id)
+                ).scalar()
+                if inserted is not None:
+                    self._prune_finished(db)
+                    db.commit()
+                    break
+                active = db.query(models.IngestionJobRecord).filter(models.IngestionJobRecord.active_key == key).first()
+                if active is not None:
+                    db.commit()
+                    return IngestionJob.from_record(active), True
+                # The active job finished between the insert and the lookup; try again.
+            job = IngestionJob.from_record(db.get(models.IngestionJobRecord, job_id))
+
+        with self._lock:
+            self._queued.add(job.id)
+        self._executor.submit(self._run, job)
+        return job, False
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self.session_factory() as db:
+            self._expire_abandoned(db)
+            record = db.get(models.IngestionJobRecord, job_id)
+            return IngestionJob.from_record(record).snapshot() if record is not None else None
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            cancelled, self._queued = list(self._queued), set()
+        # Jobs that never started here would otherwise hold their key until they go stale.
+        for job_id in cancelled:
+            self._update(
+                job_id, status=JOB_FAILED, error="worker_shutdown", finished_at=datetime.utcnow(), active_key=None
+            )
+
+    def _run(self, job: IngestionJob) -> None:
+        with self._lock:
+            self._queued.discard(job.id)
+        self._update(job.id, status=JOB_RUNNING, started_at=datetime.utcnow())
+        source_results: dict[str, Any] = {}
+
+        def on_source_done(source_key: str, source_result: dict[str, Any]) -> None:
+            source_results[source_key] = source_result
+            self._update(
+                job.id, sources_done=len(source_results), source_results_json=json.dumps(source_results, default=str)
+            )
+
+        db = self.session_factory()
+        outcome: dict[str, Any]
+        try:
+            result = self.runner.run(
+                db,
+                source_keys=job.source_keys,
+                limit_per_source=job.limit_per_source,
+                incremental=not job.backfill,
+                enrich=job.enrich,
+                on_source_done=on_source_done,
+            )
+        except Exception as exc:
+            logger.exception("Ingestion job %s failed", job.id)
+            outcome = {"status": JOB_FAILED, "error": f"run_failed: {type(exc).__name__}"}
+        else:
+            outcome = {"status": JOB_SUCCEEDED, "result_json": json.dumps(result, default=str)}
+        finally:
+            db.close()
+        self._update(job.id, finished_at=datetime.utcnow(), active_key=None, **outcome)
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        with self.session_factory() as db:
+            db.query(models.IngestionJobRecord).filter(models.IngestionJobRecord.id == job_id).update(
+                {**values, "updated_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+
+    def _expire_abandoned(self, db: Session) -> None:
+        # A worker that dies mid-job leaves its row active; once it stops updating it is
+        # failed so its key can be submitted again.
+        now = datetime.utcnow()
+        expired = (
+            db.query(models.IngestionJobRecord)
+            .filter(
+                models.IngestionJobRecord.active_key.is_not(None),
+                models.IngestionJobRecord.updated_at < now - self.stale_after,
+            )
+            .update(
+                {"status": JOB_FAILED, "error": "job_abandoned", "finished_at": now, "active_key": None},
+                synchronize_session=False,
+            )
+        )
+        if expired:
+            db.commit()
+
+    def _prune_finished(self, db: Session) -> None:
+        keep = (
+            select(models.IngestionJobRecord.id)
+            .where(models.IngestionJobRecord.active_key.is_(None))
+            .order_by(models.IngestionJobRecord.created_at.desc())
+            .limit(self.max_finished_jobs)
+        )
+        db.execute(
+            delete(models.IngestionJobRecord).where(
+                models.IngestionJobRecord.active_key.is_(None), models.IngestionJobRecord.id.not_in(keep)
+            )
+        )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    requests_per_second: float
+    burst: int
+    max_retries: int = 4
+    base_backoff: float = 0.5
+    max_backoff: float = 30.0
+    # A Retry-After / reset further out than this fails the source instead of stalling the run.
+    max_wait: float = 60.0
+
+
+DEFAULT_POLICIES: dict[str, RateLimitPolicy] = {
+    # Firebase publishes no quota; the cap only keeps a backfill from hammering it.
+    "hacker_news": RateLimitPolicy(requests_per_second=50.0, burst=50),
+    # Search API: 30 requests/minute with a token, 10 without. Response headers refine this.
+    "github_trending_stars": RateLimitPolicy(requests_per_second=0.5, burst=10),
+    "google_news_api": RateLimitPolicy(requests_per_second=1.0, burst=4),
+}
+
+
+class RateLimitExceeded(RuntimeError):
+    pass
+
+
+class SourceRateLimiter:
+    def __init__(
+        self,
+        policy: RateLimitPolicy,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self.policy = policy
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._tokens = float(policy.burst)
+        self._refilled_at = clock()
+        self._blocked_until = 0.0
+        self.upstream_remaining: int | None = None
+        self.requests = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+    async def acquire(self) -> None:
+        while True:
+            now = self._clock()
+            self._refill(now)
+            wait = max(self._blocked_until - now, 0.0)
+            if wait > self.policy.max_wait:
+                # An upstream block longer than max_wait (e.g. a quota reset an hour out) fails
+                # the source straight away instead of sleeping through the whole run.
+                raise RateLimitExceeded(f"source blocked for {wait:.0f}s")
+            if wait == 0.0 and self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            if wait == 0.0:
+                wait = (1.0 - self._tokens) / self.policy.requests_per_second
+            self.throttled_seconds += wait
+            await self._sleep(wait)
+
+    async def send(self, request: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.acquire()
+            self.requests += 1
+            try:
+                response = await request()
+            except httpx.TransportError:
+                if attempt >= self.policy.max_retries:
+                    raise
+                await self._retry_after(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            delay = self.observe(response)
+            if not self._should_retry(response) or attempt >= self.policy.max_retries:
+                return response
+            delay = delay if delay is not None else self._backoff(attempt)
+            if delay > self.policy.max_wait:
+                return response
+            await response.aclose()
+            await self._retry_after(delay)
+            attempt += 1
+
+    def observe(self, response: httpx.Response) -> float | None:
+        # Returns the server-requested delay, if any, and blocks the bucket until then.
+        delay = _retry_after_seconds(response.headers.get("retry-after"))
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.isdigit():
+            self.upstream_remaining = int(remaining)
+            reset = response.headers.get("x-ratelimit-reset")
+            if self.upstream_remaining == 0 and reset is not None and reset.isdigit():
+                reset_delay = max(int(reset) - time.time(), 0.0)
+                delay = reset_delay if delay is None else max(delay, reset_delay)
+        if delay is not None:
+            self._blocked_until = max(self._blocked_until, self._clock() + delay)
+        return delay
+
+    def snapshot(self) -> dict[str, Any]:
+        now = self._clock()
+        self._refill(now)
+        return {
+            "tokens": round(self._tokens, 2),
+            "requests_per_second": self.policy.requests_per_second,
+            "upstream_remaining": self.upstream_remaining,
+            "blocked_for_seconds": round(max(self._blocked_until - now, 0.0), 3),
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+    def _should_retry(self, response: httpx.Response) -> bool:
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return True
+        # GitHub signals an exhausted quota with 403 rather than 429.
+        return response.status_code == 403 and self.upstream_remaining == 0
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent page fetches from retrying in lockstep.
+        ceiling = min(self.policy.max_backoff, self.policy.base_backoff * 2**attempt)
+        return ceiling * self._jitter()
+
+    async def _retry_after(self, delay: float) -> None:
+        self.retries += 1
+        self.throttled_seconds += delay
+        await self._sleep(delay)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._refilled_at, 0.0)
+        self._tokens = min(float(self.policy.burst), self._tokens + elapsed * self.policy.requests_per_second)
+        self._refilled_at = now
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
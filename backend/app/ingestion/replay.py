@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from app.ingestion.cache import DROPPED_RESPONSE_HEADERS
+
+# Query params carrying credentials; stripped from fixture keys and stored URLs.
+SECRET_PARAMS = frozenset({"token", "apikey", "api_key", "key", "access_token"})
+# Params whose values drift between recording and replay (GitHub's created:> date,
+# GNews cursors); a request falls back to ignoring them when no exact fixture exists.
+VOLATILE_PARAMS = frozenset({"q", "from"})
+_UNRECORDED_HEADERS = DROPPED_RESPONSE_HEADERS | {"set-cookie"}
+
+
+def fixture_key(method: str, url: httpx.URL, *, ignore: frozenset[str] = frozenset()) -> str:
+    params = sorted(
+        (name, value) for name, value in url.params.multi_items() if name not in SECRET_PARAMS and name not in ignore
+    )
+    query = "&".join(f"{name}={value}" for name, value in params)
+    return f"{method.upper()} {url.scheme}://{url.host}{url.path}?{query}"
+
+
+@dataclass
+class RecordedExchange:
+    key: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+    def to_json(self) -> dict:
+        return {
+            "key": self.key,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "body_b64": base64.b64encode(self.body).decode("ascii"),
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict) -> RecordedExchange:
+        return cls(
+            key=payload["key"],
+            status_code=payload["status_code"],
+            headers=[(name, value) for name, value in payload["headers"]],
+            body=base64.b64decode(payload["body_b64"]),
+        )
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, directory: str | os.PathLike[str]) -> None:
+        self._inner = inner
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        body = await response.aread()
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _UNRECORDED_HEADERS
+        ]
+        exchange = RecordedExchange(
+            key=fixture_key(request.method, request.url),
+            status_code=response.status_code,
+            headers=headers,
+            body=body,
+        )
+        self._write(exchange)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    def _write(self, exchange: RecordedExchange) -> None:
+        name = hashlib.sha256(exchange.key.encode("utf-8")).hexdigest()[:24]
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(exchange.to_json(), handle)
+            os.replace(tmp_name, self.directory / f"{name}.json")
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, directory: str | os.PathLike[str], latency: float = 0.0) -> None:
+        self.latency = latency
+        self.exchanges: dict[str, RecordedExchange] = {}
+        self._loose: dict[str, RecordedExchange] = {}
+        self.served = 0
+        self.misses = 0
+        for path in sorted(Path(directory).glob("*.json")):
+            exchange = RecordedExchange.from_json(json.loads(path.read_text(encoding="utf-8")))
+            self.exchanges[exchange.key] = exchange
+            self._loose[self._loosen(exchange.key)] = exchange
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        exchange = self.exchanges.get(fixture_key(request.method, request.url))
+        if exchange is None:
+            exchange = self._loose.get(fixture_key(request.method, request.url, ignore=VOLATILE_PARAMS))
+        if exchange is None:
+            self.misses += 1
+            return httpx.Response(404, headers={"X-Replay-Miss": "1"}, request=request)
+        self.served += 1
+        return httpx.Response(exchange.status_code, headers=exchange.headers, content=exchange.body, request=request)
+
+    @staticmethod
+    def _loosen(key: str) -> str:
+        method, url = key.split(" ", 1)
+        return fixture_key(method, httpx.URL(url), ignore=VOLATILE_PARAMS)
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
+from collections.abc import Awaitable, Callable
 from typing import Any, Protocol
 
 import httpx
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app import models
 from app.config.sources import SOURCE_REGISTRY
-from app.services.article_service import ArticleService
+from app.ingestion.cache import CACHE_EXTENSION
+from app.ingestion.enrichment import ArticleBodyFetcher
+from app.ingestion.http import PooledHttpClient
+from app.ingestion.ratelimit import DEFAULT_POLICIES, SourceRateLimiter
+from app.services.article_service import ArticleService, RawArticle
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -20,6 +32,17 @@ class NormalizedArticle:
     title: str
     raw_text: str | None = None
     published_at: datetime | None = None
+    external_id: str | None = None
+
+
+@dataclass
+class AdapterFetchResult:
+    items: list[NormalizedArticle] = field(default_factory=list)
+    # Every upstream ID the adapter looked at, including ones it rejected (HN jobs, deleted items).
+    seen_external_ids: list[str] = field(default_factory=list)
+    fetches_avoided: int = 0
+    # Watermark to resume from next run; None leaves the stored cursor untouched.
+    next_cursor: str | None = None
 
 
 class SourceAdapter(Protocol):
@@ -27,162 +50,534 @@ class SourceAdapter(Protocol):
     def fetch_items(self, limit: int) -> list[NormalizedArticle]:
         ...
 
+    async def fetch_items_async(
+        self,
+        limit: int,
+        *,
+        known_ids: frozenset[str] = frozenset(),
+        cursor: str | None = None,
+    ) -> AdapterFetchResult:
+        ...
+
+
+async def _gather_pages(
+    fetch_page: Callable[[int], Awaitable[tuple[list[dict[str, Any]], int | None]]],
+    *,
+    limit: int,
+    per_page: int,
+    concurrency: int,
+    max_results: int | None = None,
+) -> tuple[list[dict[str, Any]], bool]:
+    # Page 1 reports the upstream total, which bounds how many further pages are worth
+    # requesting; those then go out concurrently instead of one after another. The flag
+    # says whether the window was read to its end, i.e. nothing was left upstream or cut.
+    first_page, total = await fetch_page(1)
+    if len(first_page) < per_page:
+        return first_page[:limit], len(first_page) <= limit
+    if len(first_page) >= limit:
+        return first_page[:limit], len(first_page) == limit and total is not None and total <= limit
+
+    wanted = limit if total is None else min(limit, total)
+    if max_results is not None:
+        wanted = min(wanted, max_results)
+    last_page = -(-wanted // per_page)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_bounded(page: int) -> list[dict[str, Any]]:
+        async with semaphore:
+            page_items, _ = await fetch_page(page)
+            return page_items
+
+    pages = await asyncio.gather(*(fetch_bounded(page) for page in range(2, last_page + 1)))
+    results = list(first_page)
+    exhausted = False
+    for page_items in pages:
+        results.extend(page_items)
+        if len(page_items) < per_page:
+            exhausted = True
+            break
+    if total is not None and len(results) >= total:
+        exhausted = True
+    return results[:limit], exhausted and len(results) <= limit
+
 
 class HackerNewsAdapter:
     source_key = "hacker_news"
     _BASE = "https://hacker-news.firebaseio.com/v0"
 
+    def __init__(
+        self,
+        http: PooledHttpClient,
+        max_concurrency: int = 16,
+        base_url: str | None = None,
+        rate_limiter: SourceRateLimiter | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.http = http
+        self.max_concurrency = max_concurrency
+        self.base_url = (base_url or self._BASE).rstrip("/")
+        self.rate_limiter = rate_limiter or SourceRateLimiter(DEFAULT_POLICIES[self.source_key])
+
     def fetch_items(self, limit: int) -> list[NormalizedArticle]:
-        with httpx.Client(timeout=15.0) as client:
-            ids = client.get(f"{self._BASE}/topstories.json").raise_for_status().json()[:limit]
-            items: list[NormalizedArticle] = []
-            for item_id in ids:
-                payload = client.get(f"{self._BASE}/item/{item_id}.json").raise_for_status().json()
-                if payload.get("type") != "story" or not payload.get("url"):
-                    continue
-                published = None
-                if payload.get("time"):
-                    published = datetime.fromtimestamp(payload["time"], tz=timezone.utc)
-                items.append(
-                    NormalizedArticle(
-                        source_name=SOURCE_REGISTRY[self.source_key].name,
-                        source_type=SOURCE_REGISTRY[self.source_key].source_type,
-                        url=payload["url"],
-                        title=payload.get("title", "Untitled"),
-                        raw_text=payload.get("text"),
-                        published_at=published,
+        return self.http.run(self.fetch_items_async(limit)).items
+
+    async def fetch_items_async(
+        self,
+        limit: int,
+        *,
+        known_ids: frozenset[str] = frozenset(),
+        cursor: str | None = None,
+    ) -> AdapterFetchResult:
+        client = self.http.client
+        response = await self.rate_limiter.send(lambda: client.get(f"{self.base_url}/topstories.json"))
+        top_ids = response.raise_for_status().json()[:limit]
+        # topstories is ordered by rank, not by ID: an old story can climb into it at any time,
+        # so only known_ids (not an ID high-water mark) decides what to skip.
+        ids = [item_id for item_id in top_ids if str(item_id) not in known_ids]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_one(item_id: int) -> dict[str, Any] | None:
+            async with semaphore:
+                # HN item payloads are treated as immutable: once cached they are served without a request.
+                item_response = await self.rate_limiter.send(
+                    lambda: client.get(
+                        f"{self.base_url}/item/{item_id}.json",
+                        extensions={CACHE_EXTENSION: "immutable"},
                     )
                 )
-            return items
+                return item_response.raise_for_status().json()
+
+        # gather preserves argument order, so results line up with topstories ranking.
+        payloads = await asyncio.gather(*(fetch_one(item_id) for item_id in ids))
+
+        items: list[NormalizedArticle] = []
+        for payload in payloads:
+            item = self._normalize(payload)
+            if item is not None:
+                items.append(item)
+        return AdapterFetchResult(
+            items=items,
+            seen_external_ids=[str(item_id) for item_id in ids],
+            fetches_avoided=len(top_ids) - len(ids),
+        )
+
+    def _normalize(self, payload: dict[str, Any] | None) -> NormalizedArticle | None:
+        if not payload or payload.get("type") != "story" or not payload.get("url"):
+            return None
+        published = None
+        if payload.get("time"):
+            published = datetime.fromtimestamp(payload["time"], tz=timezone.utc)
+        return NormalizedArticle(
+            source_name=SOURCE_REGISTRY[self.source_key].name,
+            source_type=SOURCE_REGISTRY[self.source_key].source_type,
+            url=payload["url"],
+            title=payload.get("title", "Untitled"),
+            raw_text=payload.get("text"),
+            published_at=published,
+            external_id=str(payload["id"]) if payload.get("id") is not None else None,
+        )
 
 
 class GitHubTrendingStarsAdapter:
     source_key = "github_trending_stars"
     _BASE = "https://api.github.com/search/repositories"
+    _PAGE_SIZE = 100
+    # The search API refuses to page beyond the first 1,000 matches.
+    _MAX_RESULTS = 1000
+
+    def __init__(
+        self,
+        http: PooledHttpClient,
+        page_concurrency: int = 4,
+        rate_limiter: SourceRateLimiter | None = None,
+    ) -> None:
+        if page_concurrency < 1:
+            raise ValueError("page_concurrency must be >= 1")
+        self.http = http
+        self.page_concurrency = page_concurrency
+        self.rate_limiter = rate_limiter or SourceRateLimiter(DEFAULT_POLICIES[self.source_key])
 
     def fetch_items(self, limit: int) -> list[NormalizedArticle]:
-        since = (date.today() - timedelta(days=7)).isoformat()
-        query = f"created:>{since}"
+        return self.http.run(self.fetch_items_async(limit)).items
+
+    async def fetch_items_async(
+        self,
+        limit: int,
+        *,
+        known_ids: frozenset[str] = frozenset(),
+        cursor: str | None = None,
+    ) -> AdapterFetchResult:
+        # Without a cursor the first run covers the trailing week; afterwards only repos
+        # created after the newest one already ingested are requested. The cursor never
+        # reaches further back than a week, so a window that is never fully paged stays bounded.
+        week_ago = (date.today() - timedelta(days=7)).isoformat()
+        since = max(cursor, week_ago) if cursor else week_ago
         headers = {"Accept": "application/vnd.github+json"}
         token = os.getenv("GITHUB_TOKEN")
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
-        with httpx.Client(timeout=15.0, headers=headers) as client:
-            response = client.get(
-                self._BASE,
-                params={
-                    "q": query,
-                    "sort": "stars",
-                    "order": "desc",
-                    "per_page": min(limit, 100),
-                },
+        per_page = min(limit, self._PAGE_SIZE)
+
+        async def fetch_page(page: int) -> tuple[list[dict[str, Any]], int | None]:
+            response = await self.rate_limiter.send(
+                lambda: self.http.client.get(
+                    self._BASE,
+                    headers=headers,
+                    params={
+                        "q": f"created:>{since}",
+                        "sort": "stars",
+                        "order": "desc",
+                        "per_page": per_page,
+                        "page": page,
+                    },
+                )
             )
-            response.raise_for_status()
-            payload = response.json()
-            items: list[NormalizedArticle] = []
-            for repo in payload.get("items", [])[:limit]:
-                published = None
-                if repo.get("created_at"):
-                    published = datetime.fromisoformat(repo["created_at"].replace("Z", "+00:00"))
-                items.append(
-                    NormalizedArticle(
-                        source_name=SOURCE_REGISTRY[self.source_key].name,
-                        source_type=SOURCE_REGISTRY[self.source_key].source_type,
-                        url=repo["html_url"],
-                        title=repo["full_name"],
-                        raw_text=repo.get("description"),
-                        published_at=published,
-                    )
+            payload = response.raise_for_status().json()
+            return payload.get("items", []), payload.get("total_count")
+
+        repos, exhausted = await _gather_pages(
+            fetch_page,
+            limit=limit,
+            per_page=per_page,
+            concurrency=self.page_concurrency,
+            max_results=self._MAX_RESULTS,
+        )
+
+        items: list[NormalizedArticle] = []
+        newest = cursor
+        for repo in repos:
+            published = None
+            if repo.get("created_at"):
+                published = datetime.fromisoformat(repo["created_at"].replace("Z", "+00:00"))
+                newest = max(newest or repo["created_at"], repo["created_at"])
+            items.append(
+                NormalizedArticle(
+                    source_name=SOURCE_REGISTRY[self.source_key].name,
+                    source_type=SOURCE_REGISTRY[self.source_key].source_type,
+                    url=repo["html_url"],
+                    title=repo["full_name"],
+                    raw_text=repo.get("description"),
+                    published_at=published,
+                    external_id=str(repo["id"]) if repo.get("id") is not None else None,
                 )
-            return items
+            )
+        # Results are sorted by stars, so the newest created_at says nothing about what ranked
+        # below the cut; the cursor only moves once the whole window has been read.
+        # Search returns whole repo records per page, so there is no per-item fetch to skip.
+        return AdapterFetchResult(
+            items=items,
+            seen_external_ids=[item.external_id for item in items if item.external_id],
+            next_cursor=newest if exhausted and newest != cursor else None,
+        )
 
 
 class GoogleNewsAPIAdapter:
     source_key = "google_news_api"
     _BASE = "https://gnews.io/api/v4/top-headlines"
+    _PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        http: PooledHttpClient,
+        page_concurrency: int = 4,
+        rate_limiter: SourceRateLimiter | None = None,
+    ) -> None:
+        if page_concurrency < 1:
+            raise ValueError("page_concurrency must be >= 1")
+        self.http = http
+        self.page_concurrency = page_concurrency
+        self.rate_limiter = rate_limiter or SourceRateLimiter(DEFAULT_POLICIES[self.source_key])
 
     def fetch_items(self, limit: int) -> list[NormalizedArticle]:
+        return self.http.run(self.fetch_items_async(limit)).items
+
+    async def fetch_items_async(
+        self,
+        limit: int,
+        *,
+        known_ids: frozenset[str] = frozenset(),
+        cursor: str | None = None,
+    ) -> AdapterFetchResult:
         api_key = os.getenv("GOOGLE_NEWS_API_KEY")
         if not api_key:
-            return []
-
-        with httpx.Client(timeout=15.0) as client:
-            response = client.get(
-                self._BASE,
-                params={
-                    "token": api_key,
-                    "topic": "technology",
-                    "lang": "en",
-                    "max": min(limit, 100),
-                },
-            )
-            response.raise_for_status()
-            payload = response.json()
-            items: list[NormalizedArticle] = []
-            for article in payload.get("articles", [])[:limit]:
-                published = None
-                if article.get("publishedAt"):
-                    published = datetime.fromisoformat(article["publishedAt"].replace("Z", "+00:00"))
-                raw_text = article.get("description") or article.get("content")
-                items.append(
-                    NormalizedArticle(
-                        source_name=SOURCE_REGISTRY[self.source_key].name,
-                        source_type=SOURCE_REGISTRY[self.source_key].source_type,
-                        url=article["url"],
-                        title=article.get("title", "Untitled"),
-                        raw_text=raw_text,
-                        published_at=published,
-                    )
+            return AdapterFetchResult()
+
+        per_page = min(limit, self._PAGE_SIZE)
+
+        async def fetch_page(page: int) -> tuple[list[dict[str, Any]], int | None]:
+            params: dict[str, Any] = {
+                "token": api_key,
+                "topic": "technology",
+                "lang": "en",
+                "max": per_page,
+                "page": page,
+            }
+            if cursor:
+                params["from"] = cursor
+            response = await self.rate_limiter.send(lambda: self.http.client.get(self._BASE, params=params))
+            payload = response.raise_for_status().json()
+            return payload.get("articles", []), payload.get("totalArticles")
+
+        articles, exhausted = await _gather_pages(
+            fetch_page,
+            limit=limit,
+            per_page=per_page,
+            concurrency=self.page_concurrency,
+        )
+
+        items: list[NormalizedArticle] = []
+        newest = cursor
+        for article in articles:
+            published = None
+            if article.get("publishedAt"):
+                published = datetime.fromisoformat(article["publishedAt"].replace("Z", "+00:00"))
+                newest = max(newest or article["publishedAt"], article["publishedAt"])
+            raw_text = article.get("description") or article.get("content")
+            items.append(
+                NormalizedArticle(
+                    source_name=SOURCE_REGISTRY[self.source_key].name,
+                    source_type=SOURCE_REGISTRY[self.source_key].source_type,
+                    url=article["url"],
+                    title=article.get("title", "Untitled"),
+                    raw_text=raw_text,
+                    published_at=published,
                 )
-            return items
+            )
+        # As for GitHub, moving the cursor past a window that was cut at the limit would lose its tail.
+        return AdapterFetchResult(items=items, next_cursor=newest if exhausted and newest != cursor else None)
 
 
 class IngestionRunner:
-    def __init__(self, article_service: ArticleService | None = None) -> None:
-        self.adapters: dict[str, SourceAdapter] = {
-            "hacker_news": HackerNewsAdapter(),
-            "github_trending_stars": GitHubTrendingStarsAdapter(),
-            "google_news_api": GoogleNewsAPIAdapter(),
-        }
+    def __init__(
+        self,
+        article_service: ArticleService | None = None,
+        adapters: dict[str, SourceAdapter] | None = None,
+        http: PooledHttpClient | None = None,
+        body_fetcher: ArticleBodyFetcher | None = None,
+    ) -> None:
+        self.http = http or PooledHttpClient()
+        self.body_fetcher = body_fetcher or ArticleBodyFetcher(self.http)
+        if adapters is None:
+            adapters = {
+                "hacker_news": HackerNewsAdapter(self.http),
+                "github_trending_stars": GitHubTrendingStarsAdapter(self.http),
+                "google_news_api": GoogleNewsAPIAdapter(self.http),
+            }
+        self.adapters: dict[str, SourceAdapter] = adapters
         self.article_service = article_service or ArticleService()
 
+    def http_pool_stats(self) -> dict[str, Any]:
+        return self.http.stats()
+
+    def close(self) -> None:
+        self.http.close()
+        # Any cleaning pool is started lazily again if the service is reused.
+        self.article_service.cleaner.close()
+
     def available_sources(self) -> list[str]:
         return list(self.adapters.keys())
 
-    def run(self, db: Session, source_keys: list[str] | None = None, limit_per_source: int = 10) -> dict[str, Any]:
+    def run(
+        self,
+        db: Session,
+        source_keys: list[str] | None = None,
+        limit_per_source: int = 10,
+        *,
+        incremental: bool = True,
+        enrich: bool = False,
+        on_source_done: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
         selected = source_keys or self.available_sources()
-        results: dict[str, Any] = {"ingested": 0, "skipped": 0, "sources": {}}
+        results: dict[str, Any] = {"ingested": 0, "skipped": 0, "fetches_avoided": 0, "sources": {}}
 
+        runnable: dict[str, SourceAdapter] = {}
         for source_key in selected:
             adapter = self.adapters.get(source_key)
             if adapter is None:
                 results["sources"][source_key] = {"error": "unknown_source"}
                 continue
+            runnable[source_key] = adapter
 
-            fetched = adapter.fetch_items(limit_per_source)
-            source_ingested = 0
-            source_skipped = 0
-            for item in fetched:
-                upsert_result = self.article_service.create_article_from_raw(
-                    db,
-                    source_name=item.source_name,
-                    source_type=item.source_type,
-                    url=item.url,
-                    title=item.title,
-                    raw_text=item.raw_text,
-                    published_at=item.published_at,
-                )
-                if upsert_result.deduped:
-                    source_skipped += 1
-                else:
-                    source_ingested += 1
+        known_ids = self._load_known_ids(db, list(runnable))
+        stored_cursors = self._load_cursors(db, list(runnable))
+        fetch_seconds: dict[str, float] = {}
+
+        # Network fetches run concurrently; DB writes below stay sequential on the caller's session.
+        fetched_by_source = self.http.run(
+            self._fetch_all(
+                runnable,
+                limit_per_source,
+                known_ids,
+                stored_cursors if incremental else {},
+                fetch_seconds,
+            )
+        )
+        if enrich:
+            # Full page bodies replace the short upstream snippets before anything is cleaned or written.
+            fetched_items = [
+                item
+                for fetched in fetched_by_source.values()
+                if not isinstance(fetched, Exception)
+                for item in fetched.items
+            ]
+            results["enrichment"] = self.http.run(self.body_fetcher.enrich(fetched_items))
+
+        for source_key, fetched in fetched_by_source.items():
+            rate_limiter = getattr(runnable[source_key], "rate_limiter", None)
+            if isinstance(fetched, Exception):
+                logger.warning("Ingestion fetch failed for source=%s", source_key, exc_info=fetched)
+                results["sources"][source_key] = {"error": self._describe_fetch_error(fetched)}
+                if rate_limiter is not None:
+                    results["sources"][source_key]["rate_limit"] = rate_limiter.snapshot()
+                if on_source_done is not None:
+                    on_source_done(source_key, results["sources"][source_key])
+                continue
+
+            write_started = time.perf_counter()
+            upsert_results = self.article_service.create_articles_bulk(
+                db,
+                [
+                    RawArticle(
+                        source_name=item.source_name,
+                        source_type=item.source_type,
+                        url=item.url,
+                        title=item.title,
+                        raw_text=item.raw_text,
+                        published_at=item.published_at,
+                    )
+                    for item in fetched.items
+                ],
+            )
+            source_skipped = sum(1 for upsert_result in upsert_results if upsert_result.deduped)
+            source_ingested = len(upsert_results) - source_skipped
+            source_near_duplicates = sum(1 for upsert_result in upsert_results if upsert_result.near_duplicate_of)
+            article_ids = {
+                item.external_id: upsert_result.article_id
+                for item, upsert_result in zip(fetched.items, upsert_results)
+                if item.external_id is not None
+            }
+            self._record_seen_ids(db, source_key, fetched.seen_external_ids, article_ids)
+            # Only advanced once the batch is committed, so a failed write re-polls the same window.
+            # Full re-scans never move a cursor backwards.
+            if self._cursor_advances(stored_cursors.get(source_key), fetched.next_cursor):
+                self._save_cursor(db, source_key, fetched.next_cursor)
+            elapsed = fetch_seconds[source_key] + time.perf_counter() - write_started
 
             results["ingested"] += source_ingested
             results["skipped"] += source_skipped
+            results["fetches_avoided"] += fetched.fetches_avoided
             results["sources"][source_key] = {
-                "fetched": len(fetched),
+                "fetched": len(fetched.items),
                 "ingested": source_ingested,
                 "skipped": source_skipped,
+                "near_duplicates": source_near_duplicates,
+                "fetches_avoided": fetched.fetches_avoided,
+                "elapsed_seconds": round(elapsed, 3),
+                "items_per_second": round(len(fetched.items) / elapsed, 1) if elapsed > 0 else 0.0,
             }
+            if rate_limiter is not None:
+                results["sources"][source_key]["rate_limit"] = rate_limiter.snapshot()
+            if on_source_done is not None:
+                on_source_done(source_key, results["sources"][source_key])
         return results
+
+    @staticmethod
+    def _load_known_ids(db: Session, source_keys: list[str]) -> dict[str, frozenset[str]]:
+        if not source_keys:
+            return {}
+        rows = (
+            db.query(models.SourceItem.source_key, models.SourceItem.external_id)
+            .filter(models.SourceItem.source_key.in_(source_keys))
+            .all()
+        )
+        known: dict[str, set[str]] = {source_key: set() for source_key in source_keys}
+        for source_key, external_id in rows:
+            known[source_key].add(external_id)
+        return {source_key: frozenset(ids) for source_key, ids in known.items()}
+
+    @staticmethod
+    def _load_cursors(db: Session, source_keys: list[str]) -> dict[str, str]:
+        if not source_keys:
+            return {}
+        rows = (
+            db.query(models.IngestionCursor.source_key, models.IngestionCursor.cursor)
+            .filter(models.IngestionCursor.source_key.in_(source_keys))
+            .all()
+        )
+        return {source_key: cursor for source_key, cursor in rows}
+
+    @staticmethod
+    def _cursor_advances(stored: str | None, candidate: str | None) -> bool:
+        if candidate is None:
+            return False
+        if stored is None:
+            return True
+        if stored.isdigit() and candidate.isdigit():
+            return int(candidate) > int(stored)
+        return candidate > stored
+
+    @staticmethod
+    def _save_cursor(db: Session, source_key: str, cursor: str) -> None:
+        statement = sqlite_insert(models.IngestionCursor).values(
+            source_key=source_key, cursor=cursor, updated_at=datetime.utcnow()
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[models.IngestionCursor.source_key],
+                set_={"cursor": statement.excluded.cursor, "updated_at": statement.excluded.updated_at},
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def _record_seen_ids(db: Session, source_key: str, external_ids: list[str], article_ids: dict[str, int]) -> None:
+        if not external_ids:
+            return
+        rows = [
+            {
+                "source_key": source_key,
+                "external_id": external_id,
+                "article_id": article_ids.get(external_id),
+            }
+            for external_id in dict.fromkeys(external_ids)
+        ]
+        db.execute(sqlite_insert(models.SourceItem).values(rows).on_conflict_do_nothing())
+        db.commit()
+
+    @staticmethod
+    def _describe_fetch_error(exc: Exception) -> str:
+        # Request URLs can carry credentials (GNews passes its API key as a query
+        # param), so only the exception type and status code leave the server.
+        if isinstance(exc, httpx.HTTPStatusError):
+            return f"fetch_failed: {type(exc).__name__} status={exc.response.status_code}"
+        return f"fetch_failed: {type(exc).__name__}"
+
+    @staticmethod
+    async def _fetch_all(
+        adapters: dict[str, SourceAdapter],
+        limit: int,
+        known_ids: dict[str, frozenset[str]],
+        cursors: dict[str, str],
+        fetch_seconds: dict[str, float],
+    ) -> dict[str, AdapterFetchResult | Exception]:
+        async def timed_fetch(source_key: str, adapter: SourceAdapter) -> AdapterFetchResult:
+            started = time.perf_counter()
+            try:
+                return await adapter.fetch_items_async(
+                    limit,
+                    known_ids=known_ids.get(source_key, frozenset()),
+                    cursor=cursors.get(source_key),
+                )
+            finally:
+                fetch_seconds[source_key] = time.perf_counter() - started
+
+        outcomes = await asyncio.gather(
+            *(timed_fetch(source_key, adapter) for source_key, adapter in adapters.items()),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        return dict(zip(adapters.keys(), outcomes))
@@ -1,41 +1,160 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app import models, schemas
 from app.config.sources import SOURCE_REGISTRY
-from app.db import Base, engine, get_db
-from app.ingestion import IngestionRunner
+from app.db import SessionLocal, engine, get_db, get_read_db
+from app.migrations import run_migrations
 from app.services.article_service import ArticleService
-from app.services.claim_extraction import parse_claim_extraction_json
-from app.services.claim_service import ClaimService
+from app.services.claim_extraction import ClaimExtractionResult, parse_claim_extraction_json
+from app.services.claim_service import ClaimBatchItem, ClaimBatchRecordResult, ClaimService
 from app.services.cluster_service import ClusterService
+from app.services.retention_service import RetentionService
+from app.services.search_service import MAX_SEARCH_LIMIT, SEARCH_KINDS, SearchQueryError, SearchService
 from app.services.summary_service import SummaryService
 
-Base.metadata.create_all(bind=engine)
+if TYPE_CHECKING:
+    from app.ingestion.jobs import IngestionJobManager
+    from app.ingestion.service import IngestionRunner
+
+
+class AppServices:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.session_factory = session_factory
+        self._lock = threading.RLock()
+        self._instances: dict[str, Any] = {}
+        self._schema_ready = False
+
+    @property
+    def article_service(self) -> ArticleService:
+        return self._get("article_service", ArticleService)
+
+    @property
+    def ingestion_runner(self) -> IngestionRunner:
+        def build() -> IngestionRunner:
+            # The ingestion stack (httpx, h2, the async pool) is only imported once a route needs it.
+            from app.ingestion.service import IngestionRunner
+
+            return IngestionRunner(article_service=self.article_service)
+
+        return self._get("ingestion_runner", build)
+
+    @property
+    def ingestion_jobs(self) -> IngestionJobManager:
+        def build() -> IngestionJobManager:
+            from app.ingestion.jobs import IngestionJobManager
+
+            return IngestionJobManager(self.ingestion_runner, session_factory=self.session_factory)
+
+        return self._get("ingestion_jobs", build)
+
+    @property
+    def claim_service(self) -> ClaimService:
+        return self._get("claim_service", ClaimService)
+
+    @property
+    def cluster_service(self) -> ClusterService:
+        return self._get("cluster_service", ClusterService)
+
+    @property
+    def summary_service(self) -> SummaryService:
+        return self._get("summary_service", SummaryService)
+
+    @property
+    def retention_service(self) -> RetentionService:
+        return self._get("retention_service", RetentionService)
+
+    @property
+    def search_service(self) -> SearchService:
+        return self._get("search_service", SearchService)
+
+    def ensure_schema(self) -> None:
+        if self._schema_ready:
+            return
+        with self._lock:
+            if not self._schema_ready:
+                run_migrations(engine)
+                self._schema_ready = True
+
+    def startup(self) -> None:
+        self.ensure_schema()
+        with self.session_factory() as db:
+            self.article_service.warm_source_cache(db)
+            self.article_service.dedupe_filter.load_or_build(db)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            instances, self._instances = self._instances, {}
+        if "article_service" in instances:
+            instances["article_service"].dedupe_filter.save()
+        if "ingestion_jobs" in instances:
+            instances["ingestion_jobs"].shutdown()
+        if "ingestion_runner" in instances:
+            instances["ingestion_runner"].close()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = factory()
+                    self._instances[name] = instance
+        return instance
+
+
+def get_services(request: Request) -> AppServices:
+    services: AppServices = request.app.state.services
+    # Covers apps driven without their lifespan, e.g. a TestClient used outside `with`.
+    services.ensure_schema()
+    return services
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    services: AppServices = app.state.services
+    services.startup()
+    yield
+    services.shutdown()
+
+
+router = APIRouter()
+
 
-app = FastAPI(title="How Is The World Looking API")
-ingestion_runner = IngestionRunner()
-article_service = ArticleService()
-claim_service = ClaimService()
-cluster_service = ClusterService()
-summary_service = SummaryService()
+def create_app(services: AppServices | None = None) -> FastAPI:
+    application = FastAPI(title="How Is The World Looking API", lifespan=lifespan)
+    application.state.services = services or AppServices()
+    application.include_router(router)
+    return application
 
 
-@app.get("/health", response_model=schemas.HealthResponse)
+@router.get("/health", response_model=schemas.HealthResponse)
 def health() -> schemas.HealthResponse:
     return schemas.HealthResponse()
 
 
-@app.get("/sources")
+@router.get("/sources")
 def list_sources():
     return {"sources": [asdict(cfg) for cfg in SOURCE_REGISTRY.values()]}
 
 
-@app.post("/articles")
-def create_article(payload: schemas.ArticleInput, db: Session = Depends(get_db)):
-    upsert_result = article_service.create_article_from_raw(
+@router.post("/articles")
+def create_article(
+    payload: schemas.ArticleInput,
+    db: Session = Depends(get_db),
+    services: AppServices = Depends(get_services),
+):
+    upsert_result = services.article_service.create_article_from_raw(
         db,
         source_name=payload.source_name,
         source_type=payload.source_type,
@@ -43,49 +162,172 @@ def create_article(payload: schemas.ArticleInput, db: Session = Depends(get_db))
         title=payload.title,
         raw_text=payload.raw_text,
     )
-    return {"article_id": upsert_result.article_id, "deduped": upsert_result.deduped}
+    # Rowids stay internal; the API only hands out the article's public id.
+    public_id = db.query(models.Article.public_id).filter(models.Article.id == upsert_result.article_id).scalar()
+    return {
+        "article_id": public_id,
+        "deduped": upsert_result.deduped,
+        "near_duplicate_of": public_id if upsert_result.near_duplicate_of is not None else None,
+    }
 
 
-@app.post("/ingest/run", response_model=schemas.IngestionRunResponse)
-def run_ingestion(payload: schemas.IngestionRunRequest, db: Session = Depends(get_db)) -> schemas.IngestionRunResponse:
-    result = ingestion_runner.run(
-        db=db,
+@router.post("/ingest/run", response_model=schemas.IngestionJobAccepted, status_code=202)
+def run_ingestion(
+    payload: schemas.IngestionRunRequest,
+    services: AppServices = Depends(get_services),
+) -> schemas.IngestionJobAccepted:
+    job, coalesced = services.ingestion_jobs.submit(
         source_keys=payload.source_keys,
         limit_per_source=payload.limit_per_source,
+        backfill=payload.backfill,
+        enrich=payload.enrich,
     )
-    return schemas.IngestionRunResponse(**result)
+    return schemas.IngestionJobAccepted(job_id=job.id, status=job.status, coalesced=coalesced)
+
+
+@router.get("/ingest/jobs/{job_id}", response_model=schemas.IngestionJobStatus)
+def get_ingestion_job(job_id: str, services: AppServices = Depends(get_services)) -> schemas.IngestionJobStatus:
+    job = services.ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="ingestion_job_not_found")
+    return schemas.IngestionJobStatus(**job)
+
+
+@router.get("/ingest/http-pool")
+def get_ingestion_http_pool_stats(services: AppServices = Depends(get_services)):
+    return services.ingestion_runner.http_pool_stats()
+
+
+@router.get("/ingest/dedupe-filter")
+def get_dedupe_filter_stats(services: AppServices = Depends(get_services)):
+    return services.article_service.dedupe_filter.stats()
 
 
-@app.post("/extract/claims", response_model=schemas.ClaimExtractionRunResponse)
+@router.post("/extract/claims", response_model=schemas.ClaimExtractionRunResponse)
 def extract_claims(
     payload: schemas.ClaimExtractionRunRequest,
     db: Session = Depends(get_db),
+    services: AppServices = Depends(get_services),
 ) -> schemas.ClaimExtractionRunResponse:
-    article = db.query(models.Article).filter(models.Article.id == payload.article_id).first()
+    article = db.query(models.Article).filter(models.Article.public_id == payload.article_id).first()
     if article is None:
         raise HTTPException(status_code=404, detail="article_not_found")
+    if article.archived_at is not None:
+        raise HTTPException(status_code=409, detail="article_archived")
 
     try:
         extraction_result = parse_claim_extraction_json(payload.model_output_json)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    persist_result = claim_service.persist_extracted_claims(
+    persist_result = services.claim_service.persist_extracted_claims(
         db,
         article=article,
         extraction_result=extraction_result,
         extraction_model=payload.extraction_model,
         extraction_version=payload.extraction_version,
     )
-    return schemas.ClaimExtractionRunResponse(
-        claims_created=persist_result.claims_created,
-        evidence_created=persist_result.evidence_created,
+    return schemas.ClaimExtractionRunResponse(**asdict(persist_result))
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[tuple[int, bytes | None]]:
+    # Yields (line number, record) for each non-blank line; None marks a line longer than
+    # max_line_bytes, which is dropped as it streams in rather than buffered.
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        while (newline := buffer.find(b"\n")) != -1:
+            line_number += 1
+            line = bytes(buffer[:newline])
+            del buffer[: newline + 1]
+            if oversized or len(line) > max_line_bytes:
+                oversized = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer.clear()
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, bytes(buffer)
+
+
+def _persist_claim_chunk(services: AppServices, chunk: list[tuple[int, bytes | None]]) -> list[ClaimBatchRecordResult]:
+    results: dict[int, ClaimBatchRecordResult] = {}
+    items: list[ClaimBatchItem] = []
+    for line, raw in chunk:
+        if raw is None:
+            results[line] = ClaimBatchRecordResult(line, None, "failed", error="record_too_large")
+            continue
+        try:
+            record = schemas.ClaimExtractionRunRequest.model_validate_json(raw)
+        except ValidationError:
+            results[line] = ClaimBatchRecordResult(line, None, "failed", error="invalid_record")
+            continue
+        try:
+            extraction_result = ClaimExtractionResult.model_validate_json(record.model_output_json)
+        except ValidationError:
+            results[line] = ClaimBatchRecordResult(line, record.article_id, "failed", error="invalid_model_output")
+            continue
+        items.append(
+            ClaimBatchItem(
+                line=line,
+                article_id=record.article_id,
+                extraction_result=extraction_result,
+                extraction_model=record.extraction_model,
+                extraction_version=record.extraction_version,
+            )
+        )
+    if items:
+        with services.session_factory() as db:
+            for result in services.claim_service.persist_extraction_batch(db, items):
+                results[result.line] = result
+    return [results[line] for line, _ in chunk]
+
+
+@router.post("/extract/claims/batch", response_model=schemas.ClaimExtractionBatchResponse)
+async def extract_claims_batch(
+    request: Request,
+    chunk_size: int = Query(default=200, ge=1, le=schemas.CLAIM_BATCH_MAX_CHUNK_SIZE),
+    services: AppServices = Depends(get_services),
+) -> schemas.ClaimExtractionBatchResponse:
+    # The body is NDJSON, one ClaimExtractionRunRequest per line. It is read as it arrives
+    # and persisted chunk_size records per transaction, so memory is bounded by one chunk.
+    results: list[ClaimBatchRecordResult] = []
+    chunk: list[tuple[int, bytes | None]] = []
+    async for record in _ndjson_lines(request.stream(), schemas.CLAIM_BATCH_MAX_RECORD_BYTES):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            results.extend(await run_in_threadpool(_persist_claim_chunk, services, chunk))
+            chunk = []
+    if chunk:
+        results.extend(await run_in_threadpool(_persist_claim_chunk, services, chunk))
+
+    persisted = [result for result in results if result.status == "persisted"]
+    return schemas.ClaimExtractionBatchResponse(
+        records=len(results),
+        persisted=len(persisted),
+        failed=len(results) - len(persisted),
+        claims_created=sum(result.claims_created for result in persisted),
+        claims_updated=sum(result.claims_updated for result in persisted),
+        claims_deleted=sum(result.claims_deleted for result in persisted),
+        claims_unchanged=sum(result.claims_unchanged for result in persisted),
+        evidence_created=sum(result.evidence_created for result in persisted),
+        results=[schemas.ClaimExtractionBatchRecordStatus(**asdict(result)) for result in results],
     )
 
 
-@app.post("/clusters/build", response_model=schemas.ClusterBuildResponse)
-def build_clusters(payload: schemas.ClusterBuildRequest, db: Session = Depends(get_db)) -> schemas.ClusterBuildResponse:
-    result = cluster_service.build_clusters(
+@router.post("/clusters/build", response_model=schemas.ClusterBuildResponse)
+def build_clusters(
+    payload: schemas.ClusterBuildRequest,
+    db: Session = Depends(get_db),
+    services: AppServices = Depends(get_services),
+) -> schemas.ClusterBuildResponse:
+    result = services.cluster_service.build_clusters(
         db,
         lookback_hours=payload.lookback_hours,
         similarity_threshold=payload.similarity_threshold,
@@ -97,9 +339,19 @@ def build_clusters(payload: schemas.ClusterBuildRequest, db: Session = Depends(g
     )
 
 
-@app.post("/summaries/build", response_model=schemas.SummaryBuildResponse)
-def build_summaries(payload: schemas.SummaryBuildRequest, db: Session = Depends(get_db)) -> schemas.SummaryBuildResponse:
-    result = summary_service.build_summaries(db, cluster_ids=payload.cluster_ids)
+@router.post("/summaries/build", response_model=schemas.SummaryBuildResponse)
+def build_summaries(
+    payload: schemas.SummaryBuildRequest,
+    db: Session = Depends(get_db),
+    services: AppServices = Depends(get_services),
+) -> schemas.SummaryBuildResponse:
+    cluster_ids = None
+    if payload.cluster_ids:
+        cluster_ids = [
+            row[0]
+            for row in db.query(models.EventCluster.id).filter(models.EventCluster.public_id.in_(payload.cluster_ids))
+        ]
+    result = services.summary_service.build_summaries(db, cluster_ids=cluster_ids)
     return schemas.SummaryBuildResponse(
         summaries_created=result.summaries_created,
         citations_created=result.citations_created,
@@ -107,7 +359,38 @@ def build_summaries(payload: schemas.SummaryBuildRequest, db: Session = Depends(
     )
 
 
-@app.get("/events/latest", response_model=schemas.EventsLatestResponse)
-def get_latest_events(limit: int = 10, db: Session = Depends(get_db)) -> schemas.EventsLatestResponse:
-    events = summary_service.get_latest_events(db, limit=limit)
+@router.get("/search", response_model=schemas.SearchResponse)
+def search(
+    q: str = Query(min_length=1, max_length=500),
+    kinds: list[str] = Query(default=list(SEARCH_KINDS)),
+    limit: int = Query(default=20, ge=1, le=MAX_SEARCH_LIMIT),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+    services: AppServices = Depends(get_services),
+) -> schemas.SearchResponse:
+    try:
+        page = services.search_service.search(db, q, kinds=kinds, limit=limit, cursor=cursor)
+    except SearchQueryError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return schemas.SearchResponse(
+        hits=[schemas.SearchHit(**asdict(hit)) for hit in page.hits],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post("/maintenance/retention")
+def run_retention(services: AppServices = Depends(get_services)):
+    return asdict(services.retention_service.run(engine))
+
+
+@router.get("/events/latest", response_model=schemas.EventsLatestResponse)
+def get_latest_events(
+    limit: int = 10,
+    db: Session = Depends(get_read_db),
+    services: AppServices = Depends(get_services),
+) -> schemas.EventsLatestResponse:
+    events = services.summary_service.get_latest_events(db, limit=limit)
     return schemas.EventsLatestResponse(events=[schemas.EventCard(**event) for event in events])
+
+
+app = create_app()
@@ -0,0 +1,276 @@
+"""Apply pending schema migrations to a database, backing its file up first.
+
+Usage (from backend/):
+    python -m app.migrations --database-url sqlite:///./mvp.db
+
+The API and the backfill CLI apply pending migrations on startup as well; running this
+first keeps the slow ones (integer_surrogate_keys rewrites every table) out of a deploy.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    ForeignKey,
+    Index,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    bindparam,
+    make_url,
+    select,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.db import DATABASE_URL, Base, create_db_engine
+from app.services.search_service import create_search_indexes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    def apply(connection: Connection) -> None:
+        indexes = {index.name: index for table in Base.metadata.sorted_tables for index in table.indexes}
+        for name in names:
+            indexes[name].create(connection, checkfirst=True)
+
+    return apply
+
+
+def _unique_source_names(connection: Connection) -> None:
+    # Databases created before sources.name was unique may hold duplicate rows; fold them
+    # into the oldest id so the unique index can be built.
+    connection.execute(
+        text(
+            "UPDATE articles SET source_id = ("
+            " SELECT MIN(keep.id) FROM sources AS keep JOIN sources AS dup ON dup.name = keep.name"
+            " WHERE dup.id = articles.source_id)"
+            " WHERE source_id IN (SELECT id FROM sources)"
+        )
+    )
+    connection.execute(
+        text("DELETE FROM sources WHERE EXISTS (SELECT 1 FROM sources AS keep WHERE keep.name = sources.name AND keep.id < sources.id)")
+    )
+    _create_indexes("uq_sources_name")(connection)
+
+
+def _integer_surrogate_keys(connection: Connection) -> None:
+    # uuid4 string keys become rowids. Articles and clusters keep their old id as public_id,
+    # so ids already handed out by the API stay valid.
+    if _column_type(connection, "articles", "id") == "INTEGER":
+        return
+    tables = [
+        table
+        for table in Base.metadata.sorted_tables
+        if "id" in table.columns or any(column.foreign_keys for column in table.columns)
+    ]
+    keyed = [table.name for table in tables if "id" in table.columns]
+    connection.execute(text("SAVEPOINT integer_surrogate_keys"))
+    for name in keyed:
+        connection.execute(text(f"CREATE TEMP TABLE _idmap_{name} (old_id TEXT PRIMARY KEY, new_id INTEGER NOT NULL)"))
+        connection.execute(
+            text(f"INSERT INTO _idmap_{name} SELECT id, ROW_NUMBER() OVER (ORDER BY rowid) FROM {name}")
+        )
+    legacy_indexes = connection.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN :names").bindparams(
+            bindparam("names", expanding=True)
+        ),
+        {"names": [table.name for table in tables]},
+    ).scalars().all()
+    for index in legacy_indexes:
+        connection.execute(text(f"DROP INDEX {index}"))
+    for table in tables:
+        connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {table.name}__legacy"))
+    Base.metadata.create_all(connection, tables=tables)
+
+    for table in tables:
+        legacy_columns = {row[1] for row in connection.execute(text(f"PRAGMA table_info({table.name}__legacy)"))}
+        targets: list[str] = []
+        values: list[str] = []
+        joins: list[str] = []
+        for column in table.columns:
+            if column.name == "id":
+                joins.append(f"JOIN _idmap_{table.name} AS id_map ON id_map.old_id = legacy.id")
+                value = "id_map.new_id"
+            elif column.name == "public_id":
+                value = "legacy.id"
+            elif column.name not in legacy_columns:
+                continue
+            elif column.foreign_keys:
+                parent = next(iter(column.foreign_keys)).column.table.name
+                join = "LEFT JOIN" if column.nullable else "JOIN"
+                joins.append(f"{join} _idmap_{parent} AS {column.name}_map ON {column.name}_map.old_id = legacy.{column.name}")
+                value = f"{column.name}_map.new_id"
+            else:
+                value = f"legacy.{column.name}"
+            targets.append(column.name)
+            values.append(value)
+        copied = connection.execute(
+            text(
+                f"INSERT INTO {table.name} ({', '.join(targets)}) SELECT {', '.join(values)}"
+                f" FROM {table.name}__legacy AS legacy {' '.join(joins)}"
+            )
+        ).rowcount
+        total = connection.execute(text(f"SELECT COUNT(*) FROM {table.name}__legacy")).scalar()
+        if copied != total:
+            logger.warning("Dropped %s orphaned rows from %s", total - copied, table.name)
+
+    for table in reversed(tables):
+        connection.execute(text(f"DROP TABLE {table.name}__legacy"))
+    for name in keyed:
+        connection.execute(text(f"DROP TABLE _idmap_{name}"))
+    connection.execute(text("RELEASE integer_surrogate_keys"))
+
+
+def _column_type(connection: Connection, table: str, column: str) -> str | None:
+    for row in connection.execute(text(f"PRAGMA table_info({table})")):
+        if row[1] == column:
+            return row[2].upper()
+    return None
+
+
+def _add_column(table: str, column: str) -> Callable[[Connection], None]:
+    def apply(connection: Connection) -> None:
+        if _column_type(connection, table, column) is not None:
+            return
+        definition = Base.metadata.tables[table].columns[column]
+        type_sql = definition.type.compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {type_sql}"))
+
+    return apply
+
+
+def uuid_key_metadata() -> MetaData:
+    # The schema as it was before integer_surrogate_keys, for migration tests and benchmarks.
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        columns = [
+            Column(
+                column.name,
+                String if column.name == "id" or column.foreign_keys else column.type,
+                *(ForeignKey(foreign_key.target_fullname) for foreign_key in column.foreign_keys),
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                unique=column.unique,
+            )
+            for column in table.columns
+            if column.name not in {"public_id", "archived_at"}
+        ]
+        constraints = [
+            UniqueConstraint(*constraint.columns.keys(), name=constraint.name)
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint) and constraint.name
+        ]
+        indexes = [Index(index.name, *index.columns.keys(), unique=index.unique) for index in table.indexes]
+        Table(table.name, metadata, *columns, *constraints, *indexes, **table.dialect_kwargs)
+    return metadata
+
+
+# Append only; each entry must be idempotent, since fresh databases already get the
+# final schema from create_all and only record the versions here.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "unique_source_names", _unique_source_names),
+    Migration(
+        2,
+        "hot_path_indexes",
+        _create_indexes(
+            "ix_articles_created_at",
+            "ix_claims_article_id",
+            "ix_claims_event_cluster_id",
+            "ix_claim_evidence_claim_id",
+            "ix_claim_relations_left_claim_id",
+            "ix_claim_relations_right_claim_id",
+            "ix_summary_citations_claim_id",
+            "ix_summaries_created_at",
+            "ix_event_clusters_status",
+        ),
+    ),
+    Migration(3, "integer_surrogate_keys", _integer_surrogate_keys),
+    Migration(4, "article_archived_at", _add_column("articles", "archived_at")),
+    Migration(5, "full_text_search", create_search_indexes),
+]
+
+
+def run_migrations(engine: Engine, migrations: list[Migration] | None = None) -> list[int]:
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(models.SchemaMigration.version)).scalars())
+
+    newly_applied: list[int] = []
+    for migration in sorted(migrations or MIGRATIONS, key=lambda item: item.version):
+        if migration.version in applied:
+            continue
+        try:
+            with engine.begin() as connection:
+                migration.apply(connection)
+                connection.execute(
+                    models.SchemaMigration.__table__.insert().values(
+                        version=migration.version,
+                        name=migration.name,
+                        applied_at=datetime.utcnow(),
+                    )
+                )
+        except IntegrityError:
+            # Another process recorded this version first; its changes are already in place.
+            continue
+        logger.info("Applied schema migration %s_%s", migration.version, migration.name)
+        newly_applied.append(migration.version)
+    return newly_applied
+
+
+def backup_sqlite_database(url: str) -> Path | None:
+    database = make_url(url).database
+    if not url.startswith("sqlite") or not database or database == ":memory:" or not Path(database).exists():
+        return None
+    target = Path(f"{database}.{datetime.utcnow():%Y%m%d%H%M%S}.bak")
+    # The online backup API copies a consistent snapshot even with WAL frames pending.
+    source = sqlite3.connect(database)
+    try:
+        destination = sqlite3.connect(target)
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+    finally:
+        source.close()
+    return target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--no-backup", action="store_true", help="skip copying the database file first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.no_backup and (backup := backup_sqlite_database(args.database_url)) is not None:
+        logger.info("Backed up database to %s", backup)
+    engine = create_db_engine(args.database_url)
+    try:
+        applied = run_migrations(engine)
+    finally:
+        engine.dispose()
+    print(f"Applied migrations: {applied or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,26 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
 
 
+# Integer rowids are used internally; only articles and clusters are addressed from the API.
+def _public_id() -> str:
+    return str(uuid.uuid4())
+
+
+# AUTOINCREMENT keeps SQLite from handing a deleted row's id (e.g. a re-extracted claim) to a new row.
+_ROWID_KEYS = {"sqlite_autoincrement": True}
+
+
 class Source(Base):
     __tablename__ = "sources"
+    __table_args__ = (Index("uq_sources_name", "name", unique=True), _ROWID_KEYS)
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     homepage_url: Mapped[str | None] = mapped_column(String, nullable=True)
     source_type: Mapped[str] = mapped_column(String, default="newspaper")
@@ -21,26 +31,94 @@ class Source(Base):
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    source_id: Mapped[str] = mapped_column(String, ForeignKey("sources.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    public_id: Mapped[str] = mapped_column(String(36), unique=True, nullable=False, default=_public_id)
+    source_id: Mapped[int] = mapped_column(Integer, ForeignKey("sources.id"), nullable=False)
     url: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
     published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     cleaned_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     content_hash: Mapped[str | None] = mapped_column(String(64), unique=True, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    # Set once RetentionService has moved the text and claims to the archive database.
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     source: Mapped["Source"] = relationship(back_populates="articles")
     claims: Mapped[list["Claim"]] = relationship(back_populates="article")
 
 
+class ArticleFingerprint(Base):
+    __tablename__ = "article_fingerprints"
+
+    article_id: Mapped[int] = mapped_column(Integer, ForeignKey("articles.id"), primary_key=True)
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class ArticleFingerprintBand(Base):
+    __tablename__ = "article_fingerprint_bands"
+    # Clustered on the bucket hash so each LSH bucket is one contiguous index range.
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    value: Mapped[int] = mapped_column(Integer, primary_key=True)
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    article_id: Mapped[int] = mapped_column(Integer, ForeignKey("articles.id"), primary_key=True)
+
+
+class SourceItem(Base):
+    __tablename__ = "source_items"
+    __table_args__ = (
+        UniqueConstraint("source_key", "external_id", name="uq_source_items_source_key_external_id"),
+        _ROWID_KEYS,
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source_key: Mapped[str] = mapped_column(String, nullable=False)
+    external_id: Mapped[str] = mapped_column(String, nullable=False)
+    article_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("articles.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class IngestionCursor(Base):
+    __tablename__ = "ingestion_cursors"
+
+    source_key: Mapped[str] = mapped_column(String, primary_key=True)
+    cursor: Mapped[str] = mapped_column(String, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class IngestionJobRecord(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # The request key while the job is queued or running, NULL once it finishes. The unique
+    # index makes coalescing atomic across workers; SQLite never treats NULLs as equal.
+    active_key: Mapped[str | None] = mapped_column(String, nullable=True, unique=True)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    source_keys_json: Mapped[str] = mapped_column(Text, nullable=False)
+    limit_per_source: Mapped[int] = mapped_column(Integer, nullable=False)
+    backfill: Mapped[bool] = mapped_column(Boolean, default=False)
+    enrich: Mapped[bool] = mapped_column(Boolean, default=False)
+    sources_done: Mapped[int] = mapped_column(Integer, default=0)
+    source_results_json: Mapped[str] = mapped_column(Text, default="{}")
+    result_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Touched on every state change; an active job that stops updating was orphaned by its worker.
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class EventCluster(Base):
     __tablename__ = "event_clusters"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    public_id: Mapped[str] = mapped_column(String(36), unique=True, nullable=False, default=_public_id)
     canonical_title: Mapped[str] = mapped_column(String, nullable=False)
-    status: Mapped[str] = mapped_column(String, default="active")
+    status: Mapped[str] = mapped_column(String, default="active", index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     claims: Mapped[list["Claim"]] = relationship(back_populates="event_cluster")
@@ -48,10 +126,11 @@ class EventCluster(Base):
 
 class Claim(Base):
     __tablename__ = "claims"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    article_id: Mapped[str] = mapped_column(String, ForeignKey("articles.id"), nullable=False)
-    event_cluster_id: Mapped[str | None] = mapped_column(String, ForeignKey("event_clusters.id"), nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    article_id: Mapped[int] = mapped_column(Integer, ForeignKey("articles.id"), nullable=False, index=True)
+    event_cluster_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("event_clusters.id"), nullable=True, index=True)
     claim_text: Mapped[str] = mapped_column(Text, nullable=False)
     claim_type: Mapped[str] = mapped_column(String, nullable=False)
     confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -68,10 +147,11 @@ class Claim(Base):
 
 class ClaimEvidence(Base):
     __tablename__ = "claim_evidence"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    claim_id: Mapped[str] = mapped_column(String, ForeignKey("claims.id"), nullable=False)
-    article_id: Mapped[str] = mapped_column(String, ForeignKey("articles.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    claim_id: Mapped[int] = mapped_column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    article_id: Mapped[int] = mapped_column(Integer, ForeignKey("articles.id"), nullable=False)
     evidence_text: Mapped[str] = mapped_column(Text, nullable=False)
     start_char: Mapped[int | None] = mapped_column(Integer, nullable=True)
     end_char: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -83,10 +163,11 @@ class ClaimEvidence(Base):
 
 class ClaimRelation(Base):
     __tablename__ = "claim_relations"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    left_claim_id: Mapped[str] = mapped_column(String, ForeignKey("claims.id"), nullable=False)
-    right_claim_id: Mapped[str] = mapped_column(String, ForeignKey("claims.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    left_claim_id: Mapped[int] = mapped_column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    right_claim_id: Mapped[int] = mapped_column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
     relation_type: Mapped[str] = mapped_column(String, nullable=False)
     score: Mapped[float | None] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -94,24 +175,34 @@ class ClaimRelation(Base):
 
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_cluster_id: Mapped[str] = mapped_column(String, ForeignKey("event_clusters.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_cluster_id: Mapped[int] = mapped_column(Integer, ForeignKey("event_clusters.id"), nullable=False)
     agreed_facts_json: Mapped[str] = mapped_column(Text, default="[]")
     disputed_claims_json: Mapped[str] = mapped_column(Text, default="[]")
     unknowns_json: Mapped[str] = mapped_column(Text, default="[]")
     confidence_rationale: Mapped[str] = mapped_column(Text, default="")
     confidence_score: Mapped[float | None] = mapped_column(Float, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
 
 class SummaryCitation(Base):
     __tablename__ = "summary_citations"
+    __table_args__ = _ROWID_KEYS
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    summary_id: Mapped[str] = mapped_column(String, ForeignKey("summaries.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    summary_id: Mapped[int] = mapped_column(Integer, ForeignKey("summaries.id"), nullable=False)
     section: Mapped[str] = mapped_column(String, nullable=False)
     bullet_index: Mapped[int] = mapped_column(Integer, nullable=False)
-    claim_id: Mapped[str] = mapped_column(String, ForeignKey("claims.id"), nullable=False)
-    evidence_id: Mapped[str | None] = mapped_column(String, ForeignKey("claim_evidence.id"), nullable=True)
+    claim_id: Mapped[int] = mapped_column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    evidence_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("claim_evidence.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,11 @@
-from pydantic import BaseModel, Field
+from datetime import datetime
+
+from pydantic import BaseModel, Field, model_validator
+
+LIMIT_PER_SOURCE = 100
+BACKFILL_LIMIT_PER_SOURCE = 5000
+CLAIM_BATCH_MAX_CHUNK_SIZE = 1000
+CLAIM_BATCH_MAX_RECORD_BYTES = 1 << 20
 
 
 class HealthResponse(BaseModel):
@@ -15,13 +22,52 @@ class ArticleInput(BaseModel):
 
 class IngestionRunRequest(BaseModel):
     source_keys: list[str] | None = None
-    limit_per_source: int = Field(default=10, ge=1, le=100)
+    limit_per_source: int = Field(default=10, ge=1, le=BACKFILL_LIMIT_PER_SOURCE)
+    # Backfill runs ignore stored cursors and may page through far more items per source.
+    backfill: bool = False
+    # Download each article's page body before cleaning instead of keeping only the upstream snippet.
+    enrich: bool = False
+
+    @model_validator(mode="after")
+    def check_limit_for_mode(self) -> "IngestionRunRequest":
+        if not self.backfill and self.limit_per_source > LIMIT_PER_SOURCE:
+            raise ValueError(f"limit_per_source above {LIMIT_PER_SOURCE} requires backfill=true")
+        return self
 
 
 class IngestionRunResponse(BaseModel):
     ingested: int
     skipped: int
+    fetches_avoided: int = 0
     sources: dict
+    enrichment: dict | None = None
+
+
+class IngestionJobAccepted(BaseModel):
+    job_id: str
+    status: str
+    coalesced: bool
+
+
+class IngestionJobProgress(BaseModel):
+    sources_total: int
+    sources_done: int
+    sources: dict
+
+
+class IngestionJobStatus(BaseModel):
+    job_id: str
+    status: str
+    source_keys: list[str]
+    limit_per_source: int
+    backfill: bool
+    enrich: bool
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    progress: IngestionJobProgress
+    result: IngestionRunResponse | None = None
+    error: str | None = None
 
 
 class ClaimExtractionRunRequest(BaseModel):
@@ -33,9 +79,36 @@ class ClaimExtractionRunRequest(BaseModel):
 
 class ClaimExtractionRunResponse(BaseModel):
     claims_created: int
+    claims_updated: int
+    claims_deleted: int
+    claims_unchanged: int
     evidence_created: int
 
 
+class ClaimExtractionBatchRecordStatus(BaseModel):
+    line: int
+    article_id: str | None = None
+    status: str
+    claims_created: int = 0
+    claims_updated: int = 0
+    claims_deleted: int = 0
+    claims_unchanged: int = 0
+    evidence_created: int = 0
+    error: str | None = None
+
+
+class ClaimExtractionBatchResponse(BaseModel):
+    records: int
+    persisted: int
+    failed: int
+    claims_created: int
+    claims_updated: int
+    claims_deleted: int
+    claims_unchanged: int
+    evidence_created: int
+    results: list[ClaimExtractionBatchRecordStatus]
+
+
 class ClusterBuildRequest(BaseModel):
     lookback_hours: int = Field(default=72, ge=1, le=720)
     similarity_threshold: float = Field(default=0.35, ge=0.0, le=1.0)
@@ -70,3 +143,18 @@ class EventCard(BaseModel):
 
 class EventsLatestResponse(BaseModel):
     events: list[EventCard]
+
+
+class SearchHit(BaseModel):
+    kind: str
+    score: float
+    title: str
+    snippet: str
+    article_id: str | None = None
+    cluster_id: str | None = None
+    url: str | None = None
+
+
+class SearchResponse(BaseModel):
+    hits: list[SearchHit]
+    next_cursor: str | None = None
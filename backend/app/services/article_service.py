@@ -1,34 +1,75 @@
 from __future__ import annotations
 
+import uuid
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
 
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app import models
 from app.services.content_cleaner import ContentCleaner
+from app.services.dedupe_filter import DedupeFilter
+from app.services.near_duplicate import NearDuplicateIndex
+
+# Keeps bound parameters per statement well below SQLite's variable limit.
+_LOOKUP_CHUNK_SIZE = 400
+_INSERT_CHUNK_SIZE = 100
+
+
+@dataclass
+class RawArticle:
+    source_name: str
+    source_type: str
+    url: str
+    title: str
+    raw_text: str | None = None
+    published_at: datetime | None = None
 
 
 @dataclass
 class ArticleUpsertResult:
-    article_id: str
+    article_id: int
     deduped: bool
+    near_duplicate_of: int | None = None
 
 
 class ArticleService:
-    def __init__(self, cleaner: ContentCleaner | None = None) -> None:
+    def __init__(
+        self,
+        cleaner: ContentCleaner | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+        dedupe_filter: DedupeFilter | None = None,
+    ) -> None:
         self.cleaner = cleaner or ContentCleaner()
+        self.near_duplicates = near_duplicates or NearDuplicateIndex()
+        # Stays pass-through until load_or_build() has run, e.g. from the app lifespan.
+        self.dedupe_filter = dedupe_filter or DedupeFilter()
+        # Source name -> id, only ever filled with committed rows.
+        self._source_ids: dict[str, int] = {}
 
-    def get_or_create_source(self, db: Session, source_name: str, source_type: str) -> models.Source:
-        source = db.query(models.Source).filter(models.Source.name == source_name).first()
-        if source is not None:
-            return source
+    def warm_source_cache(self, db: Session) -> None:
+        self._source_ids.update(dict(db.query(models.Source.name, models.Source.id).all()))
 
-        source = models.Source(name=source_name, source_type=source_type)
-        db.add(source)
-        db.flush()
-        return source
+    def _resolve_source_ids(self, db: Session, wanted: dict[str, str]) -> tuple[dict[str, int], dict[str, int]]:
+        resolved = {name: self._source_ids[name] for name in wanted if name in self._source_ids}
+        missing = sorted(name for name in wanted if name not in resolved)
+        if not missing:
+            return resolved, {}
+
+        # Concurrent writers may race to create the same source; the unique index on
+        # sources.name makes the loser's insert a no-op and both read back the same row.
+        now = datetime.utcnow()
+        db.execute(
+            sqlite_insert(models.Source)
+            .values([{"name": name, "source_type": wanted[name], "created_at": now} for name in missing])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        created = dict(db.query(models.Source.name, models.Source.id).filter(models.Source.name.in_(missing)).all())
+        resolved.update(created)
+        return resolved, created
 
     def create_article_from_raw(
         self,
@@ -41,29 +82,159 @@ class ArticleService:
         raw_text: str | None,
         published_at: datetime | None = None,
     ) -> ArticleUpsertResult:
-        cleaned = self.cleaner.clean_for_keywords(raw_text or title)
-        dedupe_hash = cleaned.content_hash
-        existing = db.query(models.Article).filter(models.Article.content_hash == dedupe_hash).first()
-        if existing:
-            return ArticleUpsertResult(article_id=existing.id, deduped=True)
-
-        source = self.get_or_create_source(db, source_name=source_name, source_type=source_type)
-        article = models.Article(
-            source_id=source.id,
+        raw_article = RawArticle(
+            source_name=source_name,
+            source_type=source_type,
             url=url,
             title=title,
-            cleaned_text=cleaned.cleaned_text,
-            content_hash=dedupe_hash,
+            raw_text=raw_text,
             published_at=published_at,
         )
-        db.add(article)
-        try:
-            db.commit()
-            db.refresh(article)
-            return ArticleUpsertResult(article_id=article.id, deduped=False)
-        except IntegrityError:
-            db.rollback()
-            existing_by_url = db.query(models.Article).filter(models.Article.url == url).first()
-            if existing_by_url:
-                return ArticleUpsertResult(article_id=existing_by_url.id, deduped=True)
-            raise
+        return self.create_articles_bulk(db, [raw_article])[0]
+
+    def create_articles_bulk(self, db: Session, raw_articles: list[RawArticle]) -> list[ArticleUpsertResult]:
+        if not raw_articles:
+            return []
+
+        cleaned = self.cleaner.clean_many([item.raw_text or item.title for item in raw_articles])
+        lookup_hashes, lookup_urls = self.dedupe_filter.filter_lookups(
+            {content.content_hash for content in cleaned},
+            {item.url for item in raw_articles},
+        )
+        by_hash, by_url = self._load_existing(db, hashes=lookup_hashes, urls=lookup_urls)
+        if self.dedupe_filter.ready:
+            self.dedupe_filter.record_false_positives(
+                len(lookup_hashes - by_hash.keys()) + len(lookup_urls - by_url.keys())
+            )
+        signatures = [self.near_duplicates.signature(content.cleaned_text) for content in cleaned]
+        candidates = self.near_duplicates.load_candidates(db, signatures)
+
+        results: list[ArticleUpsertResult] = []
+        pending: list[dict] = []
+        # Rows get their rowid on insert; until then the batch refers to them by negative placeholders.
+        placeholders: list[int] = []
+        pending_signatures: dict[int, array] = {}
+        pending_sources: dict[str, str] = {}
+        pending_source_names: list[str] = []
+        for item, content, signature in zip(raw_articles, cleaned, signatures):
+            existing_id = by_hash.get(content.content_hash) or by_url.get(item.url)
+            if existing_id is not None:
+                results.append(ArticleUpsertResult(article_id=existing_id, deduped=True))
+                continue
+            match = self.near_duplicates.best_match(signature, candidates)
+            if match is not None:
+                results.append(
+                    ArticleUpsertResult(article_id=match.article_id, deduped=True, near_duplicate_of=match.article_id)
+                )
+                continue
+
+            pending_sources.setdefault(item.source_name, item.source_type)
+            pending_source_names.append(item.source_name)
+            article_id = -(len(pending) + 1)
+            placeholders.append(article_id)
+            pending.append(
+                {
+                    "public_id": str(uuid.uuid4()),
+                    "url": item.url,
+                    "title": item.title,
+                    "cleaned_text": content.cleaned_text,
+                    "content_hash": content.content_hash,
+                    "published_at": item.published_at,
+                    "created_at": datetime.utcnow(),
+                }
+            )
+            # Later duplicates inside the same batch resolve to this row.
+            by_hash[content.content_hash] = article_id
+            by_url[item.url] = article_id
+            if signature is not None:
+                pending_signatures[article_id] = signature
+                self.near_duplicates.remember(candidates, article_id, signature)
+            results.append(ArticleUpsertResult(article_id=article_id, deduped=False))
+
+        source_ids, created_sources = self._resolve_source_ids(db, pending_sources)
+        for row, source_name in zip(pending, pending_source_names):
+            row["source_id"] = source_ids[source_name]
+        inserted: dict[str, int] = {}
+        for chunk in _chunks(pending, _INSERT_CHUNK_SIZE):
+            statement = (
+                sqlite_insert(models.Article)
+                .values(chunk)
+                .on_conflict_do_nothing()
+                .returning(models.Article.public_id, models.Article.id)
+            )
+            inserted.update(db.execute(statement).tuples().all())
+        article_ids = {
+            placeholder: inserted[row["public_id"]]
+            for placeholder, row in zip(placeholders, pending)
+            if row["public_id"] in inserted
+        }
+        lost = {placeholder: row for placeholder, row in zip(placeholders, pending) if placeholder not in article_ids}
+        if lost:
+            article_ids.update(self._resolve_lost_inserts(db, lost))
+        results = [_with_article_id(result, article_ids, lost) for result in results]
+        self.near_duplicates.store(
+            db,
+            {
+                article_ids[placeholder]: signature
+                for placeholder, signature in pending_signatures.items()
+                if placeholder not in lost
+            },
+        )
+        db.commit()
+        self._source_ids.update(created_sources)
+        self.dedupe_filter.add(
+            (row["content_hash"] for row in pending),
+            (row["url"] for row in pending),
+            created_at=pending[-1]["created_at"] if pending else None,
+        )
+        return results
+
+    def _resolve_lost_inserts(self, db: Session, lost: dict[int, dict]) -> dict[int, int]:
+        # Another writer inserted a matching hash/url between our lookup and insert.
+        by_hash, by_url = self._load_existing(
+            db,
+            hashes={row["content_hash"] for row in lost.values()},
+            urls={row["url"] for row in lost.values()},
+        )
+        resolved: dict[int, int] = {}
+        for placeholder, row in lost.items():
+            existing_id = by_hash.get(row["content_hash"]) or by_url.get(row["url"])
+            if existing_id is None:
+                raise RuntimeError(f"Article insert for url={row['url']} was dropped without a conflicting row")
+            resolved[placeholder] = existing_id
+        return resolved
+
+    @staticmethod
+    def _load_existing(db: Session, *, hashes: set[str], urls: set[str]) -> tuple[dict[str, int], dict[str, int]]:
+        by_hash: dict[str, int] = {}
+        by_url: dict[str, int] = {}
+        hash_list, url_list = sorted(hashes), sorted(urls)
+        for offset in range(0, max(len(hash_list), len(url_list)), _LOOKUP_CHUNK_SIZE):
+            hash_chunk = hash_list[offset : offset + _LOOKUP_CHUNK_SIZE]
+            url_chunk = url_list[offset : offset + _LOOKUP_CHUNK_SIZE]
+            rows = (
+                db.query(models.Article.id, models.Article.content_hash, models.Article.url)
+                .filter(or_(models.Article.content_hash.in_(hash_chunk), models.Article.url.in_(url_chunk)))
+                .all()
+            )
+            for article_id, content_hash, url in rows:
+                if content_hash is not None:
+                    by_hash[content_hash] = article_id
+                by_url[url] = article_id
+        return by_hash, by_url
+
+
+def _with_article_id(result: ArticleUpsertResult, article_ids: dict[int, int], lost: dict[int, dict]) -> ArticleUpsertResult:
+    if result.article_id > 0:
+        return result
+    article_id = article_ids[result.article_id]
+    return ArticleUpsertResult(
+        article_id=article_id,
+        deduped=result.deduped or result.article_id in lost,
+        near_duplicate_of=article_id if result.near_duplicate_of is not None else None,
+    )
+
+
+def _chunks(values: list, size: int):
+    for offset in range(0, len(values), size):
+        yield values[offset : offset + size]
@@ -1,18 +1,45 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 
 from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
 
 from app import models
-from app.services.claim_extraction import ClaimExtractionResult, is_factual_claim_type
+from app.services.claim_extraction import ClaimExtractionResult, EvidenceItem, ExtractedClaim, is_factual_claim_type
 
 
 @dataclass
 class ClaimPersistResult:
-    claims_created: int
-    evidence_created: int
+    claims_created: int = 0
+    claims_updated: int = 0
+    claims_deleted: int = 0
+    claims_unchanged: int = 0
+    evidence_created: int = 0
+
+
+@dataclass
+class ClaimBatchItem:
+    line: int
+    article_id: str
+    extraction_result: ClaimExtractionResult
+    extraction_model: str | None = None
+    extraction_version: str | None = None
+
+
+@dataclass
+class ClaimBatchRecordResult:
+    line: int
+    article_id: str | None
+    status: str
+    claims_created: int = 0
+    claims_updated: int = 0
+    claims_deleted: int = 0
+    claims_unchanged: int = 0
+    evidence_created: int = 0
+    error: str | None = None
 
 
 class ClaimService:
@@ -25,29 +52,84 @@ class ClaimService:
         extraction_model: str | None = None,
         extraction_version: str | None = None,
     ) -> ClaimPersistResult:
-        existing_claims = db.query(models.Claim).filter(models.Claim.article_id == article.id).all()
-        existing_claim_ids = [claim.id for claim in existing_claims]
+        result = self._sync_claims(db, article, extraction_result, extraction_model, extraction_version)
+        db.commit()
+        return result
 
-        if existing_claim_ids:
-            db.query(models.SummaryCitation).filter(models.SummaryCitation.claim_id.in_(existing_claim_ids)).delete(
-                synchronize_session=False
-            )
-            db.query(models.ClaimRelation).filter(
-                or_(
-                    models.ClaimRelation.left_claim_id.in_(existing_claim_ids),
-                    models.ClaimRelation.right_claim_id.in_(existing_claim_ids),
+    def persist_extraction_batch(self, db: Session, items: list[ClaimBatchItem]) -> list[ClaimBatchRecordResult]:
+        # One article lookup and one commit for the whole chunk; each record gets its own
+        # savepoint so a failing record does not roll back the others.
+        _begin_transaction(db)
+        public_ids = {item.article_id for item in items}
+        articles = {
+            article.public_id: article
+            for article in db.query(models.Article).filter(models.Article.public_id.in_(public_ids))
+        }
+        results: list[ClaimBatchRecordResult] = []
+        for item in items:
+            article = articles.get(item.article_id)
+            if article is None:
+                results.append(ClaimBatchRecordResult(item.line, item.article_id, "failed", error="article_not_found"))
+                continue
+            if article.archived_at is not None:
+                results.append(ClaimBatchRecordResult(item.line, item.article_id, "failed", error="article_archived"))
+                continue
+            try:
+                with db.begin_nested():
+                    persisted = self._sync_claims(
+                        db, article, item.extraction_result, item.extraction_model, item.extraction_version
+                    )
+            except SQLAlchemyError:
+                results.append(ClaimBatchRecordResult(item.line, item.article_id, "failed", error="persist_failed"))
+                continue
+            results.append(
+                ClaimBatchRecordResult(
+                    item.line,
+                    item.article_id,
+                    "persisted",
+                    claims_created=persisted.claims_created,
+                    claims_updated=persisted.claims_updated,
+                    claims_deleted=persisted.claims_deleted,
+                    claims_unchanged=persisted.claims_unchanged,
+                    evidence_created=persisted.evidence_created,
                 )
-            ).delete(synchronize_session=False)
+            )
+        db.commit()
+        return results
 
+    def _sync_claims(
+        self,
+        db: Session,
+        article: models.Article,
+        extraction_result: ClaimExtractionResult,
+        extraction_model: str | None,
+        extraction_version: str | None,
+    ) -> ClaimPersistResult:
+        # Claims are matched to the stored ones by fingerprint (normalized text and type), so a
+        # re-extraction keeps ids, cluster assignments and citations of the claims it repeats.
+        existing_claims = (
+            db.query(models.Claim)
+            .options(selectinload(models.Claim.evidence_spans))
+            .filter(models.Claim.article_id == article.id)
+            .order_by(models.Claim.id)
+            .all()
+        )
+        unmatched: dict[tuple[str, str], list[models.Claim]] = {}
         for claim in existing_claims:
-            db.delete(claim)
-        db.flush()
+            unmatched.setdefault(_claim_fingerprint(claim.claim_text, claim.claim_type), []).append(claim)
 
-        created_claims = 0
-        created_evidence = 0
+        result = ClaimPersistResult()
         for extracted in extraction_result.claims:
             if not is_factual_claim_type(extracted.claim_type):
                 continue
+            matches = unmatched.get(_claim_fingerprint(extracted.claim_text, extracted.claim_type))
+            if matches:
+                claim = matches.pop(0)
+                if self._update_claim(db, claim, extracted, extraction_model, extraction_version, result):
+                    result.claims_updated += 1
+                else:
+                    result.claims_unchanged += 1
+                continue
             claim = models.Claim(
                 article_id=article.id,
                 claim_text=extracted.claim_text,
@@ -55,22 +137,94 @@ class ClaimService:
                 confidence=extracted.confidence,
                 extraction_model=extraction_model,
                 extraction_version=extraction_version,
+                evidence_spans=[_evidence_row(article.id, ev) for ev in extracted.evidence],
             )
             db.add(claim)
-            db.flush()
-            created_claims += 1
-
-            for ev in extracted.evidence:
-                evidence = models.ClaimEvidence(
-                    claim_id=claim.id,
-                    article_id=article.id,
-                    evidence_text=ev.evidence_text,
-                    start_char=ev.start_char,
-                    end_char=ev.end_char,
-                    evidence_type=ev.evidence_type,
+            result.claims_created += 1
+            result.evidence_created += len(extracted.evidence)
+
+        vanished = [claim for claims in unmatched.values() for claim in claims]
+        if vanished:
+            vanished_ids = [claim.id for claim in vanished]
+            db.query(models.SummaryCitation).filter(models.SummaryCitation.claim_id.in_(vanished_ids)).delete(
+                synchronize_session=False
+            )
+            db.query(models.ClaimRelation).filter(
+                or_(
+                    models.ClaimRelation.left_claim_id.in_(vanished_ids),
+                    models.ClaimRelation.right_claim_id.in_(vanished_ids),
                 )
-                db.add(evidence)
-                created_evidence += 1
+            ).delete(synchronize_session=False)
+            for claim in vanished:
+                db.delete(claim)
+            result.claims_deleted = len(vanished)
 
-        db.commit()
-        return ClaimPersistResult(claims_created=created_claims, evidence_created=created_evidence)
+        db.flush()
+        return result
+
+    @staticmethod
+    def _update_claim(
+        db: Session,
+        claim: models.Claim,
+        extracted: ExtractedClaim,
+        extraction_model: str | None,
+        extraction_version: str | None,
+        result: ClaimPersistResult,
+    ) -> bool:
+        changed = False
+        fields = {
+            "claim_text": extracted.claim_text,
+            "confidence": extracted.confidence,
+            "extraction_model": extraction_model,
+            "extraction_version": extraction_version,
+        }
+        for name, value in fields.items():
+            if getattr(claim, name) != value:
+                setattr(claim, name, value)
+                changed = True
+
+        current: dict[tuple, list[models.ClaimEvidence]] = {}
+        for span in claim.evidence_spans:
+            key = (span.evidence_text, span.start_char, span.end_char, span.evidence_type)
+            current.setdefault(key, []).append(span)
+        kept: list[models.ClaimEvidence] = []
+        for ev in extracted.evidence:
+            spans = current.get((ev.evidence_text, ev.start_char, ev.end_char, ev.evidence_type))
+            if spans:
+                kept.append(spans.pop(0))
+            else:
+                kept.append(_evidence_row(claim.article_id, ev))
+                result.evidence_created += 1
+                changed = True
+        removed_ids = [span.id for spans in current.values() for span in spans]
+        if removed_ids:
+            # Citations stay on the claim; only their pointer to a span that no longer exists is cleared.
+            db.query(models.SummaryCitation).filter(models.SummaryCitation.evidence_id.in_(removed_ids)).update(
+                {models.SummaryCitation.evidence_id: None}, synchronize_session=False
+            )
+            changed = True
+        if changed:
+            claim.evidence_spans = kept
+        return changed
+
+
+def _begin_transaction(db: Session) -> None:
+    # pysqlite only opens a transaction in front of DML, and SAVEPOINT is not DML. Without
+    # an explicit BEGIN the first savepoint starts the transaction and its RELEASE commits it.
+    connection = db.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _claim_fingerprint(claim_text: str, claim_type: str) -> tuple[str, str]:
+    return " ".join(re.findall(r"\w+", claim_text.casefold())), claim_type
+
+
+def _evidence_row(article_id: int, ev: EvidenceItem) -> models.ClaimEvidence:
+    return models.ClaimEvidence(
+        article_id=article_id,
+        evidence_text=ev.evidence_text,
+        start_char=ev.start_char,
+        end_char=ev.end_char,
+        evidence_type=ev.evidence_type,
+    )
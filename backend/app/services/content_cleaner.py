@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import html
+import logging
+import multiprocessing
+import os
 import re
+import threading
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
 
 STOPWORDS = {
     "a", "an", "the", "and", "or", "to", "of", "in", "on", "for", "with", "from", "by", "at",
@@ -19,6 +28,16 @@ BOILERPLATE_WORDS = {
     "share", "login", "sign", "policy", "terms",
 }
 
+_EXCLUDED_KEYWORDS = frozenset(STOPWORDS | BOILERPLATE_WORDS)
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_URL = re.compile(r"https?://\S+")
+# Maps every byte except ASCII letters and digits to a space and lowercases letters, so symbol
+# stripping and lowercasing happen in a single C-level bytes.translate pass.
+_ALNUM_LOWER = bytes(
+    ord(char.lower()) if char.isascii() and char.isalnum() else ord(" ") for char in map(chr, range(256))
+)
+
 
 @dataclass
 class CleanedContent:
@@ -28,8 +47,40 @@ class CleanedContent:
 
 
 class ContentCleaner:
-    def __init__(self, keyword_limit: int = 25) -> None:
+    def __init__(
+        self,
+        keyword_limit: int = 25,
+        max_workers: int | None = None,
+        parallel_threshold: int = 512,
+        chunk_size: int = 128,
+    ) -> None:
         self.keyword_limit = keyword_limit
+        self.max_workers = max_workers or int(os.getenv("CONTENT_CLEANER_WORKERS") or os.cpu_count() or 1)
+        # Below this many texts, process start-up and pickling cost more than cleaning serially.
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def clean_many(self, texts: list[str | None]) -> list[CleanedContent]:
+        if self.max_workers <= 1 or len(texts) < self.parallel_threshold:
+            return [self.clean_for_keywords(text) for text in texts]
+
+        chunks = [texts[offset : offset + self.chunk_size] for offset in range(0, len(texts), self.chunk_size)]
+        try:
+            # map() yields chunk results in submission order, so output order matches the input.
+            cleaned_chunks = self._pool().map(_clean_chunk, [self.keyword_limit] * len(chunks), chunks)
+            return [cleaned for chunk in cleaned_chunks for cleaned in chunk]
+        except (BrokenProcessPool, OSError):
+            logger.warning("Content cleaning pool unavailable; cleaning %d texts serially", len(texts), exc_info=True)
+            self.close()
+            return [self.clean_for_keywords(text) for text in texts]
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def clean_for_keywords(self, text: str | None) -> CleanedContent:
         if not text:
@@ -44,16 +95,26 @@ class ContentCleaner:
         )
 
     def _build_keyword_text(self, normalized: str) -> str:
-        tokens = self._tokenize(normalized)
-        filtered_tokens = [
-            token
-            for token in tokens
-            if token not in STOPWORDS and token not in BOILERPLATE_WORDS and len(token) > 2
-        ]
-        counts = Counter(filtered_tokens)
-        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
-        keywords = [token for token, _ in ranked[: self.keyword_limit]]
-        return " ".join(keywords)
+        # Count every token in C first, then filter the (far fewer) distinct tokens.
+        counts = Counter(normalized.split(" "))
+        candidates = (
+            (token, count) for token, count in counts.items() if len(token) > 2 and token not in _EXCLUDED_KEYWORDS
+        )
+        # Only the top keyword_limit entries are needed, so a heap replaces a full sort.
+        # Counts are negated so ties still break on the token in ascending order.
+        ranked = heapq.nsmallest(self.keyword_limit, candidates, key=lambda item: (-item[1], item[0]))
+        return " ".join(token for token, _ in ranked)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn rather than fork: the API process runs HTTP and job threads that a
+                # forked child would inherit mid-flight.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
 
     @staticmethod
     def hash_text(text: str) -> str:
@@ -61,15 +122,13 @@ class ContentCleaner:
 
     @staticmethod
     def _normalize(text: str) -> str:
-        unescaped = html.unescape(text)
-        no_html = re.sub(r"<[^>]+>", " ", unescaped)
-        no_urls = re.sub(r"https?://\S+", " ", no_html)
-        alnum = re.sub(r"[^a-zA-Z0-9\s]", " ", no_urls)
-        collapsed = re.sub(r"\s+", " ", alnum)
-        return collapsed.strip().lower()
+        no_urls = _URL.sub(" ", _HTML_TAG.sub(" ", html.unescape(text)))
+        # Every non-ASCII character is dropped as a non-alphanumeric anyway, so "?" stands in for
+        # it before translating; split()/join then collapses the space runs and trims the ends.
+        ascii_bytes = no_urls.encode("ascii", "replace").translate(_ALNUM_LOWER)
+        return b" ".join(ascii_bytes.split()).decode("ascii")
 
-    @staticmethod
-    def _tokenize(text: str) -> list[str]:
-        if not text:
-            return []
-        return text.split(" ")
+
+def _clean_chunk(keyword_limit: int, texts: list[str | None]) -> list[CleanedContent]:
+    cleaner = ContentCleaner(keyword_limit=keyword_limit, max_workers=1)
+    return [cleaner.clean_for_keywords(text) for text in texts]
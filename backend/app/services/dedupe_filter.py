@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import struct
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+_FILE_MAGIC = b"DDBF1"
+# num_bits, hash_count, items, capacity, error_rate, watermark (epoch seconds, 0 = none)
+_FILE_HEADER = struct.Struct("<QBQQdd")
+# Rows committed slightly out of created_at order by other writers are picked up on reload.
+_WATERMARK_SLACK = timedelta(minutes=10)
+_SCAN_BATCH_SIZE = 10_000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("error_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.items = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.items += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_error_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.items / self.num_bits)) ** self.hash_count
+
+    def to_bytes(self, watermark: datetime | None) -> bytes:
+        with self._lock:
+            header = _FILE_HEADER.pack(
+                self.num_bits,
+                self.hash_count,
+                self.items,
+                self.capacity,
+                self.error_rate,
+                watermark.timestamp() if watermark is not None else 0.0,
+            )
+            return _FILE_MAGIC + header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> tuple[BloomFilter, datetime | None]:
+        if not data.startswith(_FILE_MAGIC):
+            raise ValueError("not a dedupe filter file")
+        offset = len(_FILE_MAGIC)
+        num_bits, hash_count, items, capacity, error_rate, watermark = _FILE_HEADER.unpack_from(data, offset)
+        bloom = cls(capacity, error_rate)
+        body = data[offset + _FILE_HEADER.size :]
+        if (bloom.num_bits, bloom.hash_count) != (num_bits, hash_count) or len(body) != len(bloom._bits):
+            raise ValueError("dedupe filter file does not match its header")
+        bloom._bits[:] = body
+        bloom.items = items
+        return bloom, datetime.fromtimestamp(watermark) if watermark else None
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing: k positions from two independent 64-bit halves of one digest.
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.num_bits for index in range(self.hash_count)]
+
+
+class DedupeFilter:
+    def __init__(
+        self,
+        capacity: int | None = None,
+        error_rate: float | None = None,
+        path: str | None = None,
+    ) -> None:
+        self.capacity = capacity or int(os.getenv("DEDUPE_FILTER_CAPACITY") or 1_000_000)
+        self.error_rate = error_rate or float(os.getenv("DEDUPE_FILTER_ERROR_RATE") or 0.001)
+        self.path = Path(path or os.getenv("DEDUPE_FILTER_PATH") or "./dedupe_filter.bin")
+        self._bloom: BloomFilter | None = None
+        self._watermark: datetime | None = None
+        self._counters = {"checked": 0, "definite_misses": 0, "false_positives": 0}
+        self._counter_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def load_or_build(self, db: Session) -> None:
+        article_count = db.query(func.count(models.Article.id)).scalar() or 0
+        # Two keys (hash and url) per article, with room for the table to double.
+        capacity = max(self.capacity, 4 * article_count)
+        bloom, watermark = self._load(capacity)
+        if bloom is None:
+            bloom, watermark = BloomFilter(capacity, self.error_rate), None
+        since = watermark - _WATERMARK_SLACK if watermark is not None else None
+        # A definite miss has to be trustworthy, so the filter is only published once the scan is done.
+        self._watermark = self._scan(db, bloom, since) or watermark
+        self._bloom = bloom
+        self.save()
+
+    def save(self) -> None:
+        if self._bloom is None:
+            return
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_bytes(self._bloom.to_bytes(self._watermark))
+            os.replace(temporary, self.path)
+        except OSError as exc:
+            logger.warning("Could not persist dedupe filter to %s: %s", self.path, exc)
+
+    def filter_lookups(self, hashes: set[str], urls: set[str]) -> tuple[set[str], set[str]]:
+        if self._bloom is None:
+            return hashes, urls
+        maybe_hashes = {value for value in hashes if _hash_key(value) in self._bloom}
+        maybe_urls = {value for value in urls if _url_key(value) in self._bloom}
+        with self._counter_lock:
+            self._counters["checked"] += len(hashes) + len(urls)
+            self._counters["definite_misses"] += len(hashes) - len(maybe_hashes) + len(urls) - len(maybe_urls)
+        return maybe_hashes, maybe_urls
+
+    def record_false_positives(self, count: int) -> None:
+        if count:
+            with self._counter_lock:
+                self._counters["false_positives"] += count
+
+    def add(self, hashes: Iterable[str], urls: Iterable[str], created_at: datetime | None = None) -> None:
+        if self._bloom is None:
+            return
+        for value in hashes:
+            self._bloom.add(_hash_key(value))
+        for value in urls:
+            self._bloom.add(_url_key(value))
+        if created_at is not None and (self._watermark is None or created_at > self._watermark):
+            self._watermark = created_at
+
+    def stats(self) -> dict[str, Any]:
+        with self._counter_lock:
+            counters = dict(self._counters)
+        passed = counters["checked"] - counters["definite_misses"]
+        stats: dict[str, Any] = {
+            "ready": self._bloom is not None,
+            "configured_capacity": self.capacity,
+            "configured_error_rate": self.error_rate,
+            **counters,
+            "observed_false_positive_rate": round(counters["false_positives"] / passed, 6) if passed else 0.0,
+        }
+        if self._bloom is not None:
+            stats.update(
+                capacity=self._bloom.capacity,
+                items=self._bloom.items,
+                num_bits=self._bloom.num_bits,
+                hash_count=self._bloom.hash_count,
+                memory_bytes=self._bloom.memory_bytes,
+                estimated_false_positive_rate=round(self._bloom.estimated_error_rate(), 6),
+            )
+        return stats
+
+    def _load(self, capacity: int) -> tuple[BloomFilter | None, datetime | None]:
+        try:
+            bloom, watermark = BloomFilter.from_bytes(self.path.read_bytes())
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError, struct.error) as exc:
+            logger.warning("Rebuilding dedupe filter; could not load %s: %s", self.path, exc)
+            return None, None
+        if bloom.error_rate != self.error_rate or bloom.capacity < capacity or watermark is None:
+            # Resized or reconfigured filters are rebuilt rather than overfilled.
+            return None, None
+        return bloom, watermark
+
+    @staticmethod
+    def _scan(db: Session, bloom: BloomFilter, since: datetime | None) -> datetime | None:
+        query = db.query(models.Article.content_hash, models.Article.url, models.Article.created_at)
+        if since is not None:
+            query = query.filter(models.Article.created_at >= since)
+        watermark: datetime | None = None
+        for content_hash, url, created_at in query.yield_per(_SCAN_BATCH_SIZE):
+            if content_hash is not None:
+                bloom.add(_hash_key(content_hash))
+            bloom.add(_url_key(url))
+            if created_at is not None and (watermark is None or created_at > watermark):
+                watermark = created_at
+        return watermark
+
+
+def _hash_key(content_hash: str) -> str:
+    return f"h:{content_hash}"
+
+
+def _url_key(url: str) -> str:
+    return f"u:{url}"
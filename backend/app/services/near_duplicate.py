@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import os
+import random
+from array import array
+from dataclasses import dataclass
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.content_cleaner import BOILERPLATE_WORDS, STOPWORDS
+
+NUM_PERMUTATIONS = 64
+DEFAULT_THRESHOLD = 0.8
+
+_SIGNATURE_MASK = 0xFFFFFFFF
+# XOR with a random 64-bit mask permutes the (already uniform) shingle hashes. Unlike an
+# affine permutation it lets min(map(...)) run without a Python frame per element.
+_PERMUTATION_MASKS = [rng.getrandbits(64) for rng in [random.Random(20240601)] for _ in range(NUM_PERMUTATIONS)]
+_EXCLUDED_FEATURES = frozenset(STOPWORDS | BOILERPLATE_WORDS)
+# Long pages are reduced to the shingles with the smallest hashes. That sample is
+# consistent across documents, so it preserves Jaccard similarity while bounding cost.
+_MAX_SHINGLES = 512
+_LOOKUP_CHUNK_SIZE = 400
+
+Candidates = dict[tuple[int, int], list[tuple[int, array]]]
+
+
+@dataclass(frozen=True)
+class NearDuplicateMatch:
+    article_id: int
+    similarity: float
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float | None = None, min_shingles: int = 8) -> None:
+        if threshold is None:
+            threshold = float(os.getenv("NEAR_DUPLICATE_THRESHOLD") or DEFAULT_THRESHOLD)
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("near-duplicate threshold must be in (0, 1]")
+        self.threshold = threshold
+        # Short snippets share too few shingles for a similarity estimate to mean anything.
+        self.min_shingles = min_shingles
+        self.rows_per_band = _rows_per_band(threshold)
+        self.band_count = NUM_PERMUTATIONS // self.rows_per_band
+
+    def signature(self, cleaned_text: str) -> array | None:
+        tokens = [token for token in cleaned_text.split(" ") if len(token) > 2 and token not in _EXCLUDED_FEATURES]
+        shingles = {f"{first} {second}" for first, second in zip(tokens, tokens[1:])}
+        if len(shingles) < self.min_shingles:
+            return None
+        hashes = heapq.nsmallest(_MAX_SHINGLES, {_hash64(shingle) for shingle in shingles})
+        return array("I", (min(map(mask.__xor__, hashes)) & _SIGNATURE_MASK for mask in _PERMUTATION_MASKS))
+
+    def bands(self, signature: array) -> list[tuple[int, int]]:
+        rows = self.rows_per_band
+        return [
+            (band, _to_signed(_hash64(signature[band * rows : (band + 1) * rows].tobytes())))
+            for band in range(self.band_count)
+        ]
+
+    def load_candidates(self, db: Session, signatures: list[array | None]) -> Candidates:
+        wanted = {key for signature in signatures if signature is not None for key in self.bands(signature)}
+        values = sorted({value for _, value in wanted})
+        bucket_ids: dict[tuple[int, int], list[int]] = {}
+        for offset in range(0, len(values), _LOOKUP_CHUNK_SIZE):
+            rows = (
+                db.query(
+                    models.ArticleFingerprintBand.band,
+                    models.ArticleFingerprintBand.value,
+                    models.ArticleFingerprintBand.article_id,
+                )
+                .filter(models.ArticleFingerprintBand.value.in_(values[offset : offset + _LOOKUP_CHUNK_SIZE]))
+                .all()
+            )
+            for band, value, article_id in rows:
+                if (band, value) in wanted:
+                    bucket_ids.setdefault((band, value), []).append(article_id)
+
+        signatures_by_id: dict[int, array] = {}
+        article_ids = sorted({article_id for ids in bucket_ids.values() for article_id in ids})
+        for offset in range(0, len(article_ids), _LOOKUP_CHUNK_SIZE):
+            rows = (
+                db.query(models.ArticleFingerprint.article_id, models.ArticleFingerprint.signature)
+                .filter(models.ArticleFingerprint.article_id.in_(article_ids[offset : offset + _LOOKUP_CHUNK_SIZE]))
+                .all()
+            )
+            for article_id, stored in rows:
+                signatures_by_id[article_id] = array("I", stored)
+
+        return {
+            key: [(article_id, signatures_by_id[article_id]) for article_id in ids if article_id in signatures_by_id]
+            for key, ids in bucket_ids.items()
+        }
+
+    def best_match(self, signature: array | None, candidates: Candidates) -> NearDuplicateMatch | None:
+        if signature is None:
+            return None
+        best: NearDuplicateMatch | None = None
+        seen: set[int] = set()
+        for key in self.bands(signature):
+            for article_id, other in candidates.get(key, ()):
+                if article_id in seen:
+                    continue
+                seen.add(article_id)
+                similarity = sum(1 for left, right in zip(signature, other) if left == right) / NUM_PERMUTATIONS
+                if similarity < self.threshold:
+                    continue
+                if best is None or (-similarity, article_id) < (-best.similarity, best.article_id):
+                    best = NearDuplicateMatch(article_id=article_id, similarity=similarity)
+        return best
+
+    def remember(self, candidates: Candidates, article_id: int, signature: array) -> None:
+        for key in self.bands(signature):
+            candidates.setdefault(key, []).append((article_id, signature))
+
+    def store(self, db: Session, signatures: dict[int, array]) -> None:
+        if not signatures:
+            return
+        rows = [{"article_id": article_id, "signature": signature.tobytes()} for article_id, signature in signatures.items()]
+        band_rows = [
+            {"band": band, "value": value, "article_id": article_id}
+            for article_id, signature in signatures.items()
+            for band, value in self.bands(signature)
+        ]
+        for offset in range(0, len(rows), _LOOKUP_CHUNK_SIZE):
+            db.execute(sqlite_insert(models.ArticleFingerprint).values(rows[offset : offset + _LOOKUP_CHUNK_SIZE]))
+        for offset in range(0, len(band_rows), _LOOKUP_CHUNK_SIZE):
+            db.execute(
+                sqlite_insert(models.ArticleFingerprintBand)
+                .values(band_rows[offset : offset + _LOOKUP_CHUNK_SIZE])
+                .on_conflict_do_nothing()
+            )
+
+
+def _rows_per_band(threshold: float) -> int:
+    # Widest bands that still surface a pair sitting exactly at the threshold 95% of the time;
+    # wider bands mean fewer unrelated candidates to verify.
+    best = 1
+    for rows in (1, 2, 4, 8, 16):
+        if 1 - (1 - threshold**rows) ** (NUM_PERMUTATIONS // rows) >= 0.95:
+            best = rows
+    return best
+
+
+def _hash64(value: str | bytes) -> int:
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << 64) if value >= 1 << 63 else value
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Connection, Engine, create_engine, text
+
+from app.db import Base
+
+logger = logging.getLogger(__name__)
+
+# Tables copied into the archive database; the archive gets the same schema and keys.
+_ARCHIVE_TABLES = (
+    "sources",
+    "articles",
+    "event_clusters",
+    "claims",
+    "claim_evidence",
+    "claim_relations",
+    "summaries",
+    "summary_citations",
+)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    article_days: int = 30
+    cluster_stale_days: int = 7
+    summaries_per_cluster: int = 1
+    archive_path: str = "./archive.db"
+    # Articles moved per transaction, so writers never wait long on one run.
+    batch_size: int = 500
+    # Free pages released per run; 0 releases all of them.
+    vacuum_pages: int = 0
+
+    @classmethod
+    def from_env(cls) -> RetentionPolicy:
+        overrides: dict = {
+            field: int(value)
+            for field, variable in (
+                ("article_days", "RETENTION_ARTICLE_DAYS"),
+                ("cluster_stale_days", "RETENTION_CLUSTER_STALE_DAYS"),
+                ("summaries_per_cluster", "RETENTION_SUMMARIES_PER_CLUSTER"),
+                ("batch_size", "RETENTION_BATCH_SIZE"),
+                ("vacuum_pages", "RETENTION_VACUUM_PAGES"),
+            )
+            if (value := os.getenv(variable))
+        }
+        if archive_path := os.getenv("RETENTION_ARCHIVE_PATH"):
+            overrides["archive_path"] = archive_path
+        return replace(cls(), **overrides)
+
+
+@dataclass
+class RetentionResult:
+    clusters_archived: int = 0
+    summaries_pruned: int = 0
+    articles_archived: int = 0
+    claims_archived: int = 0
+    summaries_archived: int = 0
+    pages_freed: int = 0
+    database_bytes: int = 0
+
+
+class RetentionService:
+    def __init__(self, policy: RetentionPolicy | None = None) -> None:
+        self.policy = policy or RetentionPolicy.from_env()
+
+    def run(self, engine: Engine, now: datetime | None = None) -> RetentionResult:
+        now = now or datetime.utcnow()
+        policy = self.policy
+        result = RetentionResult()
+        self._ensure_archive_schema()
+
+        with engine.connect() as connection:
+            with connection.begin():
+                result.clusters_archived = self._archive_stale_clusters(
+                    connection, now - timedelta(days=policy.cluster_stale_days)
+                )
+                result.summaries_pruned = self._prune_superseded_summaries(connection)
+
+            # ATTACH is refused inside a transaction, so it wraps the batches rather than sitting in one.
+            connection.exec_driver_sql("ATTACH DATABASE ? AS archive", (str(Path(policy.archive_path)),))
+            connection.commit()
+            try:
+                cutoff = now - timedelta(days=policy.article_days)
+                while True:
+                    with connection.begin():
+                        articles, claims = self._archive_articles(connection, cutoff, now)
+                    result.articles_archived += articles
+                    result.claims_archived += claims
+                    if articles < policy.batch_size:
+                        break
+                with connection.begin():
+                    result.summaries_archived = self._archive_summaries(connection, cutoff)
+            finally:
+                connection.exec_driver_sql("DETACH DATABASE archive")
+                connection.commit()
+
+            result.pages_freed = self._vacuum(connection)
+            page_count = connection.exec_driver_sql("PRAGMA page_count").scalar() or 0
+            page_size = connection.exec_driver_sql("PRAGMA page_size").scalar() or 0
+            result.database_bytes = page_count * page_size
+            connection.commit()
+        logger.info("Retention run finished: %s", result)
+        return result
+
+    def _ensure_archive_schema(self) -> None:
+        archive = create_engine(f"sqlite:///{Path(self.policy.archive_path)}")
+        try:
+            Base.metadata.create_all(bind=archive, tables=[Base.metadata.tables[name] for name in _ARCHIVE_TABLES])
+        finally:
+            archive.dispose()
+
+    @staticmethod
+    def _archive_stale_clusters(connection: Connection, stale_before: datetime) -> int:
+        return connection.execute(
+            text(
+                "UPDATE event_clusters SET status = 'archived'"
+                " WHERE status = 'active' AND created_at < :stale_before"
+                " AND NOT EXISTS (SELECT 1 FROM claims"
+                " WHERE claims.event_cluster_id = event_clusters.id AND claims.created_at >= :stale_before)"
+            ),
+            {"stale_before": stale_before},
+        ).rowcount
+
+    def _prune_superseded_summaries(self, connection: Connection) -> int:
+        connection.execute(text("CREATE TEMP TABLE IF NOT EXISTS _retention_summaries (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("DELETE FROM _retention_summaries"))
+        connection.execute(
+            text(
+                "INSERT INTO _retention_summaries SELECT id FROM ("
+                " SELECT id, ROW_NUMBER() OVER ("
+                "  PARTITION BY event_cluster_id ORDER BY created_at DESC, id DESC) AS position"
+                " FROM summaries) WHERE position > :keep"
+            ),
+            {"keep": max(1, self.policy.summaries_per_cluster)},
+        )
+        connection.execute(text("DELETE FROM summary_citations WHERE summary_id IN (SELECT id FROM _retention_summaries)"))
+        return connection.execute(text("DELETE FROM summaries WHERE id IN (SELECT id FROM _retention_summaries)")).rowcount
+
+    def _archive_articles(self, connection: Connection, cutoff: datetime, now: datetime) -> tuple[int, int]:
+        # Article rows stay behind without their text so url/content-hash dedupe keeps working;
+        # claims, evidence, relations and citations follow their claim into the archive.
+        connection.execute(text("CREATE TEMP TABLE IF NOT EXISTS _retention_articles (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("CREATE TEMP TABLE IF NOT EXISTS _retention_claims (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("DELETE FROM _retention_articles"))
+        connection.execute(text("DELETE FROM _retention_claims"))
+        articles = connection.execute(
+            text(
+                "INSERT INTO _retention_articles SELECT id FROM articles"
+                " WHERE created_at < :cutoff AND archived_at IS NULL"
+                " AND NOT EXISTS (SELECT 1 FROM claims JOIN event_clusters ON event_clusters.id = claims.event_cluster_id"
+                " WHERE claims.article_id = articles.id AND event_clusters.status = 'active')"
+                " ORDER BY id LIMIT :batch_size"
+            ),
+            {"cutoff": cutoff, "batch_size": self.policy.batch_size},
+        ).rowcount
+        if not articles:
+            return 0, 0
+        claims = connection.execute(
+            text(
+                "INSERT INTO _retention_claims SELECT id FROM claims"
+                " WHERE article_id IN (SELECT id FROM _retention_articles)"
+            )
+        ).rowcount
+
+        # Inserts are idempotent, so a batch interrupted between the two databases is redone safely.
+        _copy(connection, "sources", "id IN (SELECT source_id FROM articles WHERE id IN (SELECT id FROM _retention_articles))")
+        _copy(connection, "articles", "id IN (SELECT id FROM _retention_articles)")
+        _copy(
+            connection,
+            "event_clusters",
+            "id IN (SELECT event_cluster_id FROM claims WHERE id IN (SELECT id FROM _retention_claims))",
+        )
+        _copy(connection, "claims", "id IN (SELECT id FROM _retention_claims)")
+        _copy(connection, "claim_evidence", "claim_id IN (SELECT id FROM _retention_claims)")
+        relations = (
+            "left_claim_id IN (SELECT id FROM _retention_claims) OR right_claim_id IN (SELECT id FROM _retention_claims)"
+        )
+        _copy(connection, "claim_relations", relations)
+        _copy(connection, "summary_citations", "claim_id IN (SELECT id FROM _retention_claims)")
+
+        connection.execute(text("DELETE FROM summary_citations WHERE claim_id IN (SELECT id FROM _retention_claims)"))
+        connection.execute(text(f"DELETE FROM claim_relations WHERE {relations}"))
+        connection.execute(text("DELETE FROM claim_evidence WHERE claim_id IN (SELECT id FROM _retention_claims)"))
+        connection.execute(text("DELETE FROM claims WHERE id IN (SELECT id FROM _retention_claims)"))
+        for table in ("article_fingerprint_bands", "article_fingerprints"):
+            connection.execute(text(f"DELETE FROM {table} WHERE article_id IN (SELECT id FROM _retention_articles)"))
+        connection.execute(
+            text(
+                "UPDATE articles SET cleaned_text = NULL, archived_at = :now"
+                " WHERE id IN (SELECT id FROM _retention_articles)"
+            ),
+            {"now": now},
+        )
+        return articles, claims
+
+    @staticmethod
+    def _archive_summaries(connection: Connection, cutoff: datetime) -> int:
+        connection.execute(text("DELETE FROM _retention_summaries"))
+        summaries = connection.execute(
+            text(
+                "INSERT INTO _retention_summaries SELECT summaries.id FROM summaries"
+                " JOIN event_clusters ON event_clusters.id = summaries.event_cluster_id"
+                " WHERE summaries.created_at < :cutoff AND event_clusters.status = 'archived'"
+            ),
+            {"cutoff": cutoff},
+        ).rowcount
+        if not summaries:
+            return 0
+        _copy(
+            connection,
+            "event_clusters",
+            "id IN (SELECT event_cluster_id FROM summaries WHERE id IN (SELECT id FROM _retention_summaries))",
+        )
+        _copy(connection, "summaries", "id IN (SELECT id FROM _retention_summaries)")
+        _copy(connection, "summary_citations", "summary_id IN (SELECT id FROM _retention_summaries)")
+        connection.execute(text("DELETE FROM summary_citations WHERE summary_id IN (SELECT id FROM _retention_summaries)"))
+        connection.execute(text("DELETE FROM summaries WHERE id IN (SELECT id FROM _retention_summaries)"))
+        return summaries
+
+    def _vacuum(self, connection: Connection) -> int:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            # Databases created before auto_vacuum=INCREMENTAL need one full VACUUM to switch.
+            logger.info("Switching database to auto_vacuum=INCREMENTAL with a full VACUUM")
+            connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.exec_driver_sql("VACUUM")
+            return 0
+        free_before = connection.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+        pages = self.policy.vacuum_pages
+        # Each step of the statement frees one page. execute() stops after the first step for
+        # statements without result columns; executescript() runs them to completion.
+        cursor = connection.connection.cursor()
+        try:
+            cursor.executescript(f"PRAGMA incremental_vacuum({int(pages)})" if pages else "PRAGMA incremental_vacuum")
+        finally:
+            cursor.close()
+        free_after = connection.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+        if connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal":
+            # Otherwise the freed pages live on in the WAL file until the next checkpoint.
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        return free_before - free_after
+
+
+def _copy(connection: Connection, table: str, where: str) -> None:
+    columns = ", ".join(column.name for column in Base.metadata.tables[table].columns)
+    connection.execute(
+        text(f"INSERT OR IGNORE INTO archive.{table} ({columns}) SELECT {columns} FROM main.{table} WHERE {where}")
+    )
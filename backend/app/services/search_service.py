@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, bindparam, text
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    kind: str
+    table: str
+    columns: tuple[str, ...]
+    # bm25 column weights, in column order.
+    weights: tuple[float, ...]
+
+    @property
+    def name(self) -> str:
+        return f"{self.table}_fts"
+
+
+# External-content FTS5 tables: the text lives only in the source table and the index is
+# keyed by its integer rowid. Triggers keep it in sync on insert, update and delete.
+SEARCH_INDEXES = (
+    SearchIndex("article", "articles", ("title", "cleaned_text"), (4.0, 1.0)),
+    SearchIndex("claim", "claims", ("claim_text",), (1.0,)),
+    SearchIndex("cluster", "event_clusters", ("canonical_title",), (1.0,)),
+)
+SEARCH_KINDS = tuple(index.kind for index in SEARCH_INDEXES)
+MAX_SEARCH_LIMIT = 100
+
+_TERM = re.compile(r"\w+\*?")
+_SNIPPET_TOKENS = 12
+
+
+class SearchQueryError(ValueError):
+    pass
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    score: float
+    title: str
+    snippet: str
+    article_id: str | None = None
+    cluster_id: str | None = None
+    url: str | None = None
+
+
+@dataclass
+class SearchPage:
+    hits: list[SearchHit]
+    next_cursor: str | None
+
+
+def create_search_indexes(connection: Connection) -> None:
+    for index in SEARCH_INDEXES:
+        columns = ", ".join(index.columns)
+        old_values = ", ".join(f"old.{column}" for column in index.columns)
+        new_values = ", ".join(f"new.{column}" for column in index.columns)
+        delete = (
+            f"INSERT INTO {index.name} ({index.name}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+        )
+        insert = f"INSERT INTO {index.name} (rowid, {columns}) VALUES (new.id, {new_values});"
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.name} USING fts5("
+                f"{columns}, content='{index.table}', content_rowid='id',"
+                " tokenize='porter unicode61 remove_diacritics 2')"
+            )
+        )
+        connection.execute(
+            text(f"CREATE TRIGGER IF NOT EXISTS {index.name}_ai AFTER INSERT ON {index.table} BEGIN {insert} END")
+        )
+        connection.execute(
+            text(f"CREATE TRIGGER IF NOT EXISTS {index.name}_ad AFTER DELETE ON {index.table} BEGIN {delete} END")
+        )
+        connection.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {index.name}_au AFTER UPDATE OF {columns} ON {index.table}"
+                f" BEGIN {delete} {insert} END"
+            )
+        )
+        weights = ", ".join(str(weight) for weight in index.weights)
+        connection.execute(text(f"INSERT INTO {index.name} ({index.name}, rank) VALUES ('rank', 'bm25({weights})')"))
+        connection.execute(text(f"INSERT INTO {index.name} ({index.name}) VALUES ('rebuild')"))
+
+
+class SearchService:
+    def __init__(self, rank_window: int | None = None) -> None:
+        # bm25 has to score every match before it can sort, so matches are ranked in tiers of
+        # rank_window rows per index, newest tier first. A rare term fits in one tier and is
+        # ranked as a whole; a common one pages through every tier, so no match is left out.
+        self.rank_window = rank_window or int(os.getenv("SEARCH_RANK_WINDOW") or 2000)
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        kinds: list[str] | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> SearchPage:
+        match = _match_expression(query)
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        if kinds is not None and (not kinds or set(kinds) - set(SEARCH_KINDS)):
+            raise SearchQueryError("unknown_search_kind")
+        if cursor:
+            # Tier bounds are fixed when a tier is entered and carried in the cursor, so rows
+            # written while paging cannot shift them.
+            tier, after, bounds = _decode_cursor(cursor)
+        else:
+            tier, after = 0, None
+            bounds = [
+                self._tier_bounds(db, match, index, None) if kinds is None or index.kind in kinds else None
+                for index in SEARCH_INDEXES
+            ]
+
+        rows: list[tuple[int, list, Any]] = []
+        while True:
+            rows.extend((tier, bounds, row) for row in self._rank_tier(db, match, bounds, after, limit + 1 - len(rows)))
+            if len(rows) > limit:
+                break
+            # This tier is used up; the next one covers the next rank_window older matches.
+            bounds = [
+                self._tier_bounds(db, match, SEARCH_INDEXES[position], bound[1]) if bound and bound[1] else None
+                for position, bound in enumerate(bounds)
+            ]
+            if not any(bounds):
+                break
+            tier, after = tier + 1, None
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_tier, last_bounds, last = rows[-1]
+            next_cursor = _encode_cursor(last_tier, (last.rank, last.kind, last.id), last_bounds)
+        page = [row for _, _, row in rows]
+        snippets = self._snippets(db, match, page)
+        return SearchPage(hits=self._hydrate(db, page, snippets), next_cursor=next_cursor)
+
+    def _tier_bounds(self, db: Session, match: str, index: SearchIndex, ceiling: int | None) -> list:
+        # Walking the doclist in rowid order is cheap; only ranking it is not. The tier holds
+        # the rank_window newest matches at or below the ceiling: (floor, ceiling].
+        clause = " AND rowid <= :ceiling" if ceiling is not None else ""
+        floor = db.execute(
+            text(
+                f"SELECT rowid FROM {index.name} WHERE {index.name} MATCH :match{clause}"
+                " ORDER BY rowid DESC LIMIT 1 OFFSET :window"
+            ),
+            {"match": match, "ceiling": ceiling, "window": self.rank_window},
+        ).scalar()
+        return [ceiling, floor or 0]
+
+    @staticmethod
+    def _rank_tier(db: Session, match: str, bounds: list, after: tuple | None, fetch: int) -> list:
+        # Each index returns its own best rows within the tier; the merged order is
+        # (rank, kind, rowid), which is also the keyset the cursor resumes from.
+        params: dict = {"match": match, "fetch": fetch}
+        selects = []
+        for position, index in enumerate(SEARCH_INDEXES):
+            if bounds[position] is None:
+                continue
+            ceiling, floor = bounds[position]
+            clauses = ""
+            if ceiling is not None:
+                clauses += f" AND rowid <= {int(ceiling)}"
+            if floor:
+                clauses += f" AND rowid > {int(floor)}"
+            if after is not None:
+                clauses += (
+                    f" AND (rank > :after_rank OR (rank = :after_rank AND ({position} > :after_kind"
+                    f" OR ({position} = :after_kind AND rowid > :after_id))))"
+                )
+            selects.append(
+                f"SELECT * FROM (SELECT {position} AS kind, rowid AS id, rank"
+                f" FROM {index.name} WHERE {index.name} MATCH :match{clauses} ORDER BY rank, rowid LIMIT :fetch)"
+            )
+        if not selects:
+            return []
+        if after is not None:
+            params.update(after_rank=after[0], after_kind=after[1], after_id=after[2])
+        statement = text(f"{' UNION ALL '.join(selects)} ORDER BY rank, kind, id LIMIT :fetch")
+        return db.execute(statement, params).all()
+
+    @staticmethod
+    def _snippets(db: Session, match: str, rows: list) -> dict[tuple[int, int], str]:
+        # Snippets are built only for the rows on the page, not for every row that was ranked.
+        snippets: dict[tuple[int, int], str] = {}
+        for position, index in enumerate(SEARCH_INDEXES):
+            ids = [row.id for row in rows if row.kind == position]
+            if not ids:
+                continue
+            statement = text(
+                f"SELECT rowid, snippet({index.name}, -1, '<mark>', '</mark>', '…', {_SNIPPET_TOKENS})"
+                f" FROM {index.name} WHERE {index.name} MATCH :match AND rowid IN :ids"
+            ).bindparams(bindparam("ids", expanding=True))
+            for row_id, snippet in db.execute(statement, {"match": match, "ids": ids}):
+                snippets[(position, row_id)] = snippet
+        return snippets
+
+    @staticmethod
+    def _hydrate(db: Session, rows: list, snippets: dict[tuple[int, int], str]) -> list[SearchHit]:
+        ids_by_kind: dict[str, list[int]] = {}
+        for row in rows:
+            ids_by_kind.setdefault(SEARCH_INDEXES[row.kind].kind, []).append(row.id)
+
+        articles = {
+            article_id: (public_id, title, url)
+            for article_id, public_id, title, url in db.query(
+                models.Article.id, models.Article.public_id, models.Article.title, models.Article.url
+            ).filter(models.Article.id.in_(ids_by_kind.get("article", [])))
+        }
+        claims = {
+            claim_id: (article_public_id, title, url, cluster_public_id)
+            for claim_id, article_public_id, title, url, cluster_public_id in db.query(
+                models.Claim.id,
+                models.Article.public_id,
+                models.Article.title,
+                models.Article.url,
+                models.EventCluster.public_id,
+            )
+            .join(models.Article, models.Article.id == models.Claim.article_id)
+            .outerjoin(models.EventCluster, models.EventCluster.id == models.Claim.event_cluster_id)
+            .filter(models.Claim.id.in_(ids_by_kind.get("claim", [])))
+        }
+        clusters = {
+            cluster_id: (public_id, title)
+            for cluster_id, public_id, title in db.query(
+                models.EventCluster.id, models.EventCluster.public_id, models.EventCluster.canonical_title
+            ).filter(models.EventCluster.id.in_(ids_by_kind.get("cluster", [])))
+        }
+
+        hits: list[SearchHit] = []
+        for row in rows:
+            kind = SEARCH_INDEXES[row.kind].kind
+            hit = SearchHit(kind=kind, score=round(-row.rank, 6), title="", snippet=snippets.get((row.kind, row.id), ""))
+            if kind == "article" and row.id in articles:
+                hit.article_id, hit.title, hit.url = articles[row.id]
+            elif kind == "claim" and row.id in claims:
+                hit.article_id, hit.title, hit.url, hit.cluster_id = claims[row.id]
+            elif kind == "cluster" and row.id in clusters:
+                hit.cluster_id, hit.title = clusters[row.id]
+            else:
+                continue
+            hits.append(hit)
+        return hits
+
+
+def _match_expression(query: str) -> str:
+    # Free text is reduced to quoted terms (implicitly ANDed), so FTS5 operators and stray
+    # quotes in user input can never produce a syntax error; a trailing * keeps prefix search.
+    terms = [
+        f'"{term[:-1]}"*' if term.endswith("*") else f'"{term}"'
+        for term in _TERM.findall(query)
+        if term.rstrip("*")
+    ]
+    if not terms:
+        raise SearchQueryError("empty_search_query")
+    return " ".join(terms)
+
+
+def _encode_cursor(tier: int, after: tuple[float, int, int], bounds: list) -> str:
+    payload = [tier, list(after), bounds]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, tuple[float, int, int], list]:
+    try:
+        tier, (rank, kind, row_id), raw_bounds = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if len(raw_bounds) != len(SEARCH_INDEXES):
+            raise ValueError("cursor does not match the search indexes")
+        bounds = [
+            None if bound is None else [None if bound[0] is None else int(bound[0]), int(bound[1])]
+            for bound in raw_bounds
+        ]
+        return int(tier), (float(rank), int(kind), int(row_id)), bounds
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise SearchQueryError("invalid_search_cursor") from exc
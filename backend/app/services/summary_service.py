@@ -90,9 +90,9 @@ class SummaryService:
     def __init__(self) -> None:
         self.cluster_helper = ClusterService()
 
-    def build_summaries(self, db: Session, cluster_ids: list[str] | None = None) -> SummaryBuildResult:
+    def build_summaries(self, db: Session, cluster_ids: list[int] | None = None) -> SummaryBuildResult:
         query = db.query(models.EventCluster).filter(models.EventCluster.status == "active")
-        if cluster_ids:
+        if cluster_ids is not None:
             query = query.filter(models.EventCluster.id.in_(cluster_ids))
         clusters = query.all()
 
@@ -132,9 +132,9 @@ class SummaryService:
             .filter(models.Claim.event_cluster_id.in_(cluster_ids))
             .all()
         )
-        claims_by_cluster: dict[str, list[tuple[models.Claim, str]]] = {}
+        claims_by_cluster: dict[int, list[tuple[models.Claim, str]]] = {}
         for claim, article_url in claim_rows:
-            claims_by_cluster.setdefault(claim.event_cluster_id or "", []).append((claim, article_url))
+            claims_by_cluster.setdefault(claim.event_cluster_id, []).append((claim, article_url))
 
         events: list[dict] = []
         for summary in summaries:
@@ -149,7 +149,7 @@ class SummaryService:
 
             events.append(
                 {
-                    "cluster_id": summary.event_cluster_id,
+                    "cluster_id": cluster.public_id if cluster else "",
                     "cluster_title": cluster.canonical_title if cluster else "Untitled cluster",
                     "agreed_facts": json.loads(summary.agreed_facts_json),
                     "disputed_claims": json.loads(summary.disputed_claims_json),
@@ -276,7 +276,7 @@ class SummaryService:
         right_years = set(cls._YEAR_PATTERN.findall(right_lower))
         return bool(left_years and right_years and left_years != right_years)
 
-    def _build_cluster_summary(self, db: Session, cluster_id: str, claims: list[models.Claim]) -> models.Summary:
+    def _build_cluster_summary(self, db: Session, cluster_id: int, claims: list[models.Claim]) -> models.Summary:
         factual_claims = [claim for claim in claims if is_factual_claim_type(claim.claim_type)]
         if not factual_claims:
             raise ValueError(f"Cluster {cluster_id} has no factual claims available for summary generation")
@@ -385,7 +385,7 @@ class SummaryService:
     def _persist_citations(
         self,
         db: Session,
-        summary_id: str,
+        summary_id: int,
         summary: models.Summary,
         claims: list[models.Claim],
     ) -> int:
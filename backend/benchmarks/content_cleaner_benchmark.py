@@ -0,0 +1,83 @@
+"""Compare the multi-pass and fused ContentCleaner normalizers on a large synthetic page.
+
+Usage (from backend/):
+    python -m benchmarks.content_cleaner_benchmark --megabytes 4 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import random
+import re
+import time
+from collections import Counter
+
+from app.services.content_cleaner import BOILERPLATE_WORDS, STOPWORDS, ContentCleaner
+
+_WORDS = (
+    "openai anthropic model release benchmark latency throughput cluster claim evidence source "
+    "quantum telescope exoplanet chip foundry regulation election market inflation"
+).split()
+
+
+def _legacy_clean(text: str, keyword_limit: int) -> tuple[str, str]:
+    unescaped = html.unescape(text)
+    no_html = re.sub(r"<[^>]+>", " ", unescaped)
+    no_urls = re.sub(r"https?://\S+", " ", no_html)
+    alnum = re.sub(r"[^a-zA-Z0-9\s]", " ", no_urls)
+    normalized = re.sub(r"\s+", " ", alnum).strip().lower()
+    tokens = normalized.split(" ") if normalized else []
+    filtered = [token for token in tokens if token not in STOPWORDS and token not in BOILERPLATE_WORDS and len(token) > 2]
+    ranked = sorted(Counter(filtered).items(), key=lambda item: (-item[1], item[0]))
+    return normalized, " ".join(token for token, _ in ranked[:keyword_limit])
+
+
+def _synthetic_page(megabytes: float, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts: list[str] = ["<html><head><style>body { color: red; }</style></head><body>"]
+    size = 0
+    target = int(megabytes * 1_000_000)
+    while size < target:
+        sentence = " ".join(rng.choice(_WORDS) + str(rng.randint(0, 500)) for _ in range(12))
+        chunk = (
+            f"<p class='story'>{sentence.capitalize()} &amp; more: "
+            f"https://example.com/{rng.randint(0, 10**6)}?ref=feed.</p>\n"
+        )
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = _synthetic_page(args.megabytes)
+    cleaner = ContentCleaner()
+    fused = cleaner.clean_for_keywords(page)
+    assert (fused.cleaned_text, fused.keyword_text) == _legacy_clean(page, cleaner.keyword_limit), "outputs differ"
+
+    legacy_s = _best_of(args.repeat, lambda: _legacy_clean(page, cleaner.keyword_limit))
+    fused_s = _best_of(args.repeat, lambda: cleaner.clean_for_keywords(page))
+    megabytes = len(page.encode("utf-8")) / 1_000_000
+
+    print(f"page={megabytes:.1f}MB repeat={args.repeat} (best of)")
+    print(f"multi-pass  {legacy_s:8.3f}s  {megabytes / legacy_s:7.1f} MB/s")
+    print(f"fused       {fused_s:8.3f}s  {megabytes / fused_s:7.1f} MB/s")
+    print(f"speedup     {legacy_s / fused_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
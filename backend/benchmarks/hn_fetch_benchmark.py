@@ -0,0 +1,91 @@
+"""Compare sequential vs concurrent Hacker News item fetching against a local stub server.
+
+Usage (from backend/):
+    python -m benchmarks.hn_fetch_benchmark --items 100 --latency-ms 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.ingestion.http import HttpClientConfig, PooledHttpClient
+from app.ingestion.service import HackerNewsAdapter
+
+
+def _make_handler(item_count: int, latency: float) -> type[BaseHTTPRequestHandler]:
+    class StubHackerNewsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            time.sleep(latency)
+            if self.path.endswith("/topstories.json"):
+                body = list(range(1, item_count + 1))
+            else:
+                item_id = int(self.path.rsplit("/", 1)[-1].removesuffix(".json"))
+                body = {
+                    "id": item_id,
+                    "type": "story",
+                    "title": f"Stub story {item_id}",
+                    "url": f"https://example.com/stub/{item_id}",
+                    "time": 1_700_000_000 + item_id,
+                }
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002 - silence request logging
+            return
+
+    return StubHackerNewsHandler
+
+
+def _time_fetch(base_url: str, concurrency: int, limit: int) -> tuple[float, list[str]]:
+    config = HttpClientConfig(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+        max_connections_per_host=concurrency,
+    )
+    http = PooledHttpClient(config)
+    try:
+        adapter = HackerNewsAdapter(http, max_concurrency=concurrency, base_url=base_url)
+        started = time.perf_counter()
+        items = adapter.fetch_items(limit)
+        return time.perf_counter() - started, [item.url for item in items]
+    finally:
+        http.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(args.items, args.latency_ms / 1000))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v0"
+
+    try:
+        sequential_s, sequential_urls = _time_fetch(base_url, 1, args.items)
+        concurrent_s, concurrent_urls = _time_fetch(base_url, args.concurrency, args.items)
+    finally:
+        server.shutdown()
+
+    assert sequential_urls == concurrent_urls, "concurrent fetch must preserve topstories order"
+    print(f"items={args.items} latency_ms={args.latency_ms:.0f} concurrency={args.concurrency}")
+    print(f"sequential  {sequential_s:8.3f}s")
+    print(f"concurrent  {concurrent_s:8.3f}s")
+    print(f"speedup     {sequential_s / concurrent_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Benchmark IngestionRunner end to end against recorded HTTP fixtures, fully offline.
+
+Usage (from backend/):
+    python -m benchmarks.ingestion_benchmark --items 300 --latency-ms 20
+    python -m benchmarks.ingestion_benchmark --fixtures path/to/recording --latency-ms 20
+
+Without --fixtures a synthetic Hacker News + GitHub recording is generated first. Real
+fixtures are captured by running ingestion with INGEST_HTTP_RECORD_DIR set.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import Base
+from app.ingestion.http import HttpClientConfig, PooledHttpClient
+from app.ingestion.ratelimit import RateLimitPolicy, SourceRateLimiter
+from app.ingestion.replay import RecordingTransport
+from app.ingestion.service import GitHubTrendingStarsAdapter, HackerNewsAdapter, IngestionRunner
+from app.services.article_service import ArticleService, ArticleUpsertResult, RawArticle
+
+# Replayed runs measure our own overhead, not the upstream quotas.
+_UNTHROTTLED = RateLimitPolicy(requests_per_second=1_000_000.0, burst=1_000_000)
+
+
+class _TimedArticleService(ArticleService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_seconds = 0.0
+
+    def create_articles_bulk(self, db: Session, raw_articles: list[RawArticle]) -> list[ArticleUpsertResult]:
+        started = time.perf_counter()
+        try:
+            return self._write(db, raw_articles)
+        finally:
+            self.write_seconds += time.perf_counter() - started
+
+    def _write(self, db: Session, raw_articles: list[RawArticle]) -> list[ArticleUpsertResult]:
+        return super().create_articles_bulk(db, raw_articles)
+
+
+class _PerItemArticleService(_TimedArticleService):
+    # One lookup/insert/commit per article, i.e. the pre-bulk write path.
+    def _write(self, db: Session, raw_articles: list[RawArticle]) -> list[ArticleUpsertResult]:
+        return [ArticleService.create_articles_bulk(self, db, [raw_article])[0] for raw_article in raw_articles]
+
+
+def _synthetic_upstream(item_count: int) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/topstories.json"):
+            return httpx.Response(200, json=list(range(1, item_count + 1)))
+        if path.startswith("/v0/item/"):
+            item_id = int(path.rsplit("/", 1)[-1].removesuffix(".json"))
+            return httpx.Response(
+                200,
+                json={
+                    "id": item_id,
+                    "type": "story",
+                    "title": f"Synthetic story {item_id}",
+                    "url": f"https://example.com/bench/{item_id}",
+                    "text": f"Benchmark story body story{item_id} about widgets{item_id % 17} and gadgets",
+                    "time": 1_700_000_000 + item_id,
+                },
+            )
+        page, per_page = int(request.url.params["page"]), int(request.url.params["per_page"])
+        repos = [
+            {
+                "id": idx,
+                "full_name": f"bench/repo-{idx}",
+                "html_url": f"https://github.com/bench/repo-{idx}",
+                "description": f"Benchmark repository repo{idx} for tooling",
+                "created_at": f"{date.today().isoformat()}T00:00:00Z",
+            }
+            for idx in range((page - 1) * per_page, min(page * per_page, item_count))
+        ]
+        return httpx.Response(200, json={"total_count": item_count, "items": repos})
+
+    return httpx.MockTransport(handler)
+
+
+def _record_synthetic(directory: Path, item_count: int) -> None:
+    recorder = PooledHttpClient(
+        HttpClientConfig(),
+        transport=RecordingTransport(_synthetic_upstream(item_count), directory),
+    )
+    try:
+        HackerNewsAdapter(recorder, rate_limiter=SourceRateLimiter(_UNTHROTTLED)).fetch_items(item_count)
+        GitHubTrendingStarsAdapter(recorder, rate_limiter=SourceRateLimiter(_UNTHROTTLED)).fetch_items(item_count)
+    finally:
+        recorder.close()
+
+
+def _run_path(label: str, article_service: _TimedArticleService, fixtures: Path, latency_ms: float, limit: int) -> dict:
+    with tempfile.TemporaryDirectory() as db_dir:
+        engine = create_engine(f"sqlite:///{db_dir}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        statements = 0
+
+        def count_statement(*_args) -> None:
+            nonlocal statements
+            statements += 1
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        http = PooledHttpClient(HttpClientConfig(replay_dir=str(fixtures), replay_latency_ms=latency_ms))
+        runner = IngestionRunner(
+            article_service=article_service,
+            adapters={
+                "hacker_news": HackerNewsAdapter(http, rate_limiter=SourceRateLimiter(_UNTHROTTLED)),
+                "github_trending_stars": GitHubTrendingStarsAdapter(http, rate_limiter=SourceRateLimiter(_UNTHROTTLED)),
+            },
+            http=http,
+        )
+        db = sessionmaker(bind=engine)()
+        try:
+            started = time.perf_counter()
+            result = runner.run(db, limit_per_source=limit, incremental=False)
+            elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+            runner.close()
+            engine.dispose()
+
+    fetched = sum(source.get("fetched", 0) for source in result["sources"].values())
+    return {
+        "path": label,
+        "items": fetched,
+        "seconds": elapsed,
+        "items_per_second": fetched / elapsed if elapsed else 0.0,
+        "requests": http.stats()["requests"],
+        "db_seconds": article_service.write_seconds,
+        "statements": statements,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        fixtures = args.fixtures
+        if fixtures is None:
+            fixtures = Path(scratch) / "fixtures"
+            _record_synthetic(fixtures, args.items)
+        rows = [
+            _run_path("per_item", _PerItemArticleService(), fixtures, args.latency_ms, args.items),
+            _run_path("bulk", _TimedArticleService(), fixtures, args.latency_ms, args.items),
+        ]
+
+    print(f"fixtures={args.fixtures or 'synthetic'} latency_ms={args.latency_ms:.0f} limit_per_source={args.items}")
+    print(f"{'path':<10}{'items':>7}{'seconds':>10}{'items/s':>10}{'requests':>10}{'db_s':>9}{'stmts':>8}")
+    for row in rows:
+        print(
+            f"{row['path']:<10}{row['items']:>7}{row['seconds']:>10.3f}{row['items_per_second']:>10.1f}"
+            f"{row['requests']:>10}{row['db_seconds']:>9.3f}{row['statements']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
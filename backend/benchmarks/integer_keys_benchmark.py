@@ -0,0 +1,193 @@
+"""Compare database size and join speed with uuid4 string keys versus integer rowid keys.
+
+Usage (from backend/):
+    python -m benchmarks.integer_keys_benchmark --articles 20000 --claims-per-article 5
+
+A database is seeded in the pre-migration uuid layout, copied, and the copy is upgraded
+with run_migrations. Both are vacuumed before measuring file size and timing the joins
+behind /events/latest and summary building.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from app.migrations import run_migrations, uuid_key_metadata
+
+_QUERIES = {
+    # SummaryService.get_latest_events: claims and article urls for the latest clusters.
+    "latest_events_join": (
+        "SELECT claims.id, articles.url FROM claims JOIN articles ON articles.id = claims.article_id"
+        " WHERE claims.event_cluster_id IN (SELECT event_cluster_id FROM summaries ORDER BY created_at DESC LIMIT 20)"
+    ),
+    # SummaryService source lookups for one cluster's claims.
+    "claim_sources_in_list": (
+        "SELECT claims.id, articles.source_id, articles.url FROM claims JOIN articles ON articles.id = claims.article_id"
+        " WHERE claims.id IN (SELECT id FROM claims WHERE event_cluster_id = :cluster_id)"
+    ),
+    # Citation and evidence fan-out for a summary rebuild.
+    "citations_with_evidence": (
+        "SELECT summary_citations.id, claim_evidence.evidence_text FROM summary_citations"
+        " JOIN claims ON claims.id = summary_citations.claim_id"
+        " JOIN claim_evidence ON claim_evidence.id = summary_citations.evidence_id"
+        " WHERE claims.event_cluster_id = :cluster_id"
+    ),
+}
+
+
+def _seed(url: str, articles: int, claims_per_article: int, seed: int) -> None:
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    metadata = uuid_key_metadata()
+    metadata.create_all(bind=engine)
+    tables = metadata.tables
+    started = datetime(2024, 1, 1)
+    try:
+        with engine.begin() as connection:
+            sources = [
+                {"id": str(uuid.uuid4()), "name": f"Source {index}", "source_type": "wire", "created_at": started}
+                for index in range(20)
+            ]
+            connection.execute(tables["sources"].insert(), sources)
+            clusters = [
+                {"id": str(uuid.uuid4()), "canonical_title": f"Cluster {index}", "status": "active", "created_at": started}
+                for index in range(max(1, articles // 10))
+            ]
+            connection.execute(tables["event_clusters"].insert(), clusters)
+            connection.execute(
+                tables["summaries"].insert(),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "event_cluster_id": cluster["id"],
+                        "agreed_facts_json": "[]",
+                        "disputed_claims_json": "[]",
+                        "unknowns_json": "[]",
+                        "confidence_rationale": "benchmark",
+                        "confidence_score": 0.5,
+                        "created_at": started + timedelta(seconds=index),
+                    }
+                    for index, cluster in enumerate(clusters)
+                ],
+            )
+            summary_by_cluster = dict(connection.execute(text("SELECT event_cluster_id, id FROM summaries")).all())
+
+            for offset in range(0, articles, 1000):
+                article_rows, claim_rows, evidence_rows, citation_rows = [], [], [], []
+                for index in range(offset, min(offset + 1000, articles)):
+                    article_id = str(uuid.uuid4())
+                    article_rows.append(
+                        {
+                            "id": article_id,
+                            "source_id": rng.choice(sources)["id"],
+                            "url": f"https://bench.example/{index}",
+                            "title": f"Story {index}",
+                            "cleaned_text": f"Benchmark story {index}",
+                            "created_at": started + timedelta(seconds=index),
+                        }
+                    )
+                    cluster_id = rng.choice(clusters)["id"]
+                    for claim_index in range(claims_per_article):
+                        claim_id, evidence_id = str(uuid.uuid4()), str(uuid.uuid4())
+                        claim_rows.append(
+                            {
+                                "id": claim_id,
+                                "article_id": article_id,
+                                "event_cluster_id": cluster_id,
+                                "claim_text": f"Claim {index}.{claim_index}",
+                                "claim_type": "observed_fact",
+                                "created_at": started,
+                            }
+                        )
+                        evidence_rows.append(
+                            {
+                                "id": evidence_id,
+                                "claim_id": claim_id,
+                                "article_id": article_id,
+                                "evidence_text": f"Evidence {index}.{claim_index}",
+                                "evidence_type": "reported_fact",
+                                "created_at": started,
+                            }
+                        )
+                        citation_rows.append(
+                            {
+                                "id": str(uuid.uuid4()),
+                                "summary_id": summary_by_cluster[cluster_id],
+                                "section": "agreed_facts",
+                                "bullet_index": claim_index,
+                                "claim_id": claim_id,
+                                "evidence_id": evidence_id,
+                                "created_at": started,
+                            }
+                        )
+                connection.execute(tables["articles"].insert(), article_rows)
+                connection.execute(tables["claims"].insert(), claim_rows)
+                connection.execute(tables["claim_evidence"].insert(), evidence_rows)
+                connection.execute(tables["summary_citations"].insert(), citation_rows)
+    finally:
+        engine.dispose()
+
+
+def _measure(path: Path, repeats: int) -> dict:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("VACUUM"))
+            connection.execute(text("ANALYZE"))
+            cluster_ids = (
+                connection.execute(text("SELECT id FROM event_clusters ORDER BY random() LIMIT :limit"), {"limit": repeats})
+                .scalars()
+                .all()
+            )
+            timings = {}
+            for label, sql in _QUERIES.items():
+                started = time.perf_counter()
+                for cluster_id in cluster_ids:
+                    connection.execute(text(sql), {"cluster_id": cluster_id}).all()
+                timings[f"{label}_ms"] = round((time.perf_counter() - started) / len(cluster_ids) * 1000, 3)
+    finally:
+        engine.dispose()
+    return {"file_bytes": path.stat().st_size, **timings}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--claims-per-article", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        uuid_path = Path(directory) / "uuid.db"
+        integer_path = Path(directory) / "integer.db"
+        _seed(f"sqlite:///{uuid_path}", args.articles, args.claims_per_article, args.seed)
+        shutil.copyfile(uuid_path, integer_path)
+
+        engine = create_engine(f"sqlite:///{integer_path}")
+        started = time.perf_counter()
+        try:
+            run_migrations(engine)
+        finally:
+            engine.dispose()
+        migration_seconds = time.perf_counter() - started
+
+        results = {
+            "uuid_keys": _measure(uuid_path, args.repeats),
+            "integer_keys": _measure(integer_path, args.repeats),
+            "migration_seconds": round(migration_seconds, 2),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
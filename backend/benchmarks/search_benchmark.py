@@ -0,0 +1,152 @@
+"""Measure GET /search latency on a synthetic corpus.
+
+Usage (from backend/):
+    python -m benchmarks.search_benchmark --claims 1000000 --repeats 50
+
+Builds a fresh database through run_migrations, so rows are indexed by the same triggers
+the API relies on, then times SearchService.search for rare, common, multi-term, prefix
+and second-page queries. Word frequencies follow a Zipf distribution, so "common" terms
+match a large share of the corpus.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import SQLiteProfile, create_db_engine
+from app.migrations import run_migrations
+from app.services.search_service import SearchService
+
+_VOCABULARY_SIZE = 50_000
+_BATCH_SIZE = 20_000
+
+
+def _words(rng: random.Random, weights: list[float], count: int) -> str:
+    return " ".join(f"w{index}" for index in rng.choices(range(_VOCABULARY_SIZE), cum_weights=weights, k=count))
+
+
+def _seed(engine, claims: int, seed: int) -> None:
+    rng = random.Random(seed)
+    weights: list[float] = []
+    total = 0.0
+    for rank in range(1, _VOCABULARY_SIZE + 1):
+        total += 1.0 / rank
+        weights.append(total)
+    articles = max(1, claims // 5)
+    clusters = max(1, claims // 50)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO sources (name, source_type, created_at) VALUES ('Bench Wire', 'wire', :now)"), {"now": now}
+        )
+        connection.execute(
+            text("INSERT INTO event_clusters (public_id, canonical_title, status, created_at) VALUES (:p, :t, 'active', :now)"),
+            [{"p": f"c{index}", "t": _words(rng, weights, 6), "now": now} for index in range(clusters)],
+        )
+        for offset in range(0, articles, _BATCH_SIZE):
+            connection.execute(
+                text(
+                    "INSERT INTO articles (public_id, source_id, url, title, cleaned_text, created_at)"
+                    " VALUES (:p, 1, :url, :title, :body, :now)"
+                ),
+                [
+                    {
+                        "p": f"a{index}",
+                        "url": f"https://bench.example/{index}",
+                        "title": _words(rng, weights, 8),
+                        "body": _words(rng, weights, 120),
+                        "now": now,
+                    }
+                    for index in range(offset, min(offset + _BATCH_SIZE, articles))
+                ],
+            )
+        for offset in range(0, claims, _BATCH_SIZE):
+            connection.execute(
+                text(
+                    "INSERT INTO claims (article_id, event_cluster_id, claim_text, claim_type, created_at)"
+                    " VALUES (:article, :cluster, :claim, 'observed_fact', :now)"
+                ),
+                [
+                    {
+                        "article": index // 5 + 1,
+                        "cluster": rng.randrange(clusters) + 1,
+                        "claim": _words(rng, weights, 18),
+                        "now": now,
+                    }
+                    for index in range(offset, min(offset + _BATCH_SIZE, claims))
+                ],
+            )
+    with engine.begin() as connection:
+        for name in ("articles_fts", "claims_fts", "event_clusters_fts"):
+            connection.execute(text(f"INSERT INTO {name} ({name}) VALUES ('optimize')"))
+
+
+def _time(session_factory, service: SearchService, repeats: int, **kwargs) -> dict:
+    samples = []
+    hits = 0
+    with session_factory() as db:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            page = service.search(db, **kwargs)
+            samples.append((time.perf_counter() - started) * 1000)
+            hits = len(page.hits)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "hits": hits,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'search.db'}"
+        engine = create_db_engine(url, SQLiteProfile())
+        read_engine = create_db_engine(url, SQLiteProfile(), read_only=True)
+        try:
+            run_migrations(engine)
+            started = time.perf_counter()
+            _seed(engine, args.claims, args.seed)
+            seed_seconds = time.perf_counter() - started
+            session_factory = sessionmaker(bind=read_engine)
+            service = SearchService()
+            with session_factory() as db:
+                first_page = service.search(db, "w3 w40")
+            queries = {
+                "rare_term": {"query": "w40000"},
+                "mid_term": {"query": "w2000"},
+                "common_term": {"query": "w3"},
+                "two_terms": {"query": "w3 w40"},
+                "prefix": {"query": "w1234*"},
+                "claims_only": {"query": "w500", "kinds": ["claim"]},
+                "second_page": {"query": "w3 w40", "cursor": first_page.next_cursor},
+            }
+            results = {
+                "claims": args.claims,
+                "seed_seconds": round(seed_seconds, 1),
+                "database_bytes": Path(directory, "search.db").stat().st_size,
+                **{label: _time(session_factory, service, args.repeats, **kwargs) for label, kwargs in queries.items()},
+            }
+        finally:
+            read_engine.dispose()
+            engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Compare SQLite engine profiles on per-article ingest and concurrent /events/latest reads.
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_profile_benchmark --articles 500 --readers 4 --seconds 3
+
+Each profile gets a fresh database file. The ingest phase commits once per article,
+like POST /articles does. The mixed phase keeps one writer ingesting while reader
+threads run SummaryService.get_latest_events (the /events/latest query path) on the
+profile's read-only engine.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.db import SQLITE_PROFILES, Base, SQLiteProfile, create_db_engine
+from app.services.article_service import ArticleService
+from app.services.summary_service import SummaryService
+
+
+def _ingest(session_factory, service: ArticleService, count: int, prefix: str) -> float:
+    db = session_factory()
+    started = time.perf_counter()
+    try:
+        for index in range(count):
+            service.create_article_from_raw(
+                db,
+                source_name=f"Bench Source {index % 3}",
+                source_type="wire",
+                url=f"https://bench.example/{prefix}/{index}",
+                title=f"Story {index}",
+                raw_text=f"Benchmark story {prefix}{index} about chip output and launch timing",
+            )
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+
+def _seed_events(session_factory, clusters: int, claims_per_cluster: int) -> None:
+    db = session_factory()
+    try:
+        article_ids = [row[0] for row in db.query(models.Article.id).limit(clusters * claims_per_cluster)]
+        for index in range(clusters):
+            cluster = models.EventCluster(canonical_title=f"Bench cluster {index}")
+            db.add(cluster)
+            db.flush()
+            for offset in range(claims_per_cluster):
+                article_id = article_ids[(index * claims_per_cluster + offset) % len(article_ids)]
+                db.add(
+                    models.Claim(
+                        article_id=article_id,
+                        event_cluster_id=cluster.id,
+                        claim_text=f"Claim {index}.{offset}",
+                        claim_type="observed_fact",
+                    )
+                )
+            db.add(models.Summary(event_cluster_id=cluster.id, agreed_facts_json=json.dumps([f"Fact {index}"])))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _mixed(write_factory, read_factory, service: ArticleService, readers: int, seconds: float) -> tuple[int, int, int]:
+    summaries = SummaryService()
+    stop = threading.Event()
+    reads = [0] * readers
+    errors = [0]
+    written = [0]
+
+    def reader(slot: int) -> None:
+        while not stop.is_set():
+            db = read_factory()
+            try:
+                summaries.get_latest_events(db, limit=10)
+                reads[slot] += 1
+            except Exception:
+                errors[0] += 1
+            finally:
+                db.close()
+
+    def writer() -> None:
+        db = write_factory()
+        try:
+            while not stop.is_set():
+                service.create_article_from_raw(
+                    db,
+                    source_name="Bench Source 0",
+                    source_type="wire",
+                    url=f"https://bench.example/mixed/{uuid.uuid4().hex}",
+                    title="Mixed",
+                    raw_text=f"Mixed workload story {uuid.uuid4().hex}",
+                )
+                written[0] += 1
+        except Exception:
+            errors[0] += 1
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads), written[0], errors[0]
+
+
+def _run_profile(name: str, profile: SQLiteProfile, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        write_engine = create_db_engine(url, profile)
+        Base.metadata.create_all(bind=write_engine)
+        read_engine = create_db_engine(url, profile, read_only=True)
+        write_factory = sessionmaker(bind=write_engine, autoflush=False)
+        read_factory = sessionmaker(bind=read_engine, autoflush=False)
+        service = ArticleService()
+        try:
+            ingest_seconds = _ingest(write_factory, service, args.articles, name)
+            _seed_events(write_factory, clusters=50, claims_per_cluster=5)
+            reads, written, errors = _mixed(write_factory, read_factory, service, args.readers, args.seconds)
+        finally:
+            service.cleaner.close()
+            write_engine.dispose()
+            read_engine.dispose()
+    return {
+        "profile": name,
+        "ingest_articles_per_second": round(args.articles / ingest_seconds, 1),
+        "mixed_reads_per_second": round(reads / args.seconds, 1),
+        "mixed_writes_per_second": round(written / args.seconds, 1),
+        "mixed_errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--profiles", nargs="*", default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    results = [_run_profile(name, SQLITE_PROFILES[name], args) for name in args.profiles]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
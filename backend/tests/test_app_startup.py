@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.main import AppServices, create_app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# Measured around 0.7-0.9s for `import app.main` (FastAPI itself is most of it) and about
+# 1.3s for a cold start. The budgets leave headroom for slow CI machines.
+IMPORT_BUDGET_SECONDS = 2.0
+COLD_START_BUDGET_SECONDS = 4.0
+
+
+def _run(code: str, database_path: Path, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database_path}", "DEDUPE_FILTER_PATH": str(database_path.with_suffix(".bin"))}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+
+def test_importing_the_app_is_cheap_and_does_not_touch_the_database(tmp_path):
+    database_path = tmp_path / "import.db"
+    result = _run("import app.main", database_path, "-X", "importtime")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = (part.strip() for part in line.split("|"))
+            if cumulative.isdigit():
+                timings[module] = int(cumulative)
+    assert timings["app.main"] / 1_000_000 < IMPORT_BUDGET_SECONDS
+    assert not any(module.startswith(("app.ingestion", "httpx")) for module in timings)
+    assert not database_path.exists()
+
+
+def test_cold_start_runs_migrations_within_budget(tmp_path):
+    database_path = tmp_path / "cold.db"
+    code = (
+        "import time\n"
+        "started = time.perf_counter()\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import create_app\n"
+        "with TestClient(create_app()) as client:\n"
+        "    assert client.get('/events/latest').status_code == 200\n"
+        "print(time.perf_counter() - started)\n"
+    )
+    result = _run(code, database_path)
+
+    assert float(result.stdout.strip().splitlines()[-1]) < COLD_START_BUDGET_SECONDS
+    assert database_path.exists()
+
+
+def test_services_are_built_on_first_use():
+    services = AppServices()
+    client = TestClient(create_app(services))
+
+    assert client.get("/health").status_code == 200
+    assert services._instances == {}
+
+    assert client.get("/ingest/dedupe-filter").status_code == 200
+    assert set(services._instances) == {"article_service"}
@@ -1,8 +1,12 @@
+import uuid
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
 from app import models
-from app.db import SessionLocal
+from app.db import Base, SessionLocal, engine
 from app.main import app
+from app.services.article_service import ArticleService, RawArticle
 
 
 def test_create_article_endpoint():
@@ -47,8 +51,135 @@ def test_article_cleaned_text_is_full_text_and_dedupe_uses_stable_hash():
 
     db = SessionLocal()
     try:
-        article = db.query(models.Article).filter(models.Article.id == first.json()["article_id"]).first()
+        article = db.query(models.Article).filter(models.Article.public_id == first.json()["article_id"]).first()
         assert article is not None
         assert article.cleaned_text == "openai launched a model today read more now"
     finally:
         db.close()
+
+
+def test_bulk_upsert_dedupes_within_batch_and_against_existing_rows():
+    Base.metadata.create_all(bind=engine)
+    run_id = uuid.uuid4().hex
+    service = ArticleService()
+    db = SessionLocal()
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        existing = service.create_article_from_raw(
+            db,
+            source_name="Bulk Wire",
+            source_type="wire",
+            url=f"https://example.com/bulk-{run_id}-existing",
+            title="Existing",
+            raw_text=f"Existing bulk article {run_id}",
+        )
+        raw_articles = [
+            RawArticle("Bulk Wire", "wire", f"https://example.com/bulk-{run_id}-1", "One", f"First bulk story {run_id}"),
+            RawArticle("Bulk Wire", "wire", f"https://example.com/bulk-{run_id}-2", "Two", f"Existing bulk article {run_id}"),
+            RawArticle("Bulk Desk", "api", f"https://example.com/bulk-{run_id}-3", "Three", f"FIRST bulk story {run_id}!"),
+            RawArticle("Bulk Desk", "api", f"https://example.com/bulk-{run_id}-1", "Four", f"Same url new text {run_id}"),
+            RawArticle("Bulk Desk", "api", f"https://example.com/bulk-{run_id}-5", "Five", f"Fifth bulk story {run_id}"),
+        ]
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            results = service.create_articles_bulk(db, raw_articles)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert [result.deduped for result in results] == [False, True, True, True, False]
+        assert results[1].article_id == existing.article_id
+        assert results[2].article_id == results[0].article_id
+        assert results[3].article_id == results[0].article_id
+        assert len(statements) <= 6
+        assert sum(statement.startswith("INSERT INTO articles") for statement in statements) == 1
+
+        stored = db.query(models.Article).filter(models.Article.id.in_([results[0].article_id, results[4].article_id])).all()
+        assert {article.url for article in stored} == {raw_articles[0].url, raw_articles[4].url}
+    finally:
+        db.close()
+
+
+def test_near_duplicate_copy_resolves_to_earlier_article():
+    Base.metadata.create_all(bind=engine)
+    run_id = uuid.uuid4().hex
+    service = ArticleService()
+    words = " ".join(f"{run_id[:8]}term{index}" for index in range(60))
+    original_text = f"Syndicated report {words} closing paragraph"
+    db = SessionLocal()
+    try:
+        original = service.create_article_from_raw(
+            db,
+            source_name="Origin Wire",
+            source_type="wire",
+            url=f"https://example.com/near-{run_id}-original",
+            title="Original",
+            raw_text=original_text,
+        )
+        copy = service.create_article_from_raw(
+            db,
+            source_name="Reprint Daily",
+            source_type="newspaper",
+            url=f"https://example.com/near-{run_id}-copy",
+            title="Copy",
+            raw_text=original_text.replace(f"{run_id[:8]}term30", f"{run_id[:8]}edited"),
+        )
+        distinct = service.create_article_from_raw(
+            db,
+            source_name="Reprint Daily",
+            source_type="newspaper",
+            url=f"https://example.com/near-{run_id}-distinct",
+            title="Distinct",
+            raw_text=" ".join(f"{run_id[:8]}other{index}" for index in range(60)),
+        )
+
+        assert original.deduped is False
+        assert copy.deduped is True
+        assert copy.near_duplicate_of == original.article_id
+        assert distinct.deduped is False
+        assert distinct.near_duplicate_of is None
+        assert db.get(models.ArticleFingerprint, original.article_id) is not None
+        assert db.get(models.ArticleFingerprint, distinct.article_id) is not None
+    finally:
+        db.close()
+
+
+def test_source_ids_are_cached_and_concurrent_creation_shares_one_row():
+    Base.metadata.create_all(bind=engine)
+    run_id = uuid.uuid4().hex
+    source_name = f"Cached Wire {run_id}"
+    first_service, second_service = ArticleService(), ArticleService()
+    db = SessionLocal()
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        first = first_service.create_article_from_raw(
+            db, source_name=source_name, source_type="wire", url=f"https://example.com/cache-{run_id}-1", title="One", raw_text=f"one {run_id}"
+        )
+        # A second process that has not seen the source yet races to create it.
+        second = second_service.create_article_from_raw(
+            db, source_name=source_name, source_type="wire", url=f"https://example.com/cache-{run_id}-2", title="Two", raw_text=f"two {run_id}"
+        )
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            first_service.create_article_from_raw(
+                db, source_name=source_name, source_type="wire", url=f"https://example.com/cache-{run_id}-3", title="Three", raw_text=f"three {run_id}"
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert not any("FROM sources" in statement or "INTO sources" in statement for statement in statements)
+        sources = db.query(models.Source).filter(models.Source.name == source_name).all()
+        assert len(sources) == 1
+        source_ids = {db.get(models.Article, result.article_id).source_id for result in (first, second)}
+        assert source_ids == {sources[0].id}
+    finally:
+        db.close()
@@ -1,12 +1,18 @@
 import json
+import uuid
 
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
 
 from app import models
-from app.db import Base, SessionLocal, engine
+from app.db import Base, SQLiteProfile, SessionLocal, create_db_engine, engine
+from app.main import app
+from app.migrations import run_migrations
 from app.services.article_service import ArticleService
-from app.services.claim_extraction import parse_claim_extraction_json
-from app.services.claim_service import ClaimService
+from app.services.claim_extraction import ClaimExtractionResult, parse_claim_extraction_json
+from app.services.claim_service import ClaimBatchItem, ClaimService
 
 
 def test_parse_claim_extraction_json_valid_payload():
@@ -101,3 +107,138 @@ def test_claim_persistence_filters_non_factual_claim_types():
         assert persisted_claims[0].claim_type == "observed_fact"
     finally:
         db.close()
+
+
+def _model_output(text: str) -> str:
+    return json.dumps(
+        {
+            "claims": [
+                {
+                    "claim_text": text,
+                    "claim_type": "observed_fact",
+                    "evidence": [{"evidence_text": text, "evidence_type": "reported_fact"}],
+                }
+            ]
+        }
+    )
+
+
+def test_batch_extraction_streams_ndjson_and_reports_each_record():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        article_ids = []
+        for index in range(3):
+            created = ArticleService().create_article_from_raw(
+                db,
+                source_name="S-batch",
+                source_type="api",
+                url=f"https://example.com/batch/{uuid.uuid4().hex}/{index}",
+                title=f"Batch article {index}",
+                raw_text=f"Batch article body {index} {uuid.uuid4().hex}",
+            )
+            article_ids.append(db.get(models.Article, created.article_id).public_id)
+    finally:
+        db.close()
+
+    lines = [
+        json.dumps({"article_id": article_ids[0], "model_output_json": _model_output("First claim.")}),
+        "",
+        json.dumps({"article_id": article_ids[1], "model_output_json": "{not json"}),
+        "{broken",
+        json.dumps({"article_id": "missing", "model_output_json": _model_output("Lost claim.")}),
+        json.dumps(
+            {"article_id": article_ids[2], "model_output_json": _model_output("Third claim."), "extraction_model": "m"}
+        ),
+        json.dumps({"article_id": article_ids[2], "model_output_json": _model_output("x" * (2 << 20))}),
+        json.dumps({"article_id": article_ids[0], "model_output_json": _model_output("First claim, revised.")}),
+    ]
+    body = ("\n".join(lines)).encode("utf-8")
+
+    def stream():
+        # Split mid-record so lines have to be reassembled across chunks.
+        for start in range(0, len(body), 4096):
+            yield body[start : start + 4096]
+
+    response = TestClient(app).post("/extract/claims/batch", params={"chunk_size": 2}, content=stream())
+    assert response.status_code == 200
+    payload = response.json()
+    assert [(result["line"], result["status"], result["error"]) for result in payload["results"]] == [
+        (1, "persisted", None),
+        (3, "failed", "invalid_model_output"),
+        (4, "failed", "invalid_record"),
+        (5, "failed", "article_not_found"),
+        (6, "persisted", None),
+        (7, "failed", "record_too_large"),
+        (8, "persisted", None),
+    ]
+    assert (payload["records"], payload["persisted"], payload["failed"], payload["claims_created"]) == (7, 3, 4, 3)
+
+    db = SessionLocal()
+    try:
+        texts = (
+            db.query(models.Claim.claim_text)
+            .join(models.Article, models.Article.id == models.Claim.article_id)
+            .filter(models.Article.public_id == article_ids[0])
+            .all()
+        )
+        assert [text for (text,) in texts] == ["First claim, revised."]
+        third = (
+            db.query(models.Claim)
+            .join(models.Article, models.Article.id == models.Claim.article_id)
+            .filter(models.Article.public_id == article_ids[2])
+            .one()
+        )
+        assert third.extraction_model == "m"
+    finally:
+        db.close()
+
+
+def test_batch_chunk_commits_as_one_transaction(tmp_path):
+    url = f"sqlite:///{tmp_path / 'batch.db'}"
+    isolated = create_db_engine(url, SQLiteProfile())
+    reader = create_db_engine(url, SQLiteProfile(), read_only=True)
+    visible: list[int] = []
+
+    class ProbingClaimService(ClaimService):
+        def _sync_claims(self, db, *args):
+            result = super()._sync_claims(db, *args)
+            with reader.connect() as other:
+                visible.append(other.execute(text("SELECT COUNT(*) FROM claims")).scalar())
+            return result
+
+    try:
+        run_migrations(isolated)
+        session_factory = sessionmaker(bind=isolated)
+        with session_factory() as db:
+            public_ids = []
+            for index in range(3):
+                created = ArticleService().create_article_from_raw(
+                    db,
+                    source_name="S-chunk",
+                    source_type="api",
+                    url=f"https://example.com/chunk/{index}",
+                    title=f"Chunk article {index}",
+                    raw_text=f"Chunk body {uuid.uuid4().hex} {index}",
+                )
+                public_ids.append(db.get(models.Article, created.article_id).public_id)
+
+        items = [
+            ClaimBatchItem(
+                line=index + 1,
+                article_id=public_id,
+                extraction_result=ClaimExtractionResult.model_validate_json(_model_output(f"Claim {index}.")),
+            )
+            for index, public_id in enumerate(public_ids)
+        ]
+        with session_factory() as db:
+            results = ProbingClaimService().persist_extraction_batch(db, items)
+
+        assert [result.status for result in results] == ["persisted"] * 3
+        # No record is visible to another connection before the chunk commits.
+        assert visible == [0, 0, 0]
+        with reader.connect() as other:
+            assert other.execute(text("SELECT COUNT(*) FROM claims")).scalar() == 3
+    finally:
+        reader.dispose()
+        isolated.dispose()
@@ -157,3 +157,114 @@ def test_reextract_cleans_relations_and_summary_citations_for_old_claim_ids():
         assert db.query(models.SummaryCitation).filter(models.SummaryCitation.claim_id == old_claim.id).count() == 0
     finally:
         db.close()
+
+
+def _claim(text: str, evidence: list[str], confidence: float | None = None) -> dict:
+    return {
+        "claim_text": text,
+        "claim_type": "observed_fact",
+        "confidence": confidence,
+        "evidence": [{"evidence_text": span, "evidence_type": "reported_fact"} for span in evidence],
+    }
+
+
+def test_reextract_diffs_claims_and_keeps_untouched_ids_clusters_and_citations():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        claim_service = ClaimService()
+        created = ArticleService().create_article_from_raw(
+            db,
+            source_name="Example diff",
+            source_type="api",
+            url="https://example.com/claim-diff",
+            title="Chip supply update",
+            raw_text="Vendor doubled wafer orders. Vendor opened a fab. Vendor hired staff.",
+        )
+        article = db.get(models.Article, created.article_id)
+
+        def persist(claims: list[dict]):
+            parsed = parse_claim_extraction_json(json.dumps({"claims": claims}))
+            return claim_service.persist_extracted_claims(db, article=article, extraction_result=parsed)
+
+        first = persist(
+            [
+                _claim("Vendor doubled wafer orders.", ["doubled wafer orders"], 0.9),
+                _claim("Vendor opened a fab.", ["opened a fab", "new fab"], 0.8),
+                _claim("Vendor hired staff.", ["hired staff"]),
+            ]
+        )
+        assert (first.claims_created, first.evidence_created) == (3, 4)
+        claims = {
+            claim.claim_text: claim
+            for claim in db.query(models.Claim).filter(models.Claim.article_id == article.id)
+        }
+        doubled, fab, hired = (
+            claims[text] for text in ("Vendor doubled wafer orders.", "Vendor opened a fab.", "Vendor hired staff.")
+        )
+        cluster = models.EventCluster(canonical_title="Chip supply")
+        db.add(cluster)
+        db.flush()
+        doubled.event_cluster_id = fab.event_cluster_id = cluster.id
+        summary = models.Summary(event_cluster_id=cluster.id, agreed_facts_json="[]")
+        db.add(summary)
+        db.flush()
+        stale_span = next(span for span in fab.evidence_spans if span.evidence_text == "new fab")
+        citations = [
+            models.SummaryCitation(
+                summary_id=summary.id,
+                section="agreed_facts",
+                bullet_index=index,
+                claim_id=claim.id,
+                evidence_id=span_id,
+            )
+            for index, (claim, span_id) in enumerate(
+                ((doubled, doubled.evidence_spans[0].id), (fab, stale_span.id), (hired, hired.evidence_spans[0].id))
+            )
+        ]
+        db.add_all(citations)
+        db.commit()
+        ids = {text: claim.id for text, claim in claims.items()}
+
+        same = persist(
+            [
+                _claim("Vendor doubled wafer orders.", ["doubled wafer orders"], 0.9),
+                _claim("Vendor opened a fab.", ["opened a fab", "new fab"], 0.8),
+                _claim("Vendor hired staff.", ["hired staff"]),
+            ]
+        )
+        assert (same.claims_created, same.claims_updated, same.claims_deleted, same.claims_unchanged) == (0, 0, 0, 3)
+
+        # Case and punctuation are not part of the fingerprint, so this rewording is an update.
+        changed = persist(
+            [
+                _claim("vendor doubled wafer orders", ["doubled wafer orders"], 0.9),
+                _claim("Vendor opened a fab.", ["opened a fab"], 0.95),
+                _claim("Vendor raised prices.", ["raised prices"]),
+            ]
+        )
+        counts = (changed.claims_created, changed.claims_updated, changed.claims_deleted, changed.claims_unchanged)
+        assert counts == (1, 2, 1, 0)
+        assert changed.evidence_created == 1
+
+        db.expire_all()
+        remaining = {claim.id: claim for claim in db.query(models.Claim).filter(models.Claim.article_id == article.id)}
+        assert ids["Vendor doubled wafer orders."] in remaining
+        assert ids["Vendor opened a fab."] in remaining
+        assert ids["Vendor hired staff."] not in remaining
+        kept_fab = remaining[ids["Vendor opened a fab."]]
+        assert kept_fab.event_cluster_id == cluster.id
+        assert kept_fab.confidence == 0.95
+        assert [span.evidence_text for span in kept_fab.evidence_spans] == ["opened a fab"]
+        assert remaining[ids["Vendor doubled wafer orders."]].claim_text == "vendor doubled wafer orders"
+
+        cited = {
+            citation.claim_id: citation.evidence_id
+            for citation in db.query(models.SummaryCitation).filter(models.SummaryCitation.summary_id == summary.id)
+        }
+        assert cited == {
+            ids["Vendor doubled wafer orders."]: citations[0].evidence_id,
+            ids["Vendor opened a fab."]: None,
+        }
+    finally:
+        db.close()
@@ -16,11 +16,12 @@ def _create_cluster_with_claims(db, source_count: int, claim_texts: list[str], c
 
     claims: list[models.Claim] = []
     for idx, claim_text in enumerate(claim_texts):
-        source = models.Source(name=f"Confidence Source {idx}", source_type="api")
-        db.add(source)
-        db.flush()
         if idx >= source_count:
-            source = db.query(models.Source).filter(models.Source.name == "Confidence Source 0").first()
+            source = db.query(models.Source).filter(models.Source.name == f"Confidence Source {cluster.id} 0").first()
+        else:
+            source = models.Source(name=f"Confidence Source {cluster.id} {idx}", source_type="api")
+            db.add(source)
+            db.flush()
         article = models.Article(
             source_id=source.id,
             url=f"https://example.com/confidence/{cluster.id}/{idx}",
@@ -237,7 +238,8 @@ def test_relation_builder_prioritizes_contradiction_over_overlap():
         assert "contradicts=1" in latest_summary.confidence_rationale
 
         latest_events = summary_service.get_latest_events(db, limit=20)
-        event = next((item for item in latest_events if item["cluster_id"] == cluster_id), None)
+        public_cluster_id = db.get(models.EventCluster, cluster_id).public_id
+        event = next((item for item in latest_events if item["cluster_id"] == public_cluster_id), None)
         assert event is not None
         assert set(event.keys()) == {
             "cluster_id",
@@ -1,4 +1,9 @@
-from app.services.content_cleaner import ContentCleaner
+import html
+import random
+import re
+from collections import Counter
+
+from app.services.content_cleaner import BOILERPLATE_WORDS, STOPWORDS, ContentCleaner
 
 
 def test_content_cleaner_removes_boilerplate_and_generates_hash():
@@ -35,3 +40,62 @@ def test_content_cleaner_hash_stable_for_equivalent_text():
     b = cleaner.clean_for_keywords("openai launches gpt model read more")
 
     assert a.content_hash == b.content_hash
+
+
+def _reference_clean(text: str, keyword_limit: int) -> tuple[str, str]:
+    # The original multi-pass implementation; the fused normalizer must match it byte for byte.
+    unescaped = html.unescape(text)
+    no_html = re.sub(r"<[^>]+>", " ", unescaped)
+    no_urls = re.sub(r"https?://\S+", " ", no_html)
+    alnum = re.sub(r"[^a-zA-Z0-9\s]", " ", no_urls)
+    normalized = re.sub(r"\s+", " ", alnum).strip().lower()
+    tokens = normalized.split(" ") if normalized else []
+    filtered = [t for t in tokens if t not in STOPWORDS and t not in BOILERPLATE_WORDS and len(t) > 2]
+    ranked = sorted(Counter(filtered).items(), key=lambda item: (-item[1], item[0]))
+    return normalized, " ".join(token for token, _ in ranked[:keyword_limit])
+
+
+_FRAGMENTS = [
+    "<p>", "</div>", "<", ">", "<a href='https://x.com/a b'>", "<b\n>", "https://", "http://", "https:",
+    "//", "example.com/path?q=1&r=2", "&amp;", "&lt;", "&gt;", "&#60;", "&nbsp;", "&#x3e;", "OpenAI",
+    "model", "MODEL", "the", "subscribe", "launch", "42", "a1b2", " ", "  ", "\n", "\t", "\xa0", " ",
+    "　", "\x85", "\x1c", "é", "ß", "K", "İ", "ΟΣ", "-", ".", "_", ",", "!", ":", "/", "'",
+]
+
+
+def test_fused_normalizer_matches_reference_on_fuzzed_input():
+    rng = random.Random(1307)
+    cleaner = ContentCleaner(keyword_limit=7)
+    for _ in range(4000):
+        if rng.random() < 0.8:
+            text = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 40)))
+        else:
+            text = "".join(chr(rng.choice([rng.randint(0, 0x7F), rng.randint(0x80, 0x3000)])) for _ in range(60))
+
+        result = cleaner.clean_for_keywords(text)
+        expected_cleaned, expected_keywords = _reference_clean(text, keyword_limit=7)
+
+        assert (result.cleaned_text, result.keyword_text) == (expected_cleaned, expected_keywords), repr(text)
+        assert result.content_hash == ContentCleaner.hash_text(expected_keywords)
+
+
+def test_clean_many_matches_serial_cleaning_in_order_across_processes():
+    texts = [f"<p>Story {idx}</p> about reactor{idx % 7} and turbine{idx} https://e.com/{idx}" for idx in range(300)]
+    texts[5] = None
+    cleaner = ContentCleaner(keyword_limit=5, max_workers=2, parallel_threshold=50, chunk_size=16)
+    try:
+        parallel = cleaner.clean_many(texts)
+        assert cleaner._executor is not None
+    finally:
+        cleaner.close()
+
+    assert parallel == [ContentCleaner(keyword_limit=5).clean_for_keywords(text) for text in texts]
+
+
+def test_clean_many_stays_serial_for_small_batches():
+    cleaner = ContentCleaner(max_workers=4, parallel_threshold=50)
+
+    results = cleaner.clean_many(["OpenAI shipped a model", "Telescope finds planet"])
+
+    assert [result.cleaned_text for result in results] == ["openai shipped a model", "telescope finds planet"]
+    assert cleaner._executor is None
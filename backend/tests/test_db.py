@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db import SQLITE_PROFILES, SQLiteProfile, create_db_engine
+
+
+def test_wal_profile_pragmas_apply_on_every_connection(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    engine = create_db_engine(url, SQLiteProfile(busy_timeout_ms=1234))
+    try:
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+            assert connection.execute(text("PRAGMA cache_size")).scalar() == -64 * 1024
+            assert connection.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+    finally:
+        engine.dispose()
+
+    legacy = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}", SQLITE_PROFILES["legacy"])
+    try:
+        with legacy.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    finally:
+        legacy.dispose()
+
+
+def test_read_only_engine_sees_committed_rows_and_rejects_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'split.db'}"
+    write_engine = create_db_engine(url, SQLiteProfile())
+    read_engine = create_db_engine(url, SQLiteProfile(), read_only=True)
+    try:
+        with write_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            connection.execute(text("INSERT INTO items (name) VALUES ('first')"))
+
+        with read_engine.connect() as connection:
+            assert connection.execute(text("SELECT name FROM items")).scalars().all() == ["first"]
+            with pytest.raises(OperationalError):
+                connection.execute(text("INSERT INTO items (name) VALUES ('second')"))
+    finally:
+        read_engine.dispose()
+        write_engine.dispose()
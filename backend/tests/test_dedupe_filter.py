@@ -0,0 +1,80 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.db import Base, SessionLocal, engine
+from app.services.article_service import ArticleService, RawArticle
+from app.services.dedupe_filter import BloomFilter, DedupeFilter
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for index in range(5000):
+        bloom.add(f"present-{index}")
+
+    assert all(f"present-{index}" in bloom for index in range(5000))
+    false_positives = sum(f"absent-{index}" in bloom for index in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert abs(bloom.estimated_error_rate() - 0.01) < 0.005
+
+    restored, watermark = BloomFilter.from_bytes(bloom.to_bytes(None))
+    assert watermark is None
+    assert restored.items == 5000
+    assert all(f"present-{index}" in restored for index in range(0, 5000, 7))
+
+
+def test_dedupe_filter_skips_lookups_for_fresh_items_and_survives_restart(tmp_path):
+    Base.metadata.create_all(bind=engine)
+    run_id = uuid.uuid4().hex
+    path = tmp_path / "dedupe.bin"
+    service = ArticleService(dedupe_filter=DedupeFilter(capacity=10_000, error_rate=0.001, path=str(path)))
+    db = SessionLocal()
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        existing = service.create_article_from_raw(
+            db,
+            source_name="Filter Wire",
+            source_type="wire",
+            url=f"https://example.com/filter-{run_id}-existing",
+            title="Existing",
+            raw_text=f"Existing filtered article {run_id}",
+        )
+        service.dedupe_filter.load_or_build(db)
+        assert path.exists()
+
+        fresh = [
+            RawArticle("Filter Wire", "wire", f"https://example.com/filter-{run_id}-{index}", f"T{index}", f"Fresh story{index} {run_id}")
+            for index in range(5)
+        ]
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            results = service.create_articles_bulk(db, fresh)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        assert not any(result.deduped for result in results)
+        assert not any(statement.startswith("SELECT articles.id") for statement in statements)
+
+        restarted = ArticleService(dedupe_filter=DedupeFilter(capacity=10_000, error_rate=0.001, path=str(path)))
+        service.dedupe_filter.save()
+        restarted.dedupe_filter.load_or_build(db)
+        repeat = restarted.create_articles_bulk(
+            db,
+            [
+                RawArticle("Filter Wire", "wire", f"https://example.com/filter-{run_id}-existing", "Existing", f"Existing filtered article {run_id}"),
+                fresh[2],
+            ],
+        )
+        assert [result.deduped for result in repeat] == [True, True]
+        assert repeat[0].article_id == existing.article_id
+        assert repeat[1].article_id == results[2].article_id
+
+        stats = restarted.dedupe_filter.stats()
+        assert stats["ready"] is True
+        assert stats["checked"] == 4
+        assert stats["memory_bytes"] > 0
+    finally:
+        db.close()
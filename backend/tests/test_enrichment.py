@@ -0,0 +1,145 @@
+import asyncio
+import uuid
+
+import httpx
+
+from app import models
+from app.db import Base, SessionLocal, engine
+from app.ingestion.enrichment import ArticleBodyFetcher, EnrichmentConfig
+from app.ingestion.http import PooledHttpClient
+from app.ingestion.service import AdapterFetchResult, IngestionRunner, NormalizedArticle
+
+
+def _resolver(table: dict[str, list[str]]):
+    async def resolve(host: str, port: int) -> list[str]:
+        if host not in table:
+            raise OSError(f"unknown host {host}")
+        return table[host]
+
+    return resolve
+
+
+_PUBLIC_DNS = _resolver({"news.example.com": ["93.184.216.34"], "science.example.com": ["93.184.216.35"]})
+
+
+def _item(url: str, raw_text: str | None = "Upstream snippet") -> NormalizedArticle:
+    return NormalizedArticle(source_name="Enrich Wire", source_type="api", url=url, title="Enriched", raw_text=raw_text)
+
+
+def test_body_fetcher_caps_bytes_strips_scripts_and_refuses_private_targets():
+    big_page = b"<html><script>var tracking = 1;</script><p>" + b"alpha " * 2000 + b"</p></html>"
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        path = request.url.path
+        if path == "/redirect-internal":
+            return httpx.Response(302, headers={"Location": "http://127.0.0.1/admin"})
+        if path == "/paper.pdf":
+            return httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.7")
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=big_page)
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    fetcher = ArticleBodyFetcher(http, EnrichmentConfig(max_bytes=1000, max_per_host=2), resolver=_PUBLIC_DNS)
+    pages = [_item(f"https://news.example.com/story/{idx}") for idx in range(6)]
+    others = [
+        _item("https://news.example.com/redirect-internal"),
+        _item("https://news.example.com/paper.pdf"),
+        _item("http://10.0.0.7/intranet"),
+        _item("ftp://news.example.com/file"),
+    ]
+    try:
+        stats = http.run(fetcher.enrich(pages + others))
+    finally:
+        http.close()
+
+    assert stats["enriched"] == 6
+    assert stats["truncated"] == 6
+    assert stats["skipped"] == 2
+    assert stats["bytes_downloaded"] == 6 * 1000
+    assert stats["bytes_saved"] == 6 * (len(big_page) - 1000)
+    assert peak <= 2
+    assert pages[0].raw_text.startswith("Upstream snippet\n")
+    assert "tracking" not in pages[0].raw_text and "alpha alpha" in pages[0].raw_text
+    assert all(item.raw_text == "Upstream snippet" for item in others)
+
+
+class _StaticAdapter:
+    def __init__(self, items: list[NormalizedArticle]) -> None:
+        self.items = items
+
+    async def fetch_items_async(self, limit, *, known_ids=frozenset(), cursor=None) -> AdapterFetchResult:
+        return AdapterFetchResult(items=list(self.items))
+
+
+def test_runner_enrichment_feeds_page_text_into_cleaned_text():
+    Base.metadata.create_all(bind=engine)
+    slug = uuid.uuid4().hex
+    body = f"<article>Quantum telescope {slug} discovers distant exoplanet atmospheres</article>".encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=body)
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    runner = IngestionRunner(
+        adapters={"static": _StaticAdapter([_item(f"https://science.example.com/{slug}", raw_text=None)])},
+        http=http,
+        body_fetcher=ArticleBodyFetcher(http, resolver=_PUBLIC_DNS),
+    )
+    db = SessionLocal()
+    try:
+        result = runner.run(db, source_keys=["static"], limit_per_source=5, enrich=True)
+        article = db.query(models.Article).filter(models.Article.url == f"https://science.example.com/{slug}").one()
+    finally:
+        db.close()
+        runner.close()
+
+    assert result["enrichment"]["enriched"] == 1
+    assert "exoplanet atmospheres" in article.cleaned_text
+
+
+def test_body_fetcher_checks_resolved_addresses_and_pins_the_connection():
+    seen: list[tuple[str, str, str | None]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((str(request.url), request.headers["host"], request.extensions.get("sni_hostname")))
+        if request.url.path == "/hop":
+            return httpx.Response(302, headers={"Location": "http://metadata.example.net/latest/meta-data"})
+        return httpx.Response(200, headers={"Content-Type": "text/plain"}, content=b"public body")
+
+    resolver = _resolver(
+        {
+            "news.example.com": ["93.184.216.34"],
+            "rebind.example.com": ["93.184.216.34", "10.0.0.7"],
+            "internal.example.com": ["127.0.0.1"],
+            "metadata.example.net": ["169.254.169.254"],
+        }
+    )
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    fetcher = ArticleBodyFetcher(http, EnrichmentConfig(), resolver=resolver)
+    public = _item("https://news.example.com:8443/story?id=1")
+    redirected = _item("https://news.example.com/hop")
+    refused = [
+        _item("https://internal.example.com/admin"),
+        _item("https://rebind.example.com/story"),
+        _item("https://unresolvable.example.org/story"),
+    ]
+    try:
+        stats = http.run(fetcher.enrich([public, redirected, *refused]))
+    finally:
+        http.close()
+
+    assert stats["enriched"] == 1
+    assert stats["skipped"] == 3
+    assert public.raw_text.endswith("public body")
+    assert redirected.raw_text == "Upstream snippet"
+    # Requests go to the checked address; Host and SNI keep the original name.
+    assert sorted(seen) == [
+        ("https://93.184.216.34/hop", "news.example.com", "news.example.com"),
+        ("https://93.184.216.34:8443/story?id=1", "news.example.com:8443", "news.example.com"),
+    ]
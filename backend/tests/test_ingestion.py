@@ -0,0 +1,445 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.db import Base, SessionLocal, engine
+from app.ingestion.http import HttpClientConfig, PooledHttpClient
+from app.ingestion.service import (
+    AdapterFetchResult,
+    GitHubTrendingStarsAdapter,
+    HackerNewsAdapter,
+    IngestionRunner,
+    NormalizedArticle,
+)
+from app.schemas import IngestionRunRequest
+
+
+def _hn_transport(story_ids: list[int], delay: float = 0.0) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/topstories.json"):
+            return httpx.Response(200, json=story_ids)
+        item_id = int(path.rsplit("/", 1)[-1].removesuffix(".json"))
+        # Later IDs answer first so ordering has to come from the adapter, not the network.
+        await asyncio.sleep(delay / item_id)
+        if item_id % 5 == 0:
+            return httpx.Response(200, json={"id": item_id, "type": "job", "title": f"Job {item_id}"})
+        return httpx.Response(
+            200,
+            json={
+                "id": item_id,
+                "type": "story",
+                "title": f"Story {item_id}",
+                "url": f"https://example.com/hn/{item_id}",
+                "time": 1_700_000_000 + item_id,
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_hacker_news_adapter_keeps_topstories_order_with_concurrency():
+    story_ids = [3, 1, 4, 6, 2, 5, 7]
+    http = PooledHttpClient(transport=_hn_transport(story_ids, delay=0.05))
+    adapter = HackerNewsAdapter(http=http, max_concurrency=4)
+
+    try:
+        items = adapter.fetch_items(limit=6)
+    finally:
+        http.close()
+
+    assert [item.title for item in items] == ["Story 3", "Story 1", "Story 4", "Story 6", "Story 2"]
+    assert items[0].url == "https://example.com/hn/3"
+    assert items[0].published_at is not None
+
+
+def test_hacker_news_adapter_caps_in_flight_requests():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        if request.url.path.endswith("/topstories.json"):
+            return httpx.Response(200, json=list(range(1, 21)))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=b"null")
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    adapter = HackerNewsAdapter(http=http, max_concurrency=3)
+
+    try:
+        assert adapter.fetch_items(limit=20) == []
+    finally:
+        http.close()
+    assert peak == 3
+
+
+def test_pooled_client_frees_per_host_slots_for_preloaded_responses():
+    http = PooledHttpClient(
+        HttpClientConfig(max_connections_per_host=2),
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True})),
+    )
+
+    async def fetch_many() -> list[int]:
+        responses = [await http.client.get(f"https://api.example.com/items/{idx}") for idx in range(5)]
+        responses += await asyncio.gather(*(http.client.get("https://api.example.com/burst") for _ in range(5)))
+        return [response.status_code for response in responses]
+
+    try:
+        assert http.run(asyncio.wait_for(fetch_many(), timeout=5)) == [200] * 10
+        host_stats = http.stats()["by_host"]["api.example.com"]
+        assert host_stats["requests"] == 10
+        assert host_stats["in_flight"] == 0
+        assert host_stats["peak_in_flight"] <= 2
+        # Mock responses never touch a pooled connection, so neither counter moves.
+        assert host_stats["connections_opened"] == 0
+        assert host_stats["connections_reused"] == 0
+    finally:
+        http.close()
+
+
+class _StaticAdapter:
+    def __init__(self, source_key: str, items: list[NormalizedArticle], delay: float = 0.0) -> None:
+        self.source_key = source_key
+        self.items = items
+        self.delay = delay
+
+    def fetch_items(self, limit: int) -> list[NormalizedArticle]:
+        return asyncio.run(self.fetch_items_async(limit)).items
+
+    async def fetch_items_async(
+        self,
+        limit: int,
+        *,
+        known_ids: frozenset[str] = frozenset(),
+        cursor: str | None = None,
+    ) -> AdapterFetchResult:
+        await asyncio.sleep(self.delay)
+        return AdapterFetchResult(items=self.items[:limit])
+
+
+class _FailingAdapter(_StaticAdapter):
+    async def fetch_items_async(
+        self,
+        limit: int,
+        *,
+        known_ids: frozenset[str] = frozenset(),
+        cursor: str | None = None,
+    ) -> AdapterFetchResult:
+        await asyncio.sleep(self.delay)
+        request = httpx.Request("GET", "https://api.example.com/?token=secret-key")
+        raise httpx.HTTPStatusError("rate limited", request=request, response=httpx.Response(429, request=request))
+
+
+def _article(source_name: str, slug: str, text: str) -> NormalizedArticle:
+    return NormalizedArticle(
+        source_name=source_name,
+        source_type="api",
+        url=f"https://example.com/runner/{slug}",
+        title=f"Runner {slug}",
+        raw_text=f"{text} {slug}",
+    )
+
+
+def test_runner_fetches_sources_in_parallel_and_isolates_failures():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    run_id = uuid.uuid4().hex
+    runner = IngestionRunner(
+        adapters={
+            "slow_a": _StaticAdapter(
+                "slow_a", [_article("Runner A", f"parallel-a-{run_id}", "Parallel fetch alpha quantum widgets")], delay=0.3
+            ),
+            "slow_b": _StaticAdapter(
+                "slow_b", [_article("Runner B", f"parallel-b-{run_id}", "Parallel fetch beta orbital gadgets")], delay=0.3
+            ),
+            "broken": _FailingAdapter("broken", [], delay=0.1),
+        }
+    )
+    try:
+        started = time.perf_counter()
+        result = runner.run(db, source_keys=["slow_a", "slow_b", "broken", "missing"], limit_per_source=5)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.55
+        assert result["sources"]["slow_a"]["fetched"] == 1
+        assert result["sources"]["slow_a"]["ingested"] == 1
+        assert result["sources"]["slow_a"]["elapsed_seconds"] >= 0.3
+        assert result["sources"]["slow_b"]["fetched"] == 1
+        assert result["sources"]["slow_b"]["ingested"] == 1
+        assert result["sources"]["slow_b"]["elapsed_seconds"] >= 0.3
+        assert result["sources"]["broken"] == {"error": "fetch_failed: HTTPStatusError status=429"}
+        assert result["sources"]["missing"] == {"error": "unknown_source"}
+        assert result["ingested"] == 2
+    finally:
+        runner.close()
+        db.close()
+
+
+def test_runner_with_empty_adapter_mapping_does_not_fall_back_to_live_sources():
+    runner = IngestionRunner(adapters={})
+
+    assert runner.available_sources() == []
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path.endswith("/topstories.json"):
+            body = [1, 2, 3, 4]
+        else:
+            item_id = int(self.path.rsplit("/", 1)[-1].removesuffix(".json"))
+            body = {"id": item_id, "type": "story", "title": f"Pooled {item_id}", "url": f"https://example.com/p/{item_id}"}
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        return
+
+
+def test_pooled_client_reuses_connections_across_runs():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http = PooledHttpClient(HttpClientConfig(max_connections_per_host=2))
+    try:
+        adapter = HackerNewsAdapter(http=http, base_url=f"http://127.0.0.1:{server.server_address[1]}/v0")
+        assert len(adapter.fetch_items(limit=4)) == 4
+        assert len(adapter.fetch_items(limit=4)) == 4
+
+        stats = http.stats()
+        assert stats["requests"] == 10
+        assert stats["connections_opened"] <= 2
+        assert stats["connections_reused"] == stats["requests"] - stats["connections_opened"]
+        assert stats["by_host"]["127.0.0.1"]["peak_in_flight"] <= 2
+    finally:
+        http.close()
+        server.shutdown()
+
+
+def test_conditional_cache_revalidates_and_serves_immutable_items_offline(tmp_path):
+    seen: list[tuple[str, str | None]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.headers.get("if-none-match")))
+        if request.url.path == "/search":
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, headers={"ETag": '"v1"'}, json={"items": ["repo"]})
+        return httpx.Response(200, json={"id": 1, "type": "story"})
+
+    http = PooledHttpClient(HttpClientConfig(cache_dir=str(tmp_path)), transport=httpx.MockTransport(handler))
+
+    async def fetch_twice() -> list[object]:
+        bodies = []
+        for _ in range(2):
+            search = await http.client.get("https://api.example.com/search?token=secret")
+            item = await http.client.get("https://api.example.com/item/1.json", extensions={"ingest_cache": "immutable"})
+            bodies += [search.json(), item.json()]
+        return bodies
+
+    try:
+        bodies = http.run(fetch_twice())
+    finally:
+        http.close()
+
+    assert bodies[0] == bodies[2] == {"items": ["repo"]}
+    assert bodies[1] == bodies[3] == {"id": 1, "type": "story"}
+    assert seen == [("/search", None), ("/item/1.json", None), ("/search", '"v1"')]
+    assert http.stats()["cache"] == {"immutable_hits": 1, "revalidated": 1, "misses": 2, "stored": 2}
+    assert not any(b"secret" in path.read_bytes() for path in tmp_path.rglob("*") if path.is_file())
+
+
+def test_runner_skips_known_hacker_news_ids_before_fetching():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    base_id = int(time.time() * 1000)
+    first_ids = [base_id + 1, base_id + 2, base_id + 3]
+    story_ids = list(first_ids)
+    requested_items: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/topstories.json"):
+            return httpx.Response(200, json=story_ids)
+        item_id = int(request.url.path.rsplit("/", 1)[-1].removesuffix(".json"))
+        requested_items.append(item_id)
+        item_type = "job" if item_id == base_id + 3 else "story"
+        return httpx.Response(
+            200,
+            json={"id": item_id, "type": item_type, "title": f"Known {item_id}", "url": f"https://example.com/known/{item_id}"},
+        )
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    runner = IngestionRunner(http=http)
+    try:
+        first = runner.run(db, source_keys=["hacker_news"], limit_per_source=10)
+        assert first["sources"]["hacker_news"]["fetched"] == 2
+        assert first["fetches_avoided"] == 0
+        assert sorted(requested_items) == first_ids
+
+        requested_items.clear()
+        story_ids.insert(0, base_id + 4)
+        second = runner.run(db, source_keys=["hacker_news"], limit_per_source=10)
+
+        # The rejected job item is remembered too, so only the brand-new story is fetched.
+        assert requested_items == [base_id + 4]
+        assert second["fetches_avoided"] == 3
+        hacker_news = second["sources"]["hacker_news"]
+        assert (hacker_news["fetched"], hacker_news["ingested"], hacker_news["fetches_avoided"]) == (1, 1, 3)
+        # The limiter lives on the adapter, so its counters span both runs (2 + 4 requests).
+        assert hacker_news["rate_limit"]["requests"] == 6
+        assert hacker_news["rate_limit"]["retries"] == 0
+    finally:
+        runner.close()
+        db.close()
+
+
+def test_runner_resumes_github_from_stored_cursor_and_pages_forward():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    run_id = uuid.uuid4().hex
+    source_key = f"github_cursor_{run_id}"
+    queries: list[tuple[str, str]] = []
+    repos = [
+        {
+            "id": f"{run_id}-{idx}",
+            "full_name": f"octo/{run_id}-{idx}",
+            "html_url": f"https://github.com/octo/{run_id}-{idx}",
+            "description": f"Cursor repo {run_id} number{idx}",
+            "created_at": f"2030-01-01T{idx // 60:02d}:{idx % 60:02d}:00Z",
+        }
+        for idx in range(150)
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query, page = request.url.params["q"], int(request.url.params["page"])
+        per_page = int(request.url.params["per_page"])
+        queries.append((query, request.url.params["page"]))
+        since = query.removeprefix("created:>")
+        matching = [repo for repo in repos if repo["created_at"] > since]
+        return httpx.Response(200, json={"items": matching[(page - 1) * per_page : page * per_page]})
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    runner = IngestionRunner(adapters={source_key: GitHubTrendingStarsAdapter(http)}, http=http)
+    try:
+        first = runner.run(db, source_keys=[source_key], limit_per_source=150)
+        assert first["sources"][source_key]["ingested"] == 150
+        assert [page for _, page in queries] == ["1", "2"]
+
+        queries.clear()
+        second = runner.run(db, source_keys=[source_key], limit_per_source=150)
+        assert queries == [(f"created:>{repos[-1]['created_at']}", "1")]
+        assert second["sources"][source_key]["fetched"] == 0
+
+        queries.clear()
+        full = runner.run(db, source_keys=[source_key], limit_per_source=150, incremental=False)
+        assert queries[0][0] != f"created:>{repos[-1]['created_at']}"
+        assert full["sources"][source_key]["skipped"] == 150
+    finally:
+        runner.close()
+        db.close()
+
+
+def test_github_adapter_fetches_backfill_pages_concurrently():
+    in_flight = 0
+    peak = 0
+    pages: list[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        page = int(request.url.params["page"])
+        pages.append(page)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        start = (page - 1) * 100
+        repos = [
+            {"id": idx, "full_name": f"octo/repo-{idx}", "html_url": f"https://github.com/octo/repo-{idx}"}
+            for idx in range(start, min(start + 100, 730))
+        ]
+        return httpx.Response(200, json={"total_count": 730, "items": repos})
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    try:
+        items = GitHubTrendingStarsAdapter(http, page_concurrency=3).fetch_items(limit=2000)
+    finally:
+        http.close()
+
+    assert len(items) == 730
+    assert [item.title for item in items[:2]] == ["octo/repo-0", "octo/repo-1"]
+    assert items[-1].title == "octo/repo-729"
+    assert sorted(pages) == list(range(1, 9))
+    assert peak == 3
+
+
+def test_ingestion_request_requires_backfill_above_regular_limit():
+    assert IngestionRunRequest(limit_per_source=100).backfill is False
+    assert IngestionRunRequest(limit_per_source=3000, backfill=True).limit_per_source == 3000
+    with pytest.raises(ValidationError):
+        IngestionRunRequest(limit_per_source=101)
+    with pytest.raises(ValidationError):
+        IngestionRunRequest(limit_per_source=5001, backfill=True)
+
+
+def test_hacker_news_adapter_refetches_old_ids_that_climb_into_topstories():
+    story_ids = [900, 901]
+    http = PooledHttpClient(transport=_hn_transport(story_ids))
+    adapter = HackerNewsAdapter(http=http)
+    try:
+        first = http.run(adapter.fetch_items_async(10))
+        # An older story (lower ID) reaches the top list after the first poll.
+        story_ids[:] = [902, 12, 900]
+        second = http.run(adapter.fetch_items_async(10, known_ids=frozenset({"900", "901"}), cursor="901"))
+    finally:
+        http.close()
+
+    assert first.next_cursor is None
+    assert [item.external_id for item in second.items] == ["902", "12"]
+    assert second.fetches_avoided == 1
+
+
+def test_github_adapter_keeps_cursor_until_window_is_fully_paged():
+    repos = [
+        {"id": 1, "full_name": "a/a", "html_url": "https://github.com/a/a", "created_at": "2030-01-03T00:00:00Z"},
+        {"id": 2, "full_name": "b/b", "html_url": "https://github.com/b/b", "created_at": "2030-01-02T00:00:00Z"},
+        {"id": 3, "full_name": "c/c", "html_url": "https://github.com/c/c", "created_at": "2030-01-01T00:00:00Z"},
+    ]
+    queries: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        since = request.url.params["q"].removeprefix("created:>")
+        queries.append(since)
+        per_page, page = int(request.url.params["per_page"]), int(request.url.params["page"])
+        matching = [repo for repo in repos if repo["created_at"] > since]
+        return httpx.Response(
+            200, json={"total_count": len(matching), "items": matching[(page - 1) * per_page : page * per_page]}
+        )
+
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    adapter = GitHubTrendingStarsAdapter(http)
+    try:
+        cut = http.run(adapter.fetch_items_async(2, cursor="2029-12-31T00:00:00Z"))
+        assert [item.title for item in cut.items] == ["a/a", "b/b"]
+        # c/c ranked below the cut, so the cursor must not move past it.
+        assert cut.next_cursor is None
+
+        full = http.run(adapter.fetch_items_async(3, cursor="2029-12-31T00:00:00Z"))
+        assert [item.title for item in full.items] == ["a/a", "b/b", "c/c"]
+        assert full.next_cursor == "2030-01-03T00:00:00Z"
+    finally:
+        http.close()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.db import Base, SessionLocal, engine
+from app.ingestion.jobs import IngestionJobManager
+from app.ingestion.service import AdapterFetchResult, IngestionRunner, NormalizedArticle
+from app.main import app
+
+
+class _GatedAdapter:
+    def __init__(self, source_key: str, gate: threading.Event) -> None:
+        self.source_key = source_key
+        self.gate = gate
+        self.calls = 0
+
+    async def fetch_items_async(self, limit, *, known_ids=frozenset(), cursor=None) -> AdapterFetchResult:
+        self.calls += 1
+        while not self.gate.is_set():
+            await asyncio.sleep(0.01)
+        slug = uuid.uuid4().hex
+        return AdapterFetchResult(
+            items=[
+                NormalizedArticle(
+                    source_name="Job Source",
+                    source_type="api",
+                    url=f"https://example.com/jobs/{slug}",
+                    title=f"Job {slug}",
+                    raw_text=f"Background ingestion job {slug}",
+                )
+            ]
+        )
+
+
+def _wait_for(manager: IngestionJobManager, job_id: str, status: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {manager.get(job_id)}")
+
+
+def test_job_manager_coalesces_identical_active_requests_and_reports_result():
+    Base.metadata.create_all(bind=engine)
+    gate = threading.Event()
+    adapter = _GatedAdapter("gated", gate)
+    runner = IngestionRunner(adapters={"gated": adapter})
+    manager = IngestionJobManager(runner, session_factory=SessionLocal, max_workers=2)
+    try:
+        first, first_coalesced = manager.submit(["gated"], limit_per_source=5)
+        second, second_coalesced = manager.submit(["gated", "gated"], limit_per_source=5)
+        other, other_coalesced = manager.submit(["gated"], limit_per_source=6)
+
+        assert (first_coalesced, second_coalesced, other_coalesced) == (False, True, False)
+        assert second.id == first.id
+        assert other.id != first.id
+        assert manager.get(first.id)["status"] in {"queued", "running"}
+
+        gate.set()
+        done = _wait_for(manager, first.id, "succeeded")
+        _wait_for(manager, other.id, "succeeded")
+
+        assert done["progress"]["sources_done"] == 1
+        assert done["result"]["ingested"] == 1
+        assert adapter.calls == 2
+
+        rerun, rerun_coalesced = manager.submit(["gated"], limit_per_source=5)
+        assert rerun_coalesced is False and rerun.id != first.id
+        _wait_for(manager, rerun.id, "succeeded")
+    finally:
+        gate.set()
+        manager.shutdown()
+        runner.close()
+
+
+def test_job_state_is_shared_between_workers_through_the_database():
+    Base.metadata.create_all(bind=engine)
+    gate = threading.Event()
+    source_key = f"shared_{uuid.uuid4().hex[:8]}"
+    adapters = [_GatedAdapter(source_key, gate), _GatedAdapter(source_key, gate)]
+    runners = [IngestionRunner(adapters={source_key: adapter}) for adapter in adapters]
+    # Two managers over one database stand in for two uvicorn workers.
+    worker_a, worker_b = (IngestionJobManager(runner, session_factory=SessionLocal) for runner in runners)
+    try:
+        job, coalesced = worker_a.submit([source_key], limit_per_source=5)
+        joined, joined_coalesced = worker_b.submit([source_key], limit_per_source=5)
+        assert (coalesced, joined_coalesced) == (False, True)
+        assert joined.id == job.id
+        assert worker_b.get(job.id)["status"] in {"queued", "running"}
+
+        gate.set()
+        done = _wait_for(worker_b, job.id, "succeeded")
+        assert done["result"]["ingested"] == 1
+        assert [adapter.calls for adapter in adapters] == [1, 0]
+    finally:
+        gate.set()
+        worker_a.shutdown()
+        worker_b.shutdown()
+        for runner in runners:
+            runner.close()
+
+
+def test_abandoned_job_is_failed_and_releases_its_key():
+    Base.metadata.create_all(bind=engine)
+    source_key = f"orphan_{uuid.uuid4().hex[:8]}"
+    gate = threading.Event()
+    gate.set()
+    runner = IngestionRunner(adapters={source_key: _GatedAdapter(source_key, gate)})
+    manager = IngestionJobManager(runner, session_factory=SessionLocal, stale_after_seconds=60)
+    db = SessionLocal()
+    try:
+        # A row left active by a worker that died an hour ago.
+        orphan = models.IngestionJobRecord(
+            id=str(uuid.uuid4()),
+            active_key=json.dumps([[source_key], 5, False, False]),
+            status="running",
+            source_keys_json=json.dumps([source_key]),
+            limit_per_source=5,
+            updated_at=datetime.utcnow() - timedelta(hours=1),
+        )
+        db.add(orphan)
+        db.commit()
+
+        job, coalesced = manager.submit([source_key], limit_per_source=5)
+        assert coalesced is False and job.id != orphan.id
+        abandoned = manager.get(orphan.id)
+        assert (abandoned["status"], abandoned["error"]) == ("failed", "job_abandoned")
+        _wait_for(manager, job.id, "succeeded")
+    finally:
+        db.close()
+        manager.shutdown()
+        runner.close()
+
+
+def test_ingest_run_endpoint_returns_job_id_for_polling():
+    client = TestClient(app)
+
+    accepted = client.post("/ingest/run", json={"source_keys": ["no_such_source"]})
+    assert accepted.status_code == 202
+    job_id = accepted.json()["job_id"]
+
+    deadline = time.monotonic() + 5
+    status = client.get(f"/ingest/jobs/{job_id}").json()
+    while status["status"] != "succeeded" and time.monotonic() < deadline:
+        time.sleep(0.01)
+        status = client.get(f"/ingest/jobs/{job_id}").json()
+
+    assert status["status"] == "succeeded"
+    assert status["result"]["sources"] == {"no_such_source": {"error": "unknown_source"}}
+    assert client.get("/ingest/jobs/does-not-exist").status_code == 404
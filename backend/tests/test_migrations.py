@@ -0,0 +1,90 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, or_, select, text
+
+from app import models
+from app.db import engine
+from app.migrations import MIGRATIONS, run_migrations, uuid_key_metadata
+
+
+def _hot_queries():
+    ids = [1, 2]
+    return {
+        "claims by article": select(models.Claim.id).where(models.Claim.article_id == 1),
+        "claims by cluster": select(models.Claim.id).where(models.Claim.event_cluster_id.in_(ids)),
+        "relations by claim": select(models.ClaimRelation.id).where(
+            or_(models.ClaimRelation.left_claim_id.in_(ids), models.ClaimRelation.right_claim_id.in_(ids))
+        ),
+        "citations by claim": select(models.SummaryCitation.id).where(models.SummaryCitation.claim_id.in_(ids)),
+        "evidence by claim": select(models.ClaimEvidence.id).where(models.ClaimEvidence.claim_id == 1),
+        "latest summaries": select(models.Summary.id).order_by(models.Summary.created_at.desc()).limit(10),
+        "recent articles": select(models.Article.id).where(models.Article.created_at >= datetime(2024, 1, 1)),
+        "active clusters": select(models.EventCluster.id).where(models.EventCluster.status == "active"),
+    }
+
+
+def test_hot_queries_do_not_fall_back_to_full_table_scans():
+    run_migrations(engine)
+    with engine.connect() as connection:
+        for label, query in _hot_queries().items():
+            sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            full_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+            assert not full_scans, f"{label}: {plan}"
+
+
+def test_migrations_upgrade_an_existing_database_once(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    try:
+        uuid_key_metadata().create_all(bind=legacy)
+        with legacy.begin() as connection:
+            for index in ("uq_sources_name", "ix_claims_article_id", "ix_summaries_created_at"):
+                connection.execute(text(f"DROP INDEX {index}"))
+            connection.execute(text("DROP TABLE schema_migrations"))
+            connection.execute(
+                text(
+                    "INSERT INTO sources (id, name, source_type, created_at)"
+                    " VALUES ('s2', 'Wire', 'wire', '2024-01-01'), ('s1', 'Wire', 'wire', '2024-01-02')"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO articles (id, source_id, url, title, created_at) VALUES"
+                    " ('a1', 's2', 'https://example.com/m1', 'One', '2024-01-03'),"
+                    " ('a2', 's1', 'https://example.com/m2', 'Two', '2024-01-04')"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO event_clusters (id, canonical_title, status, created_at)"
+                    " VALUES ('c1', 'Launch', 'active', '2024-01-05')"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO claims (id, article_id, event_cluster_id, claim_text, claim_type, created_at) VALUES"
+                    " ('k1', 'a2', 'c1', 'Two launched', 'observed_fact', '2024-01-05'),"
+                    " ('k2', 'a1', NULL, 'One launched', 'observed_fact', '2024-01-05'),"
+                    " ('k3', 'gone', NULL, 'Orphan', 'observed_fact', '2024-01-05')"
+                )
+            )
+
+        assert run_migrations(legacy) == [migration.version for migration in MIGRATIONS]
+        assert run_migrations(legacy) == []
+
+        inspector = inspect(legacy)
+        index_names = {
+            index["name"] for table in ("sources", "claims", "summaries") for index in inspector.get_indexes(table)
+        }
+        assert {"uq_sources_name", "ix_claims_article_id", "ix_summaries_created_at"} <= index_names
+        assert {column["name"]: str(column["type"]) for column in inspector.get_columns("claims")}["article_id"] == "INTEGER"
+        assert not [name for name in inspector.get_table_names() if name.endswith("__legacy")]
+        with legacy.connect() as connection:
+            assert connection.execute(text("SELECT id, name FROM sources")).all() == [(1, "Wire")]
+            articles = connection.execute(text("SELECT id, public_id, source_id FROM articles ORDER BY id")).all()
+            assert articles == [(1, "a1", 1), (2, "a2", 1)]
+            claims = connection.execute(text("SELECT id, article_id, event_cluster_id FROM claims ORDER BY id")).all()
+            assert claims == [(1, 2, 1), (2, 1, None)]
+            assert connection.execute(text("SELECT public_id FROM event_clusters")).scalar() == "c1"
+    finally:
+        legacy.dispose()
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.ingestion.http import PooledHttpClient
+from app.ingestion.ratelimit import RateLimitExceeded, RateLimitPolicy, SourceRateLimiter
+from app.ingestion.service import GitHubTrendingStarsAdapter
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _limiter(clock: _FakeClock, **policy) -> SourceRateLimiter:
+    policy.setdefault("requests_per_second", 1.0)
+    policy.setdefault("burst", 2)
+    return SourceRateLimiter(RateLimitPolicy(**policy), clock=clock, sleep=clock.sleep, jitter=lambda: 0.5)
+
+
+def _replay(*responses: httpx.Response):
+    queue = list(responses)
+
+    async def send() -> httpx.Response:
+        return queue.pop(0)
+
+    return send
+
+
+def test_token_bucket_spends_burst_then_waits_for_refill():
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    async def acquire_three() -> None:
+        for _ in range(3):
+            await limiter.acquire()
+
+    asyncio.run(acquire_three())
+
+    assert clock.sleeps == [1.0]
+    assert limiter.snapshot()["throttled_seconds"] == 1.0
+
+
+def test_send_honors_retry_after_and_backs_off_on_server_errors():
+    clock = _FakeClock()
+    limiter = _limiter(clock, burst=10)
+    send = _replay(
+        httpx.Response(429, headers={"Retry-After": "3"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"ok": True}),
+    )
+
+    response = asyncio.run(limiter.send(send))
+
+    assert response.status_code == 200
+    # Retry-After is used verbatim; the 503 gets jittered backoff (0.5s base * 2 ** 1 * 0.5).
+    assert clock.sleeps == [3.0, 0.5]
+    assert limiter.snapshot()["retries"] == 2
+    assert limiter.snapshot()["requests"] == 3
+
+
+def test_send_gives_up_after_max_retries_or_overlong_reset():
+    clock = _FakeClock()
+    limiter = _limiter(clock, burst=10, max_retries=2)
+    failing = asyncio.run(limiter.send(_replay(*(httpx.Response(502) for _ in range(3)))))
+    assert failing.status_code == 502
+    assert limiter.retries == 2
+
+    clock = _FakeClock()
+    limiter = _limiter(clock, burst=10, max_wait=60.0)
+    exhausted = httpx.Response(
+        403,
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 3600)},
+    )
+    assert asyncio.run(limiter.send(_replay(exhausted))).status_code == 403
+    assert limiter.retries == 0
+    assert limiter.snapshot()["upstream_remaining"] == 0
+    assert limiter.snapshot()["blocked_for_seconds"] > 3000
+
+    # The next run against the same limiter fails fast instead of sleeping out the hour.
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(limiter.send(_replay(httpx.Response(200))))
+    assert clock.sleeps == []
+    assert limiter.requests == 1
+
+
+def test_send_after_retry_after_give_up_fails_fast():
+    clock = _FakeClock()
+    limiter = _limiter(clock, burst=10, max_wait=60.0)
+    assert asyncio.run(limiter.send(_replay(httpx.Response(429, headers={"Retry-After": "3600"})))).status_code == 429
+
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(limiter.acquire())
+    assert clock.sleeps == []
+
+    # Once the block has shrunk below max_wait the limiter waits it out as usual.
+    clock.now += 3550
+    asyncio.run(limiter.acquire())
+    assert clock.sleeps == [50.0]
+
+
+def test_github_adapter_retries_exhausted_quota_then_succeeds():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()))})
+        repo = {"id": 1, "full_name": "octo/retry", "html_url": "https://github.com/octo/retry"}
+        return httpx.Response(200, headers={"X-RateLimit-Remaining": "29"}, json={"items": [repo]})
+
+    clock = _FakeClock()
+    http = PooledHttpClient(transport=httpx.MockTransport(handler))
+    adapter = GitHubTrendingStarsAdapter(http, rate_limiter=_limiter(clock))
+    try:
+        items = adapter.fetch_items(limit=5)
+    finally:
+        http.close()
+
+    assert [item.title for item in items] == ["octo/retry"]
+    snapshot = adapter.rate_limiter.snapshot()
+    assert snapshot["retries"] == 1
+    assert snapshot["upstream_remaining"] == 29
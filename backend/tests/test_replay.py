@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import httpx
+
+from app.ingestion.http import HttpClientConfig, PooledHttpClient
+from app.ingestion.replay import RecordingTransport, ReplayTransport, fixture_key
+from app.ingestion.service import HackerNewsAdapter
+
+
+def _upstream(calls: list[str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/topstories.json"):
+            return httpx.Response(200, headers={"Set-Cookie": "session=abc"}, json=[11, 12])
+        item_id = int(request.url.path.rsplit("/", 1)[-1].removesuffix(".json"))
+        return httpx.Response(
+            200,
+            json={"id": item_id, "type": "story", "title": f"Replay {item_id}", "url": f"https://example.com/r/{item_id}"},
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_fixture_key_drops_secrets_and_orders_params():
+    url = httpx.URL("https://gnews.io/api/v4/top-headlines?topic=tech&token=secret&lang=en")
+
+    assert fixture_key("get", url) == "GET https://gnews.io/api/v4/top-headlines?lang=en&topic=tech"
+
+
+def test_recorded_adapter_run_replays_offline_with_latency(tmp_path):
+    calls: list[str] = []
+    recorder = PooledHttpClient(transport=RecordingTransport(_upstream(calls), tmp_path))
+    try:
+        recorded = HackerNewsAdapter(recorder).fetch_items(limit=2)
+    finally:
+        recorder.close()
+    assert len(calls) == 3
+    assert not any(b"session=abc" in path.read_bytes() for path in tmp_path.iterdir())
+
+    replayer = PooledHttpClient(HttpClientConfig(replay_dir=str(tmp_path), replay_latency_ms=50))
+    try:
+        started = time.perf_counter()
+        replayed = HackerNewsAdapter(replayer).fetch_items(limit=2)
+        elapsed = time.perf_counter() - started
+    finally:
+        replayer.close()
+
+    assert [(item.title, item.url) for item in replayed] == [(item.title, item.url) for item in recorded]
+    # topstories, then both items concurrently: two latency rounds, not three.
+    assert 0.1 <= elapsed < 0.25
+    assert len(calls) == 3
+
+
+def test_replay_misses_return_404_and_fall_back_on_volatile_params(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"items": [request.url.params["q"]]})
+
+    recorder = PooledHttpClient(transport=RecordingTransport(httpx.MockTransport(handler), tmp_path))
+    try:
+        recorder.run(recorder.client.get("https://api.github.com/search/repositories?q=created:>2030-01-01&page=1"))
+    finally:
+        recorder.close()
+
+    replay = ReplayTransport(tmp_path)
+
+    async def fetch(url: str) -> httpx.Response:
+        async with httpx.AsyncClient(transport=replay) as client:
+            return await client.get(url)
+
+    drifted = asyncio.run(fetch("https://api.github.com/search/repositories?q=created:>2030-02-01&page=1"))
+    missing = asyncio.run(fetch("https://api.github.com/search/repositories?q=created:>2030-02-01&page=2"))
+
+    assert drifted.json() == {"items": ["created:>2030-01-01"]}
+    assert missing.status_code == 404
+    assert (replay.served, replay.misses) == (1, 1)
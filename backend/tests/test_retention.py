@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.db import SQLiteProfile, create_db_engine
+from app.migrations import run_migrations
+from app.services.retention_service import RetentionPolicy, RetentionService
+
+
+def _seed(db, now: datetime) -> dict[str, int]:
+    old, recent = now - timedelta(days=60), now - timedelta(days=1)
+    source = models.Source(name="Retention Wire", source_type="wire")
+    db.add(source)
+    db.flush()
+    stale = models.EventCluster(canonical_title="Old launch", created_at=old)
+    live = models.EventCluster(canonical_title="Ongoing launch", created_at=old)
+    db.add_all([stale, live])
+    db.flush()
+
+    articles = {}
+    for key, created_at, cluster in (("old", old, stale), ("old_live", old, live), ("recent", recent, live)):
+        article = models.Article(
+            source_id=source.id,
+            url=f"https://example.com/retention/{key}",
+            title=key,
+            cleaned_text=f"Text of {key} " * 5000,
+            content_hash=key.ljust(64, "0"),
+            created_at=created_at,
+        )
+        db.add(article)
+        db.flush()
+        claim = models.Claim(
+            article_id=article.id,
+            event_cluster_id=cluster.id,
+            claim_text=f"Claim from {key}",
+            claim_type="observed_fact",
+            created_at=created_at,
+        )
+        db.add(claim)
+        db.flush()
+        evidence = models.ClaimEvidence(claim_id=claim.id, article_id=article.id, evidence_text=key, created_at=created_at)
+        db.add(evidence)
+        db.flush()
+        db.add(models.ArticleFingerprint(article_id=article.id, signature=b"\x00" * 256))
+        articles[key] = article.id
+        articles[f"{key}_claim"] = claim.id
+
+    for index, created_at in enumerate((old, old + timedelta(hours=1))):
+        summary = models.Summary(event_cluster_id=stale.id, agreed_facts_json="[]", created_at=created_at)
+        db.add(summary)
+        db.flush()
+        db.add(
+            models.SummaryCitation(
+                summary_id=summary.id,
+                section="agreed_facts",
+                bullet_index=index,
+                claim_id=articles["old_claim"],
+                created_at=created_at,
+            )
+        )
+    db.add(models.Summary(event_cluster_id=live.id, agreed_facts_json="[]", created_at=recent))
+    db.commit()
+    articles["stale_cluster"], articles["live_cluster"] = stale.id, live.id
+    return articles
+
+
+def test_retention_archives_old_rows_and_keeps_the_hot_set(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'hot.db'}", SQLiteProfile())
+    archive_path = tmp_path / "archive.db"
+    now = datetime(2024, 6, 1)
+    try:
+        run_migrations(engine)
+        with sessionmaker(bind=engine)() as db:
+            ids = _seed(db, now)
+
+        service = RetentionService(RetentionPolicy(article_days=30, cluster_stale_days=7, archive_path=str(archive_path)))
+        result = service.run(engine, now=now)
+
+        assert result.clusters_archived == 1
+        assert result.summaries_pruned == 1
+        assert (result.articles_archived, result.claims_archived, result.summaries_archived) == (1, 1, 1)
+        assert result.pages_freed > 0
+        assert result.database_bytes > 0
+
+        with engine.connect() as connection:
+            statuses = dict(connection.execute(text("SELECT id, status FROM event_clusters")).all())
+            assert statuses == {ids["stale_cluster"]: "archived", ids["live_cluster"]: "active"}
+            # The archived article keeps its url and hash for dedupe but loses its text and claims.
+            row = connection.execute(
+                text("SELECT cleaned_text, archived_at, url FROM articles WHERE id = :id"), {"id": ids["old"]}
+            ).one()
+            assert row.cleaned_text is None and row.archived_at is not None
+            claims = set(connection.execute(text("SELECT id FROM claims")).scalars())
+            assert claims == {ids["old_live_claim"], ids["recent_claim"]}
+            assert connection.execute(text("SELECT COUNT(*) FROM summary_citations")).scalar() == 0
+            assert connection.execute(text("SELECT event_cluster_id FROM summaries")).scalars().all() == [ids["live_cluster"]]
+            fingerprints = set(connection.execute(text("SELECT article_id FROM article_fingerprints")).scalars())
+            assert ids["old"] not in fingerprints
+
+        archive = create_db_engine(f"sqlite:///{archive_path}", SQLiteProfile())
+        try:
+            with archive.connect() as connection:
+                assert connection.execute(text("SELECT id FROM claims")).scalars().all() == [ids["old_claim"]]
+                assert connection.execute(text("SELECT cleaned_text FROM articles")).scalar().startswith("Text of old")
+                assert connection.execute(text("SELECT COUNT(*) FROM summaries")).scalar() == 1
+                assert connection.execute(text("SELECT COUNT(*) FROM summary_citations")).scalar() == 1
+        finally:
+            archive.dispose()
+
+        assert service.run(engine, now=now).articles_archived == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,136 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.db import SessionLocal, engine
+from app.main import app
+from app.migrations import run_migrations
+from app.services.search_service import SearchService
+
+
+def _seed(term: str) -> dict[str, object]:
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        source = models.Source(name=f"Search Wire {term}", source_type="wire")
+        db.add(source)
+        db.flush()
+        cluster = models.EventCluster(canonical_title=f"{term} chip launch")
+        headline = models.Article(
+            source_id=source.id,
+            url=f"https://example.com/search/{term}/headline",
+            title=f"{term} ships new accelerator",
+            cleaned_text="accelerator shipments begin this quarter",
+        )
+        body_only = models.Article(
+            source_id=source.id,
+            url=f"https://example.com/search/{term}/body",
+            title="Quarterly hardware roundup",
+            cleaned_text=f"several vendors including {term} reported results",
+        )
+        db.add_all([cluster, headline, body_only])
+        db.flush()
+        claims = [
+            models.Claim(
+                article_id=headline.id,
+                event_cluster_id=cluster.id,
+                claim_text=f"{term} claim number {index} about wafer supply",
+                claim_type="observed_fact",
+            )
+            for index in range(5)
+        ]
+        db.add_all(claims)
+        db.commit()
+        return {
+            "headline": headline.public_id,
+            "body_only": body_only.public_id,
+            "cluster": cluster.public_id,
+            "claim_ids": [claim.id for claim in claims],
+        }
+    finally:
+        db.close()
+
+
+def test_search_ranks_snippets_and_paginates_across_kinds():
+    term = f"zq{uuid.uuid4().hex[:10]}"
+    seeded = _seed(term)
+    client = TestClient(app)
+
+    response = client.get("/search", params={"q": term, "kinds": ["article"]})
+    assert response.status_code == 200
+    hits = response.json()["hits"]
+    # Title matches carry four times the weight of body matches.
+    assert [hit["article_id"] for hit in hits] == [seeded["headline"], seeded["body_only"]]
+    assert f"<mark>{term}</mark>" in hits[0]["snippet"]
+    assert hits[0]["url"].endswith("/headline")
+
+    seen: list[tuple[str, str | None, str]] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"q": term, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/search", params=params).json()
+        seen.extend((hit["kind"], hit["article_id"] or hit["cluster_id"], hit["snippet"]) for hit in page["hits"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 8
+    assert sorted(kind for kind, _, _ in seen) == ["article"] * 2 + ["claim"] * 5 + ["cluster"]
+    assert ("cluster", seeded["cluster"]) in {(kind, public_id) for kind, public_id, _ in seen}
+
+
+def test_search_pages_through_every_match_beyond_the_rank_window():
+    term = f"zq{uuid.uuid4().hex[:10]}"
+    seeded = _seed(term)
+    # A window of 2 splits the 5 claims into three tiers; paging must still reach all of them.
+    service = SearchService(rank_window=2)
+    db = SessionLocal()
+    try:
+        claims: list[str] = []
+        cursor = None
+        while True:
+            page = service.search(db, f"{term} wafer", kinds=["claim"], limit=2, cursor=cursor)
+            claims.extend(hit.snippet for hit in page.hits)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert len(claims) == len(set(claims)) == len(seeded["claim_ids"])
+
+        everything = service.search(db, term, limit=100)
+        assert len(everything.hits) == 8 and everything.next_cursor is None
+    finally:
+        db.close()
+
+
+def test_search_index_follows_updates_and_deletes():
+    term = f"zq{uuid.uuid4().hex[:10]}"
+    seeded = _seed(term)
+    client = TestClient(app)
+    db = SessionLocal()
+    try:
+        first, second = (db.get(models.Claim, claim_id) for claim_id in seeded["claim_ids"][:2])
+        first.claim_text = "rewritten without the marker"
+        db.delete(second)
+        db.commit()
+    finally:
+        db.close()
+
+    hits = client.get("/search", params={"q": f"{term} wafer", "kinds": ["claim"]}).json()["hits"]
+    assert len(hits) == 3
+    assert client.get("/search", params={"q": "rewritten marker", "kinds": ["claim"]}).json()["hits"]
+
+    prefix = client.get("/search", params={"q": f"{term[:8]}*", "kinds": ["cluster"]}).json()["hits"]
+    assert seeded["cluster"] in [hit["cluster_id"] for hit in prefix]
+
+
+def test_search_rejects_bad_input_without_fts_syntax_errors():
+    client = TestClient(app)
+    assert client.get("/search", params={"q": '"AND (NEAR'}).status_code == 200
+    assert client.get("/search", params={"q": "***"}).json()["detail"] == "empty_search_query"
+    assert client.get("/search", params={"q": "chip", "cursor": "not-a-cursor"}).json()["detail"] == "invalid_search_cursor"
+    assert client.get("/search", params={"q": "chip", "kinds": ["tweet"]}).json()["detail"] == "unknown_search_kind"